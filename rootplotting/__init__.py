@@ -3,11 +3,20 @@
 # instead of
 #   ap.pad.pad
 
-__all__ = ['pad', 'canvas', 'overlay', 'tools', 'style']
+__version__ = '0.1'
+
+__all__ = ['pad', 'canvas', 'overlay', 'histogram', 'variations', 'manifest', 'book', 'preview', 'jsonexport', 'curves', 'tools', 'style']
 
 from pad     import pad
 from canvas  import canvas
 from overlay import overlay
+from histogram import histogram
+from histogram import variations
+from manifest  import manifest
+from book      import book
+from . import preview
+from . import jsonexport
+from . import curves
 from . import tools
 from . import style
 from style import colours
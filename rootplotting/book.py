@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+
+""" Multi-page PDF output, written one canvas at a time."""
+
+# Scientific import(s)
+import ROOT
+
+# Project import(s)
+from rootplotting.tools import *
+
+
+# Class definition
+class book (object):
+    """
+    Multi-page PDF file to which canvases are appended as pages.
+
+    The output file is opened once, using ROOT's 'file.pdf[' / 'file.pdf]'
+    protocol, and each canvas is written as soon as it is added. Canvases are
+    closed, freeing their pads and primitives, once the next page has been
+    added, such that at most one canvas is held at any time, however many pages
+    are written. Each page can be given a title, which is added as a bookmark,
+    i.e. an entry in the table of contents shown by PDF viewers.
+
+    Usage:
+        with book('plots.pdf') as b:
+            for ...:
+                c = canvas()
+                ...
+                b.add(c, title="Control region {}".format(...))
+                pass
+            pass
+    """
+
+    def __init__ (self, path):
+        """ Constructor. """
+        super(book, self).__init__()
+
+        # Check(s)
+        if not path.endswith('.pdf'):
+            warning("book: Multi-page output is only supported for PDF files; got '{}'.".format(path))
+            pass
+
+        # Member variables
+        self._path     = path
+        self._last     = None   # ROOT canvas of the most recently added page
+        self._contents = list() # (page number, title)
+        self._closed   = False
+        return
+
+
+    def __enter__ (self):
+        """ ... """
+        return self
+
+
+    def __exit__ (self, *args):
+        """ ... """
+        self.close()
+        return
+
+
+    def add (self, c, title=None):
+        """ Append canvas `c` as a new page, optionally with a bookmark `title`.
+
+        The canvas is closed once the next page is added, or the book is
+        closed, and cannot be used afterwards.
+        """
+
+        # Check(s)
+        assert not self._closed, "Cannot add pages to a closed book."
+        tcanvas = c._bare()
+        if not hasattr(tcanvas, 'Print'):
+            warning("book: Canvas does not support multi-page output. Skipping.")
+            return
+
+        with render_lock:
+            c._update()
+            if self._last is None:
+                tcanvas.Print(self._path + '[') # Open file
+                pass
+            tcanvas.Print(self._path, 'Title:' + title if title else '')
+            pass
+
+        self._free()
+        self._last = tcanvas
+        self._contents.append((len(self._contents) + 1, title))
+        return
+
+
+    def contents (self):
+        """ Return the table of contents, as a list of (page number, title). """
+        return [(page, title) for page, title in self._contents if title]
+
+
+    def close (self):
+        """ Close the output file, and the last canvas added. """
+
+        # Check(s)
+        if self._closed: return
+
+        if self._last is not None:
+            with render_lock:
+                self._last.Print(self._path + ']') # Close file
+                pass
+            self._free()
+            pass
+        self._closed = True
+        return
+
+
+    def _free (self):
+        """ Close the canvas of the previous page, deleting its primitives. """
+        if self._last is not None:
+            with render_lock:
+                self._last.Close()
+                pass
+            self._last = None
+            pass
+        return
+
+    pass
@@ -2,6 +2,9 @@
 
 """ Wrapper around ROOT TCanvas, handling pads, showing, and saving."""
 
+# Basic import(s)
+import time
+
 # Scientific import(s)
 import ROOT
 try:
@@ -17,6 +20,11 @@ except:
 from rootplotting.tools import *
 from rootplotting.style import *
 from rootplotting import pad
+from rootplotting import preview as previews
+from rootplotting import jsonexport
+from rootplotting.spec import recorder, recorded, dump as dump_spec
+from rootplotting.manifest import fingerprint
+from rootplotting.raster import rasterized
 
 
 # Class definition
@@ -26,11 +34,37 @@ class canvas (object):
     @TODO: Elaborate!
     """
 
-    def __init__ (self, num_pads=1, size=None, fraction=0.3, batch=False, ratio=True):
-        """ Constructor. """
+    def __new__ (cls, *args, **kwargs):
+        """ Create canvas of the class implementing the requested rendering `backend`. """
+        if cls is canvas:
+            cls = get_backend(kwargs.get('backend', 'root'))
+            pass
+        return super(canvas, cls).__new__(cls)
+
+
+    def __init__ (self, num_pads=1, size=None, fraction=0.3, batch=False, ratio=True, lazy=False, record=False, backend='root'):
+        """ Constructor.
+
+        For regular grids of pads, `lazy=True` defers the creation of each pad
+        until it is first used, which keeps construction of large, sparsely
+        filled grids cheap.
+
+        With `record=True`, all calls on the canvas and its pads are recorded
+        into a plot specification, cf. `spec`, which can be written to file
+        and replayed in another process using `rootplotting.spec.replay`.
+
+        The `backend` used for rendering is either 'root' (default),
+        'matplotlib', which renders through numpy and matplotlib/Agg without
+        creating any ROOT graphics objects, or 'null', which renders nothing
+        but logs all drawing operations; cf. 'null_canvas'.
+        """
         super(canvas, self).__init__()
 
-        ROOT.gROOT.SetBatch(batch)
+        with render_lock:
+            if ROOT.gROOT.IsBatch() != batch:
+                ROOT.gROOT.SetBatch(batch)
+                pass
+            pass
 
         # Check(s)
         #assert type(num_pads) == int, "Number of pads must be an integer"
@@ -41,77 +75,25 @@ class canvas (object):
         self._num_pads = num_pads
         self._fraction = fraction if num_pads == 2 else 0.
         self._size = size or ((600, int(521.79/float(1. - 0.3))) if (num_pads == 2 and ratio) else (600,500))
-        self._canvas = ROOT.TCanvas('c_{}'.format(id(self)), "", self._size[0], self._size[1])
+        self._canvas = self._create_canvas()
         self._ratio = ratio and self._num_pads == 2
         self._setup = False
         self._existinglines = set() # X-axis lines already for previous regions
+        self._right_margin = None   # Right margin currently laid out for overlay axes
+        self._recorder = recorder(num_pads=num_pads, size=size, fraction=fraction, ratio=ratio, lazy=lazy) if record else None
+        self._exported = dict()     # Histogram digests at the last JSON export, for each output path
+        self._last_refresh = 0.     # Time of the last redraw through `refresh`
 
-        # -- Pads
-        self._pads = list()
-        if isinstance(self._num_pads, int) and self._num_pads <= 2:
-            if   self._num_pads == 1:
-                self._pads.append(pad(self, (0, 0, 1, 1)))
-            elif self._num_pads == 2:
-                self._pads.append(pad(self, (0, fraction, 1, 1)))
-                self._pads.append(pad(self, (0, 0, 1, fraction)))
-                pass
-        elif isinstance(fraction, (list, tuple)):
+        # -- Pads; lazy pads are stored by their coordinates until first use
+        coords, grid = self._layout(fraction)
+        self._pads = [c if (lazy and grid) else self._create_pad(c, draw=False) for c in coords]
 
-            assert len(fraction) == num_pads
-            if set(map(type,fraction)) == {int}:
-                fraction = [f / float(sum(fraction)) for f in fraction]
-            else:
-                assert np.abs(np.sum(fraction) - 1.0) < 1.0E-06, "Fractions don't sum to one: {}".format(sum(fraction))
-                pass
-
-            fractions = 1. - np.cumsum([0] + list(fraction))
-            
-            margin = 0.1
-            m1, m2 = margin, 0.
-            for y2, y1 in zip(fractions[:-1], fractions[1:]):
-                # @TODO: Margin?
-                self._pads.append(pad(self, (0, y1, 1, y2 )))
-                m2 += margin / float(num_pads - 1)
-                m1 -= margin / float(num_pads - 1)
-                pass
 
-        else: # Assuming regular pad placement
-            if isinstance(self._num_pads, int):
-                self._num_pads = [self._num_pads]
-                pass
-            self._num_pads = list(self._num_pads)
-            while len(self._num_pads) < 2: self._num_pads.insert(0, 1)
-            assert len(self._num_pads) == 2
-
-            nx, ny = self._num_pads
-            fx, fy = map(lambda n: 1. / float(n), self._num_pads)
-            margin = 0.01
-            n = nx * ny
-            for ipad in reversed(range(n)):
-                ix = (nx - 1 - ipad) %  nx
-                iy = ipad // nx
-
-                self._pads.append(pad(self, ( ix      * fx,  iy      * fy,
-                                             (ix + 1) * fx, (iy + 1) * fy)))
-                pass
-            pass
-
-        '''
-        else:  # Assuming regular, horizontal pad placement
-            f = 1. / float(self._num_pads)
-            offset = 0.2
-            height = 1 - offset
-            for idx in reversed(range(self._num_pads)):
-                self._pads.append(pad(self, (0, offset + idx * f * height, 1, offset + (idx + 1) * f * height)))
-                pass
+        # Draw pads, with a single canvas update
+        for p in self._created_pads():
+            draw_on(self._canvas, p._pad)
             pass
-            '''
-
-
-        # Draw pads
-        for p in self._pads:
-            self._canvas.cd()
-            p._pad.Draw()
+        with render_lock:
             self._canvas.Update()
             pass
         return
@@ -119,7 +101,7 @@ class canvas (object):
 
     def __del__ (self):
         """ Destructor. """
-        for p in self._pads:
+        for p in self._created_pads():
             del p
             pass
         del self._canvas
@@ -137,12 +119,12 @@ class canvas (object):
 
     def pad (self, idx=0):
         """ ... """
-        return self.pads()[idx]
+        return self._get_pad(idx)
 
 
     def pads (self):
         """ ... """
-        return self._pads
+        return [self._get_pad(idx) for idx in range(len(self._pads))]
 
 
 
@@ -155,7 +137,7 @@ class canvas (object):
                 idx_pad = kwargs.pop('idx_pad', idx_default)
                 assert idx_pad == -1 or (idx_pad >= 0 and idx_pad < self._num_pads), "Requested pad index {} is no good.".format(idx_pad)
                 # Find non-overlay pad
-                if is_overlay(self._pads[idx_pad]):
+                if is_overlay(self._get_pad(idx_pad)):
                     idx_pad = len(self._pads) - 1
                     while idx_pad >= 0:
                         idx_pad -= 1
@@ -163,7 +145,7 @@ class canvas (object):
                         pass
                     pass
                 assert idx_pad == -1 or (idx_pad >= 0 and idx_pad < self._num_pads), "Requested pad index {} is no good.".format(idx_pad)
-                method = getattr(self._pads[idx_pad], func.__name__)
+                method = getattr(self._get_pad(idx_pad), func.__name__)
                 # Note: func(self, ...) is never called
                 return method(*args, **kwargs)
             return wrapper
@@ -258,16 +240,21 @@ class canvas (object):
     def _update (self):
         """ ... """
 
-        self._canvas.Update()
+        with render_lock:
+            self._canvas.Update()
 
-        # Set up main- and ratio pads, in the most common case
-        if self._ratio: # and not self._setup (?)
-            self._setup_ratio_pads()
-            pass
+            # Make room for overlay axes (opt.)
+            self._layout_overlays()
+
+            # Set up main- and ratio pads, in the most common case
+            if self._ratio: # and not self._setup (?)
+                self._setup_ratio_pads()
+                pass
 
-        # Update children pads
-        for p in self._pads:
-            p._update()
+            # Update children pads
+            for p in self._created_pads():
+                p._update()
+                pass
             pass
 
         return
@@ -279,14 +266,146 @@ class canvas (object):
         return
 
 
-    def save (self, path):
-        """ ... """
+    def band (self, nominal, up, down=None, **kwargs):
+        """ Draw an uncertainty band on the main pad and, for ratio canvases, the relative band on the ratio pad; cf. `pad.band`. """
+        g = self._get_pad(0).band(nominal, up, down, **kwargs)
+        if self._ratio:
+            kwargs.pop('label', None)
+            kwargs.pop('option', None)
+            self._get_pad(1).band(nominal, up, down, relative=True, **kwargs)
+            pass
+        return g
 
-        self._update()
-        self._canvas.SaveAs(path)
+
+    def fill (self, hist, data, weights=None):
+        """ Append entries to histogram `hist`, drawn on any pad of this canvas; cf. `pad.fill`. """
+        for p in self._created_pads():
+            if id(hist) in p._live:
+                return p.fill(hist, data, weights=weights)
+            pass
+        warning("fill: Histogram {} is not drawn on this canvas.".format(hist.GetName() if hasattr(hist, 'GetName') else hist))
+        return None
+
+
+    def refresh (self, path=None, max_fps=10., force=False, **kwargs):
+        """ Redraw the canvas after calls to `fill`, and optionally save it to `path`.
+
+        Derived histograms whose inputs were filled, e.g. stack sums and ratio
+        plots, are recomputed, and the axis ranges and out-of-bounds markers of
+        the pads which changed are updated; other pads are left untouched.
+        Redraws are limited to at most `max_fps` per second: calls arriving
+        sooner after the previous redraw return immediately, and the changes
+        are carried over to the next redraw. Use `force=True` for the final
+        redraw. Additional keyword arguments are passed to `save`, e.g.
+        `incremental=True` for JSON output.
+
+        Returns whether the canvas was redrawn.
+        """
+
+        # Check(s)
+        now = time.time()
+        if not force and max_fps and now - self._last_refresh < 1. / max_fps:
+            return False
+
+        with render_lock:
+            pads = self._created_pads()
+
+            # Propagate changes to derived histograms, across pads
+            changed = set()
+            for p in pads:
+                changed |= p._changed
+                pass
+            for p in pads:
+                p._update_derived(changed)
+                pass
+
+            # Update changed pads only
+            for p in filter(lambda p: p._changed, pads):
+                p._update_oob()
+                p._update()
+                p._changed = set()
+                pass
+            self._canvas.Modified()
+            self._canvas.Update()
+            pass
+        self._last_refresh = now
+
+        if path is not None:
+            self.save(path, **kwargs)
+            pass
+        return True
+
+
+    def spec (self):
+        """ Return the recorded plot specification, or None if the canvas is not recording. """
+        if self._recorder is None:
+            warning("spec: Canvas was not created with 'record=True'.")
+            return None
+        return self._recorder.spec()
+
+
+    def save (self, path, manifest=None, preview=None, incremental=False):
+        """ Save the canvas to `path`.
+
+        Paths ending in '.json' or '.json.gz' export the canvas and all its
+        primitives as compact JSON, to be rendered in the browser by JSROOT,
+        instead of painting it. With `incremental=True`, repeated exports to
+        the same path only contain the histograms whose contents changed since
+        the previous export; cf. `rootplotting.jsonexport.update`.
+
+        If a `rootplotting.manifest` is given, rendering and saving is skipped
+        when the output file is up to date with the recorded plot
+        specification. Requires the canvas to be created with `record=True`.
+
+        With `preview` set to True or a `rootplotting.preview.index`, only a
+        small, reduced-detail PNG thumbnail is written instead of `path`, along
+        with the plot specification if recording, from which `path` can be
+        rendered later on; cf. `rootplotting.preview.render`. Without recording,
+        the thumbnail is added to the index without a link.
+        """
+
+        # Write thumbnail instead of the requested output (opt.)
+        target = path
+        if preview:
+            path, spec_path = previews.paths(target)
+            if self._recorder is not None:
+                dump_spec(self._recorder.spec(), spec_path)
+            else:
+                warning("save: Canvas was not created with 'record=True'. Only the preview of '{}' is written, and it cannot be rendered later.".format(target))
+                pass
+            if isinstance(preview, previews.index):
+                preview.add(path, target if self._recorder is not None else None)
+                pass
+            pass
+
+        # Check(s)
+        digest = None
+        if manifest is not None:
+            if self._recorder is None:
+                warning("save: Canvas was not created with 'record=True'. Cannot skip unchanged plots.")
+            else:
+                digest = fingerprint(self._recorder.spec(), path)
+                if manifest.is_current(path, digest):
+                    manifest.skip(path)
+                    return
+                pass
+            pass
+
+        if preview:
+            self._save_preview(path, previews.SCALE)
+        elif jsonexport.is_json(path):
+            self._save_json(path, incremental)
+        else:
+            self._save(path)
+            pass
+
+        if digest is not None:
+            manifest.add(path, digest)
+            pass
         return
 
 
+    @recorded
     def region (self, name, xmin, xmax, offset=0.10): # @TODO: do **kwargs for text- and line styling
         """ ... """
 
@@ -294,7 +413,7 @@ class canvas (object):
         # ...
 
         # Main pad
-        pad = self._pads[0]
+        pad = self._get_pad(0)
         pad._bare().cd()
 
         axis = pad._get_first_primitive().GetXaxis()
@@ -320,7 +439,7 @@ class canvas (object):
         # Remaining pads (opt.)
         for idx in range(1,len(self._pads)):
             pad = self._pads[idx]
-            if is_overlay(pad): continue
+            if is_lazy_pad(pad) or is_overlay(pad): continue
             pad._bare().cd()
 
             if drawmin: xmin = pad.xline(xmin, linewidth=2)
@@ -330,6 +449,91 @@ class canvas (object):
         return
 
 
+    def facet (self, values, categories, bins, weights=None, facets=None, facet_bins=None, labels=None, kind='hist', log=None, **kwargs):
+        """ Split `values` by the `categories` column and draw one histogram per pad.
+
+        The facets are either the discrete category values in `facets` (by
+        default all unique values of `categories`) or the intervals defined by
+        the edges in `facet_bins`. All facets are filled from a single grouped
+        pass over the data, and the pads share a common y-axis range.
+
+        Returns the list of histograms drawn, in pad order.
+        """
+
+        # Check(s)
+        values     = np.asarray(values)
+        categories = np.asarray(categories)
+        bins       = np.asarray(bins, dtype=np.float64)
+        assert values.shape == categories.shape, "Values and categories must have the same shape."
+        assert len(bins) >= 2, "Number of bins {} is not accepted".format(len(bins))
+        if facets is not None and facet_bins is not None:
+            warning("facet: Both 'facets' and 'facet_bins' were specified. Using the latter.")
+            pass
+
+        # Map each entry to a facet index; -1 means the entry is not shown
+        if facet_bins is not None:
+            facet_bins = np.asarray(facet_bins, dtype=np.float64)
+            ifacet = bin_indices(categories, facet_bins) - 1
+            ifacet[ifacet >= len(facet_bins) - 1] = -1
+            nfacets = len(facet_bins) - 1
+        else:
+            facets = np.unique(categories) if facets is None else np.asarray(facets)
+            order  = np.argsort(facets, kind='mergesort')
+            pos    = np.clip(np.searchsorted(facets[order], categories), 0, len(facets) - 1)
+            ifacet = np.where(facets[order][pos] == categories, order[pos], -1)
+            nfacets = len(facets)
+            pass
+
+        # Only the pads used are created, for lazy canvases
+        indices = [idx for idx, p in enumerate(self._pads) if not is_overlay(p)]
+        assert nfacets <= len(indices), "Number of facets {} exceeds number of pads {}".format(nfacets, len(indices))
+        main_pads = [self._get_pad(idx) for idx in indices[:nfacets]]
+
+        # Fill all facets in one pass, with ROOT-style under- and overflow bins
+        ncells = len(bins) + 1
+        ibin   = bin_indices(values, bins)
+        msk    = ifacet >= 0
+        cells  = ifacet[msk] * ncells + ibin[msk]
+        w      = np.ones(np.count_nonzero(msk)) if weights is None else np.asarray(weights, dtype=np.float64)[msk]
+        sumw   = np.bincount(cells, weights=w,     minlength=nfacets * ncells).reshape(nfacets, ncells)
+        sumw2  = np.bincount(cells, weights=w * w, minlength=nfacets * ncells).reshape(nfacets, ncells)
+
+        hists = list()
+        for idx in range(nfacets):
+            p = main_pads[idx]
+            if log is not None:
+                p._log = log
+                self._record(p, 'log', log)
+                pass
+
+            h = ROOT.TH1F(unique_name('h_facet'), "", len(bins) - 1, bins)
+            array2hist(sumw[idx], h, errors=np.sqrt(sumw2[idx]))
+            hists.append(getattr(p, kind)(h, **kwargs))
+
+            if labels is not None:
+                p.text([labels[idx]], ATLAS=False)
+                pass
+            pass
+
+        # Shared y-axis range, from the histograms as drawn, i.e. after scaling and normalisation
+        ymax     = max([m for m in map(get_maximum,          hists) if m is not None] + [0.])
+        positive = min([m for m in map(get_minimum_positive, hists) if m is not None] + [inf])
+        if ymax > 0:
+            for p in main_pads[:nfacets]:
+                if p._log:
+                    ymin = p._ymin or (positive * 0.8)
+                    p._ylim = (ymin, np.exp((np.log(ymax) - np.log(ymin)) / (1. - p._padding) + np.log(ymin)))
+                else:
+                    p._ylim = (0, ymax / (1. - p._padding))
+                    pass
+                self._record(p, 'ylim', *p._ylim)
+                pass
+            pass
+
+        self._update()
+        return hists
+
+
 
     # Private accessor methods
     # ----------------------------------------------------------------
@@ -339,6 +543,173 @@ class canvas (object):
         return self._canvas
 
 
+    def _layout (self, fraction):
+        """ Return the coordinates of all pads, and whether they are placed on a regular grid. """
+        coords, grid = list(), False
+        if isinstance(self._num_pads, int) and self._num_pads <= 2:
+            if   self._num_pads == 1:
+                coords.append((0, 0, 1, 1))
+            elif self._num_pads == 2:
+                coords.append((0, fraction, 1, 1))
+                coords.append((0, 0, 1, fraction))
+                pass
+        elif isinstance(fraction, (list, tuple)):
+
+            assert len(fraction) == self._num_pads
+            if set(map(type,fraction)) == {int}:
+                fraction = [f / float(sum(fraction)) for f in fraction]
+            else:
+                assert np.abs(np.sum(fraction) - 1.0) < 1.0E-06, "Fractions don't sum to one: {}".format(sum(fraction))
+                pass
+
+            fractions = 1. - np.cumsum([0] + list(fraction))
+            
+            margin = 0.1
+            m1, m2 = margin, 0.
+            for y2, y1 in zip(fractions[:-1], fractions[1:]):
+                # @TODO: Margin?
+                coords.append((0, y1, 1, y2 ))
+                m2 += margin / float(self._num_pads - 1)
+                m1 -= margin / float(self._num_pads - 1)
+                pass
+
+        else: # Assuming regular pad placement
+            grid = True
+            if isinstance(self._num_pads, int):
+                self._num_pads = [self._num_pads]
+                pass
+            self._num_pads = list(self._num_pads)
+            while len(self._num_pads) < 2: self._num_pads.insert(0, 1)
+            assert len(self._num_pads) == 2
+
+            nx, ny = self._num_pads
+            fx, fy = map(lambda n: 1. / float(n), self._num_pads)
+            margin = 0.01
+            n = nx * ny
+            for ipad in reversed(range(n)):
+                ix = (nx - 1 - ipad) %  nx
+                iy = ipad // nx
+
+                coords.append(( ix      * fx,  iy      * fy,
+                               (ix + 1) * fx, (iy + 1) * fy))
+                pass
+            pass
+
+        '''
+        else:  # Assuming regular, horizontal pad placement
+            f = 1. / float(self._num_pads)
+            offset = 0.2
+            height = 1 - offset
+            for idx in reversed(range(self._num_pads)):
+                self._pads.append(pad(self, (0, offset + idx * f * height, 1, offset + (idx + 1) * f * height)))
+                pass
+            pass
+            '''
+
+        return coords, grid
+
+
+    def _save (self, path):
+        """ Render the canvas and write it to `path`, rasterising layers marked with `rasterize=True` in vector output. """
+        with render_lock:
+            self._update()
+            with rasterized(self, path):
+                self._canvas.SaveAs(path)
+                pass
+            pass
+        return
+
+
+    def _save_json (self, path, incremental=False):
+        """ Export the canvas, or only its changed histograms, as JSON to `path`. """
+        with render_lock:
+            self._update()
+            if incremental and path in self._exported:
+                string = jsonexport.update(self, self._exported[path])
+            else:
+                string = jsonexport.export(self)
+                self._exported[path] = jsonexport.digests(self)
+                pass
+            pass
+        jsonexport.write(string, path)
+        return
+
+
+    def _save_preview (self, path, scale):
+        """ Render a down-scaled, reduced-detail raster image of the canvas to `path`. """
+        with render_lock, previews.reduced_detail(self), previews.scaled_text(self, scale):
+            self._update()
+            w, h = self._canvas.GetWw(), self._canvas.GetWh()
+            self._canvas.SetCanvasSize(int(w * scale), int(h * scale))
+            self._canvas.SaveAs(path)
+            self._canvas.SetCanvasSize(w, h)
+            pass
+        return
+
+
+    def _record (self, pad, method, *args):
+        """ Record a call to `method` on `pad` which is carried out directly on its members. """
+        if self._recorder is not None and self._recorder.depth == 0:
+            self._recorder.add(pad, method, args, {})
+            pass
+        return
+
+
+    def _create_canvas (self):
+        """ Return the underlying ROOT canvas. """
+        return ROOT.TCanvas(unique_name('c'), "", self._size[0], self._size[1])
+
+
+    def _create_pad (self, coords, draw=True):
+        """ Return a new pad with `coords` on this canvas. """
+        return pad(self, coords, draw=draw)
+
+
+    def _wrap (self, tpad):
+        """ Return the ROOT pad `tpad`, of a pad or overlay on this canvas, as it is to be used by that pad. """
+        return tpad
+
+
+    def _get_pad (self, idx):
+        """ Return the pad at `idx`, creating and drawing it if it is still lazy. """
+        if is_lazy_pad(self._pads[idx]):
+            self._pads[idx] = self._create_pad(self._pads[idx])
+            pass
+        return self._pads[idx]
+
+
+    def _created_pads (self):
+        """ Return the list of pads which have been created, skipping lazy ones. """
+        return [p for p in self._pads if not is_lazy_pad(p)]
+
+
+    def _layout_overlays (self):
+        """ Resize canvas and set pad margins to fit all overlay axes.
+
+        Only does any work when the required right margin has changed since
+        the last layout, i.e. typically once, at render time.
+        """
+
+        # Check(s)
+        overlays = filter(is_overlay, self._created_pads())
+        if len(overlays) == 0: return
+
+        right_margin = max(map(lambda o: o._required_right_margin(), overlays))
+        if right_margin == self._right_margin: return
+
+        # Resize canvas, relative to the originally requested size
+        w_initial = 1 - ROOT.gStyle.GetPadLeftMargin() - ROOT.gStyle.GetPadRightMargin()
+        w_final   = 1 - ROOT.gStyle.GetPadLeftMargin() - right_margin
+        self._canvas.SetCanvasSize(int(self._size[0] * w_initial / w_final), self._size[1])
+
+        for p in self._created_pads():
+            p._bare().SetRightMargin(right_margin)
+            pass
+
+        self._right_margin = right_margin
+        return
+
+
     def _setup_ratio_pads (self):
         """ ... """
 
@@ -385,3 +756,15 @@ class canvas (object):
         return
 
     pass
+
+
+def get_backend (backend):
+    """ Return the canvas class implementing the rendering `backend`. """
+    if backend == 'matplotlib':
+        from rootplotting.mplcanvas import mpl_canvas
+        return mpl_canvas
+    elif backend == 'null':
+        from rootplotting.nullcanvas import null_canvas
+        return null_canvas
+    assert backend == 'root', "Rendering backend '{}' not recognised.".format(backend)
+    return canvas
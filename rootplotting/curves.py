@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+
+""" Sort- and prefix sum-based ROC, cumulative distribution, and cut-scan curves for large arrays of scores."""
+
+# Scientific import(s)
+try:
+    import numpy as np
+except:
+    print "ERROR: Scientific python packages were not set up properly."
+    print " $ source snippets/pythonenv.sh"
+    print "or see e.g. [http://rootpy.github.io/root_numpy/start.html]."
+    raise
+
+# Project import(s)
+from rootplotting.tools import *
+from rootplotting.histogram import histogram
+
+
+def order (scores):
+    """ Return the index sorting `scores` in descending order.
+
+    The sort is the most expensive step for large samples, and its result can
+    be passed as `order` to `cumulative` and `roc`, e.g. when drawing several
+    curves from the same sample with different weights.
+    """
+    return np.argsort(-np.asarray(scores), kind='mergesort')
+
+
+def cumulative (scores, weights=None, order=None, upper=True, normalise=True):
+    """ Return the unique thresholds and the cumulative weight of `scores` above (`upper=True`) or below each.
+
+    For `upper=True`, the weight of all entries with scores at or above each
+    threshold is returned, i.e. the efficiency of a lower cut at that value;
+    otherwise, that of all entries strictly below. Computed with one sort
+    (skipped if `order` is given) and a prefix sum. With `normalise=True`, the
+    result is relative to the total weight.
+    """
+    thresholds, cumsum, total = _sorted_cumsum(scores, weights, order)
+    if not upper:
+        cumsum = total - cumsum
+        pass
+    if normalise and total != 0:
+        cumsum = cumsum / total
+        pass
+    return thresholds[::-1], cumsum[::-1]
+
+
+def roc (sig, bkg, weights=(None, None), order=(None, None)):
+    """ Return the background and signal efficiencies of lower cuts on the scores, and the area under the curve.
+
+    Each sample is sorted once (or not at all, if its `order` is given), and
+    cumulative weights are computed by prefix sums. The efficiencies of both
+    samples are then evaluated at the thresholds of either sample by binary
+    search, such that the curve includes every distinct cut. Returns
+    (background efficiencies, signal efficiencies, AUC), with points ordered
+    by increasing efficiency, starting at (0, 0) and ending at (1, 1).
+    """
+
+    t_sig, c_sig, n_sig = _sorted_cumsum(sig, weights[0], order[0])
+    t_bkg, c_bkg, n_bkg = _sorted_cumsum(bkg, weights[1], order[1])
+
+    # Efficiencies of both samples at all thresholds
+    thresholds = np.concatenate((t_sig, t_bkg))
+    eff_sig = _evaluate(t_sig, c_sig, thresholds) / n_sig
+    eff_bkg = _evaluate(t_bkg, c_bkg, thresholds) / n_bkg
+
+    idx = np.lexsort((eff_sig, eff_bkg))
+    eff_bkg = np.concatenate(([0.], eff_bkg[idx], [1.]))
+    eff_sig = np.concatenate(([0.], eff_sig[idx], [1.]))
+    auc = np.sum(np.diff(eff_bkg) * 0.5 * (eff_sig[1:] + eff_sig[:-1]))
+    return eff_bkg, eff_sig, auc
+
+
+def significance (sig, bkg, bins=None, weights=(None, None), cut='lower', method='asimov'):
+    """ Return the bin edges and the expected significance of a cut at each.
+
+    `sig` and `bkg` are 1D histograms, ROOT or `histogram`, arrays of bin
+    values, or arrays of values which are histogrammed with `bins` and the
+    optional `weights`. The signal and background yields passing a lower
+    (`cut='lower'`, keeping values at or above the edge) or upper
+    (`cut='upper'`, keeping values below) cut at every bin edge are computed
+    from cumulative sums over the bins, incl. under- and overflow. The
+    significance is then computed as s/sqrt(b) (`method='simple'`), or in the
+    Asimov approximation, sqrt(2 ((s + b) ln(1 + s/b) - s)) (`method='asimov'`).
+    Cuts without background are assigned zero significance.
+    """
+
+    # Check(s)
+    assert cut    in ['lower', 'upper'],    "Cut type {} not recognised.".format(cut)
+    assert method in ['simple', 'asimov'], "Significance method {} not recognised.".format(method)
+
+    sig = _binned(sig, bins, weights[0])
+    bkg = _binned(bkg, bins if bins is not None else sig.edges[0], weights[1])
+    assert sig.ndim == 1 and np.allclose(sig.edges[0], bkg.edges[0]), "Signal and background must have the same 1D binning."
+
+    # Yields passing the cut at each edge
+    if cut == 'lower':
+        s = np.cumsum(sig.sumw[::-1])[::-1][1:]
+        b = np.cumsum(bkg.sumw[::-1])[::-1][1:]
+    else:
+        s = np.cumsum(sig.sumw)[:-1]
+        b = np.cumsum(bkg.sumw)[:-1]
+        pass
+
+    s = np.clip(s, 0, None)
+    safe = np.where(b > 0, b, 1.)
+    if method == 'simple':
+        z = s / np.sqrt(safe)
+    else:
+        z = np.sqrt(np.clip(2. * ((s + safe) * np.log1p(s / safe) - s), 0, None))
+        pass
+    return sig.edges[0].copy(), np.where(b > 0, z, 0.)
+
+
+def downsample (x, y, nx, ny, xrange=(0., 1.), yrange=(0., 1.)):
+    """ Return the mask of points on the curve (`x`, `y`) which move to a new cell of an `nx` by `ny` grid, e.g. of pixels.
+
+    Consecutive points falling within the same cell are dropped, except for
+    the first and last points of the curve, such that the drawn curve is
+    unchanged at the given resolution.
+    """
+    ix = np.floor((np.asarray(x) - xrange[0]) / float((xrange[1] - xrange[0]) or 1.) * nx)
+    iy = np.floor((np.asarray(y) - yrange[0]) / float((yrange[1] - yrange[0]) or 1.) * ny)
+    keep = np.ones(len(ix), dtype=bool)
+    keep[1:-1] = (ix[1:-1] != ix[:-2]) | (iy[1:-1] != iy[:-2])
+    return keep
+
+
+
+# Private helper function(s)
+# --------------------------------------------------------------------
+
+def _sorted_cumsum (scores, weights=None, index=None):
+    """ Return the unique thresholds, in descending order, the cumulative weight at or above each, and the total weight. """
+    scores = np.asarray(scores)
+    if index is None:
+        index = order(scores)
+        pass
+    s = scores[index]
+    w = np.ones(len(s)) if weights is None else np.asarray(weights, dtype=np.float64)[index]
+    cumsum = np.cumsum(w)
+
+    # Last entry of each run of identical scores
+    last = np.ones(len(s), dtype=bool)
+    last[:-1] = s[1:] != s[:-1]
+    return s[last], cumsum[last], cumsum[-1] if len(cumsum) else 0.
+
+
+def _evaluate (thresholds, cumsum, at):
+    """ Return the cumulative weight at or above each of the values `at`, given descending `thresholds`. """
+    n = np.searchsorted(-thresholds, -np.asarray(at), side='right')
+    return np.concatenate(([0.], cumsum))[n]
+
+
+def _binned (obj, bins=None, weights=None):
+    """ Convert ROOT TH1, `histogram`, array of bin values, or array of values to be filled with `bins`, to a `histogram`. """
+    if isinstance(obj, histogram):
+        return obj
+    elif hasattr(obj, 'InheritsFrom'):
+        return histogram.from_root(obj)
+    assert bins is not None, "You need to specify 'bins' for array-type inputs."
+    if len(obj) == len(bins) - 1:
+        return histogram.from_values(bins, np.asarray(obj, dtype=np.float64))
+    return histogram(bins).fill(obj, weights=weights)
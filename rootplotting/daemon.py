@@ -0,0 +1,212 @@
+# -*- coding: utf-8 -*-
+
+""" Long-lived plotting daemon, rendering plot specifications received over a local socket."""
+
+# Basic import(s)
+import os
+import sys
+import time
+import errno
+import signal
+import socket
+import argparse
+
+# Scientific import(s)
+import ROOT
+
+# Project import(s)
+from rootplotting.tools import *
+from rootplotting.spec import decode, replay
+from rootplotting_client import ADDRESS, family, send, receive
+
+
+# Class definition
+class daemon (object):
+    """
+    Plotting server, keeping ROOT, numpy, and the style loaded between plots.
+
+    On start-up, the daemon imports all dependencies and creates a first
+    canvas, which are the main costs of short plotting scripts, and then forks
+    a pool of worker processes which accept requests on a shared Unix socket
+    (or localhost port) concurrently. Each request holds a plot specification,
+    cf. `rootplotting.spec`, and an output path; the worker replays the
+    specification using `canvas` and `pad`, saves the plot, and responds with
+    the output path and the rendering time. Workers are replaced after
+    `max_requests` requests, to bound the memory held by long-lived ROOT
+    processes, and if they exit unexpectedly.
+
+    Requests are sent using `rootplotting_client.client`, which does not import
+    ROOT.
+
+    Usage:
+        $ python -m rootplotting.daemon --workers 4 &
+        $ python -m rootplotting_client plots/myplot.spec.json.gz plots/myplot.pdf
+    """
+
+    def __init__ (self, address=ADDRESS, workers=4, backend='root', max_requests=500):
+        """ Constructor. `address` is a Unix socket path, or a (host, port) tuple. """
+        super(daemon, self).__init__()
+
+        # Check(s)
+        assert workers > 0, "Number of workers {} is too small".format(workers)
+        if isinstance(address, tuple) and address[0] not in ['localhost', '127.0.0.1']:
+            warning("daemon: Listening on non-local address {}. Requests are not authenticated.".format(address[0]))
+            pass
+
+        # Member variables
+        self._address      = address
+        self._workers      = workers
+        self._backend      = backend
+        self._max_requests = max_requests
+        self._children     = set()
+        return
+
+
+    def serve (self):
+        """ Warm up, start the workers, and serve requests until interrupted. """
+
+        self._warm_up()
+        sock = self._bind()
+        print "rootplotting daemon listening on {} with {} workers.".format(self._address, self._workers)
+
+        # Stop on SIGTERM as on Ctrl-C
+        signal.signal(signal.SIGTERM, lambda *args: sys.exit(0))
+        try:
+            for _ in range(self._workers):
+                self._spawn(sock)
+                pass
+
+            # Replace workers as they exit
+            while True:
+                try:
+                    pid, _ = os.wait()
+                except OSError as e:
+                    if e.errno == errno.EINTR: continue
+                    raise
+                if pid in self._children:
+                    self._children.remove(pid)
+                    self._spawn(sock)
+                    pass
+                pass
+        except (KeyboardInterrupt, SystemExit):
+            pass
+        finally:
+            for pid in self._children:
+                try:
+                    os.kill(pid, signal.SIGTERM)
+                except OSError:
+                    pass
+                pass
+            sock.close()
+            if family(self._address) == socket.AF_UNIX and os.path.exists(self._address):
+                os.unlink(self._address)
+                pass
+            pass
+        return
+
+
+
+    # Private methods
+    # ----------------------------------------------------------------
+
+    def _warm_up (self):
+        """ Load the graphics libraries by creating, and painting, a first canvas. """
+        from rootplotting import canvas
+        c = canvas(batch=True, backend=self._backend)
+        c._update()
+        del c
+        return
+
+
+    def _bind (self):
+        """ Return a listening socket bound to the daemon's address. """
+        if family(self._address) == socket.AF_UNIX and os.path.exists(self._address):
+            os.unlink(self._address) # Stale socket from a previous daemon
+            pass
+        sock = socket.socket(family(self._address), socket.SOCK_STREAM)
+        if family(self._address) == socket.AF_INET:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            pass
+        sock.bind(self._address)
+        if family(self._address) == socket.AF_UNIX:
+            os.chmod(self._address, 0600)
+            pass
+        sock.listen(128)
+        return sock
+
+
+    def _spawn (self, sock):
+        """ Fork a worker process accepting requests on `sock`. """
+        pid = os.fork()
+        if pid == 0:
+            # Worker: default signal handling; Ctrl-C is handled by the parent
+            signal.signal(signal.SIGTERM, signal.SIG_DFL)
+            signal.signal(signal.SIGINT,  signal.SIG_IGN)
+            try:
+                self._work(sock)
+            finally:
+                os._exit(0)
+                pass
+            pass
+        self._children.add(pid)
+        return
+
+
+    def _work (self, sock):
+        """ Serve up to `max_requests` requests on `sock`. """
+        for _ in range(self._max_requests):
+            conn, _ = sock.accept()
+            try:
+                request = receive(conn)
+                if request is not None:
+                    send(conn, self._handle(request))
+                    pass
+            except socket.error as e:
+                warning("daemon: Connection error: {}".format(e))
+            finally:
+                conn.close()
+                pass
+            pass
+        return
+
+
+    def _handle (self, request):
+        """ Render the plot described by `request`, and return the response. """
+        start = time.time()
+        try:
+            path = str(request['path'])
+            spec = str(request['spec_path']) if 'spec_path' in request else decode(request['spec'])
+            c = replay(spec, path=path, batch=True, backend=str(request.get('backend', self._backend)))
+            del c
+        except Exception as e:
+            return {'error': "{}: {}".format(type(e).__name__, e)}
+        return {'path': path, 'time': time.time() - start, 'worker': os.getpid()}
+
+    pass
+
+
+
+# Main function
+# --------------------------------------------------------------------
+
+def main (args=None):
+    """ Start the plotting daemon. """
+    parser = argparse.ArgumentParser(description="Serve plot requests from a pool of warm rootplotting workers.")
+    parser.add_argument('--address', default=ADDRESS, help="Unix socket path, or host:port, to listen on.")
+    parser.add_argument('--workers', default=4, type=int, help="Number of worker processes.")
+    parser.add_argument('--backend', default='root', help="Default rendering backend.")
+    parser.add_argument('--max-requests', default=500, type=int, help="Number of requests after which a worker is replaced.")
+    args = parser.parse_args(args)
+
+    address = args.address
+    if ':' in address and not address.startswith('/'):
+        host, port = address.rsplit(':', 1)
+        address = (host, int(port))
+        pass
+
+    daemon(address, workers=args.workers, backend=args.backend, max_requests=args.max_requests).serve()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
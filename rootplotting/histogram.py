@@ -0,0 +1,668 @@
+# -*- coding: utf-8 -*-
+
+""" Lightweight, numpy-backed histogram, converted to ROOT only when drawn."""
+
+# Scientific import(s)
+import ROOT
+try:
+    import numpy as np
+    from root_numpy import array2hist
+except:
+    print "ERROR: Scientific python packages were not set up properly."
+    print " $ source snippets/pythonenv.sh"
+    print "or see e.g. [http://rootpy.github.io/root_numpy/start.html]."
+    raise
+
+# Project import(s)
+from rootplotting.tools import *
+
+
+# Global definitions
+MAX_ELEMENTS = 10000000 # Maximal number of entries times replicas held in memory at once when bootstrapping
+QUANTILES    = (0.158655, 0.841345) # Quantiles corresponding to a central 1-sigma interval
+
+
+# Class definition
+class histogram (object):
+    """
+    One- or two-dimensional histogram of weighted entries.
+
+    Bin contents (`sumw`) and sums of squared weights (`sumw2`) are stored
+    with ROOT's layout, i.e. including under- and overflow bins along each
+    axis, such that index 0 is the underflow and index -1 the overflow bin.
+    All arithmetic is vectorised, and a ROOT TH1F/TH2F is only created when
+    calling `to_root`.
+    """
+
+    __slots__ = ('edges', 'sumw', 'sumw2')
+
+    def __init__ (self, bins, sumw=None, sumw2=None):
+        """ Constructor.
+
+        `bins` are the bin edges, either a single array for 1D histograms or
+        a tuple of two arrays for 2D histograms.
+        """
+
+        # Check(s)
+        if isinstance(bins, tuple):
+            self.edges = tuple(np.asarray(b, dtype=np.float64) for b in bins)
+        else:
+            self.edges = (np.asarray(bins, dtype=np.float64),)
+            pass
+        assert len(self.edges) in [1, 2], "Only 1D and 2D histograms are supported."
+        for e in self.edges:
+            assert len(e) >= 2, "Number of bins {} is not accepted".format(len(e))
+            pass
+
+        shape = tuple(len(e) + 1 for e in self.edges)
+        self.sumw  = np.zeros(shape) if sumw  is None else np.asarray(sumw,  dtype=np.float64).reshape(shape)
+        self.sumw2 = self.sumw.copy() if sumw2 is None else np.asarray(sumw2, dtype=np.float64).reshape(shape)
+        return
+
+
+    @classmethod
+    def from_root (cls, hist):
+        """ Create histogram from a ROOT TH1 or TH2. """
+        edges = (axis_edges(hist.GetXaxis()),)
+        if hist.GetDimension() == 2:
+            edges += (axis_edges(hist.GetYaxis()),)
+            pass
+        sumw, sumw2 = hist_arrays(hist)
+        return cls(edges if len(edges) > 1 else edges[0], sumw, sumw2)
+
+
+    @classmethod
+    def from_values (cls, bins, values, errors=None):
+        """ Create 1D histogram from in-range bin values, and optional errors. """
+        h = cls(bins)
+        h.sumw [1:-1] = values
+        h.sumw2[1:-1] = np.abs(values) if errors is None else np.square(errors)
+        return h
+
+
+
+    # Public properties
+    # ----------------------------------------------------------------
+
+    @property
+    def ndim (self):
+        """ Number of dimensions. """
+        return len(self.edges)
+
+
+    @property
+    def values (self):
+        """ Bin contents, excluding under- and overflow bins. """
+        return self.sumw[self._inner()]
+
+
+    @property
+    def errors (self):
+        """ Bin errors, excluding under- and overflow bins. """
+        return np.sqrt(self.sumw2[self._inner()])
+
+
+    @property
+    def underflow (self):
+        """ Contents of the underflow bin(s). """
+        return self.sumw[0]
+
+
+    @property
+    def overflow (self):
+        """ Contents of the overflow bin(s). """
+        return self.sumw[-1]
+
+
+    @property
+    def centres (self):
+        """ Bin centres along the x-axis. """
+        return 0.5 * (self.edges[0][1:] + self.edges[0][:-1])
+
+
+    @property
+    def widths (self):
+        """ Bin widths along the x-axis. """
+        return np.diff(self.edges[0])
+
+
+
+    # Public filling methods
+    # ----------------------------------------------------------------
+
+    def fill (self, values, weights=None):
+        """ Fill `values` (a tuple of arrays for 2D), with optional weights, in a single pass. """
+
+        cells = self.cell_indices(values)
+        w = None if weights is None else np.asarray(weights, dtype=np.float64)
+        size = self.sumw.size
+        self.sumw  += np.bincount(cells, weights=w, minlength=size).reshape(self.sumw.shape)
+        self.sumw2 += np.bincount(cells, weights=None if w is None else w * w, minlength=size).reshape(self.sumw.shape)
+        return self
+
+
+    def cell_indices (self, values):
+        """ Return flat indices into `sumw` for each of `values`. """
+        if self.ndim == 1:
+            return bin_indices(values, self.edges[0])
+        ix = bin_indices(values[0], self.edges[0])
+        iy = bin_indices(values[1], self.edges[1])
+        return ix * (len(self.edges[1]) + 1) + iy
+
+
+
+    # Public arithmetic methods
+    # ----------------------------------------------------------------
+
+    def copy (self):
+        """ ... """
+        return histogram(self.edges if self.ndim > 1 else self.edges[0], self.sumw.copy(), self.sumw2.copy())
+
+
+    def integral (self):
+        """ Sum of bin contents, excluding under- and overflow bins, as TH1::Integral. """
+        return self.values.sum()
+
+
+    def scale (self, factor):
+        """ Scale histogram in place. """
+        self.sumw  *= factor
+        self.sumw2 *= factor * factor
+        return self
+
+
+    def normalise (self):
+        """ Normalise histogram in place to unit integral, if possible. """
+        integral = self.integral()
+        if integral > 0.:
+            self.scale(1. / integral)
+            pass
+        return self
+
+
+    def divide (self, other, default=0., errors='numerator'):
+        """ Return the bin-by-bin ratio of this histogram to `other`.
+
+        Bins where `other` is not positive are set to `default`, with a large
+        error. Errors are either propagated from the numerator only
+        ('numerator'), or from both histograms assuming no correlation
+        ('uncorrelated').
+        """
+
+        # Check(s)
+        self._check_compatible(other)
+        assert errors in ['numerator', 'uncorrelated'], "Error propagation '{}' not recognised.".format(errors)
+
+        num, den = self.sumw, other.sumw
+        msk = den > 0
+        safe = np.where(msk, den, 1.)
+        ratio = np.where(msk, num / safe, default)
+        if errors == 'numerator':
+            ratio_e2 = self.sumw2 / np.square(safe)
+        else:
+            ratio_e2 = (self.sumw2 + np.square(ratio) * other.sumw2) / np.square(safe)
+            pass
+        ratio_e2 = np.where(msk, ratio_e2, 9999. ** 2)
+
+        return histogram(self.edges if self.ndim > 1 else self.edges[0], ratio, ratio_e2)
+
+
+    def rebin (self, bins):
+        """ Return a rebinned 1D histogram.
+
+        `bins` is either an integer number of consecutive bins to merge, or a
+        set of new bin edges, each of which must coincide with an existing
+        edge.
+        """
+
+        # Check(s)
+        assert self.ndim == 1, "Only 1D histograms can be rebinned."
+        edges = self.edges[0]
+        if isinstance(bins, (int, long, np.integer)):
+            assert (len(edges) - 1) % bins == 0, "Number of bins {} is not divisible by {}".format(len(edges) - 1, bins)
+            bins = edges[::bins]
+        else:
+            bins = np.asarray(bins, dtype=np.float64)
+            assert np.all(np.isin(bins, edges)), "New bin edges must be a subset of the existing ones."
+            pass
+
+        # Map each old cell, incl. under- and overflow, to a new cell
+        cells = np.concatenate(([0], bin_indices(self.centres, bins), [len(bins)]))
+        sumw  = np.bincount(cells, weights=self.sumw,  minlength=len(bins) + 1)
+        sumw2 = np.bincount(cells, weights=self.sumw2, minlength=len(bins) + 1)
+        return histogram(bins, sumw, sumw2)
+
+
+    def __add__ (self, other):
+        """ ... """
+        return self.copy().__iadd__(other)
+
+
+    def __iadd__ (self, other):
+        """ ... """
+        self._check_compatible(other)
+        self.sumw  += other.sumw
+        self.sumw2 += other.sumw2
+        return self
+
+
+    def __sub__ (self, other):
+        """ ... """
+        self._check_compatible(other)
+        return histogram(self.edges if self.ndim > 1 else self.edges[0], self.sumw - other.sumw, self.sumw2 + other.sumw2)
+
+
+    def __mul__ (self, factor):
+        """ ... """
+        return self.copy().scale(factor)
+
+    __rmul__ = __mul__
+
+
+    def __div__ (self, other):
+        """ ... """
+        if isinstance(other, histogram):
+            return self.divide(other, errors='uncorrelated')
+        return self.copy().scale(1. / other)
+
+    __truediv__ = __div__
+
+
+
+    # Public range-finding methods
+    # ----------------------------------------------------------------
+
+    def maximum (self):
+        """ ... """
+        return self.values.max()
+
+
+    def minimum (self):
+        """ ... """
+        return self.values.min()
+
+
+    def minimum_positive (self):
+        """ ... """
+        values = self.values[self.values > 0]
+        return values.min() if values.size else None
+
+
+
+    # Public conversion methods
+    # ----------------------------------------------------------------
+
+    def to_root (self, name=None):
+        """ Return the histogram as a ROOT TH1F or TH2F. """
+        name = name or unique_name('h')
+        if self.ndim == 1:
+            h = ROOT.TH1F(name, "", len(self.edges[0]) - 1, self.edges[0])
+        else:
+            h = ROOT.TH2F(name, "", len(self.edges[0]) - 1, self.edges[0],
+                                    len(self.edges[1]) - 1, self.edges[1])
+            pass
+        array2hist(self.sumw, h, errors=np.sqrt(self.sumw2))
+        return h
+
+
+
+    # Private methods
+    # ----------------------------------------------------------------
+
+    def _inner (self):
+        """ Slice selecting all bins except under- and overflow. """
+        return tuple(slice(1, -1) for _ in self.edges)
+
+
+    def _check_compatible (self, other):
+        """ ... """
+        assert isinstance(other, histogram), "Can only combine with another histogram; got {}".format(type(other))
+        assert len(other.edges) == len(self.edges) and all(np.array_equal(a, b) for a, b in zip(self.edges, other.edges)), \
+            "Histograms have different binning."
+        return
+
+    pass
+
+
+
+# Class definition
+class variations (object):
+    """
+    Set of one- or two-dimensional histograms of the same values, filled with
+    different weights, e.g. systematic weight variations.
+
+    Bin contents (`sumw`) and sums of squared weights (`sumw2`) of all
+    variations are stored together, with shape (number of variations, number
+    of cells), where cells include under- and overflow bins with the same
+    flat layout as `histogram`. Bin indices are computed once for each fill,
+    and all variations are accumulated in the same pass over the entries.
+    Individual variations are only turned into `histogram`s, or ROOT
+    histograms, when requested.
+
+    Usage:
+        v = variations(bins, weights.shape[1])
+        v.fill(values, weights)  # weights has shape (number of entries, number of variations)
+        c.hist(v[0], ...)
+    """
+
+    __slots__ = ('edges', 'sumw', 'sumw2', 'names')
+
+    def __init__ (self, bins, n, names=None):
+        """ Constructor.
+
+        `bins` are the bin edges, as for `histogram`, and `n` the number of
+        variations, optionally with `names` for accessing them.
+        """
+
+        # Check(s)
+        assert n > 0, "Number of variations {} is too small".format(n)
+        assert names is None or len(names) == n, "Number of names {} is different from number of variations {}".format(len(names), n)
+
+        template = histogram(bins)
+        self.edges = template.edges
+        self.sumw  = np.zeros((n, template.sumw.size))
+        self.sumw2 = np.zeros((n, template.sumw.size))
+        self.names = list(names) if names is not None else None
+        return
+
+
+    @classmethod
+    def bootstrap (cls, bins, values, weights=None, ntoys=1000, seed=None, max_elements=MAX_ELEMENTS):
+        """ Return `ntoys` Poisson-bootstrap replicas of the histogram of `values`, as a set of variations.
+
+        Each entry enters each replica with its weight times an independent
+        Poisson(1) draw. The draws for all replicas are generated as one
+        (entries x replicas) array per chunk of entries, such that at most
+        `max_elements` are held in memory at once, and accumulated in a single
+        pass, cf. `fill`. Results are reproducible for a given `seed`,
+        independently of the chunk size.
+        """
+
+        # Check(s)
+        assert ntoys > 0, "Number of replicas {} is too small".format(ntoys)
+
+        rng = np.random.RandomState(seed)
+        values = tuple(map(np.asarray, values)) if isinstance(values, tuple) else np.asarray(values)
+        N = len(values[0]) if isinstance(values, tuple) else len(values)
+        weights = np.ones(N) if weights is None else np.asarray(weights, dtype=np.float64)
+
+        replicas  = cls(bins, ntoys)
+        chunksize = max(1, max_elements // ntoys)
+        for start in range(0, N, chunksize):
+            chunk = slice(start, start + chunksize)
+            w = weights[chunk]
+            toys = rng.poisson(1., size=(len(w), ntoys)) * w[:, np.newaxis]
+            replicas.fill(tuple(v[chunk] for v in values) if isinstance(values, tuple) else values[chunk], toys, chunksize=chunksize)
+            pass
+        return replicas
+
+
+    def __len__ (self):
+        """ Number of variations. """
+        return self.sumw.shape[0]
+
+
+    def __getitem__ (self, key):
+        """ Return variation `key`, by index or name, as a `histogram`. """
+        idx = self.names.index(key) if isinstance(key, basestring) else key
+        shape = tuple(len(e) + 1 for e in self.edges)
+        return histogram(self.edges if len(self.edges) > 1 else self.edges[0], self.sumw[idx].reshape(shape).copy(), self.sumw2[idx].reshape(shape).copy())
+
+
+
+    # Public filling methods
+    # ----------------------------------------------------------------
+
+    def fill (self, values, weights, chunksize=100000):
+        """ Fill `values` (a tuple of arrays for 2D) for all variations, with weights of shape (number of entries, number of variations).
+
+        Entries are sorted by cell, and the weights of all variations summed
+        over each run of identical cells at once. Entries are processed in
+        chunks of `chunksize`, which bounds the memory used for temporary
+        copies of the weights.
+        """
+
+        # Check(s)
+        weights = np.asarray(weights, dtype=np.float64)
+        if weights.ndim == 1:
+            weights = weights[:, np.newaxis]
+            pass
+        assert weights.shape[1] == len(self), "Number of weight columns {} is different from number of variations {}".format(weights.shape[1], len(self))
+
+        cells = histogram(self.edges if len(self.edges) > 1 else self.edges[0]).cell_indices(values)
+        assert len(cells) == weights.shape[0], "Number of values {} is different from number of weights {}".format(len(cells), weights.shape[0])
+
+        for start in range(0, len(cells), chunksize):
+            c = cells  [start:start + chunksize]
+            w = weights[start:start + chunksize]
+
+            # Sum weights over runs of identical cells, for all variations together
+            order = np.argsort(c, kind='mergesort')
+            uniq, first = np.unique(c[order], return_index=True)
+            w = w[order]
+            self.sumw [:, uniq] += np.add.reduceat(w,     first, axis=0).T
+            self.sumw2[:, uniq] += np.add.reduceat(w * w, first, axis=0).T
+            pass
+        return self
+
+
+
+    # Public properties
+    # ----------------------------------------------------------------
+
+    @property
+    def values (self):
+        """ Bin contents of all variations, excluding under- and overflow bins, with shape (number of variations, number of bins[, ...]). """
+        shape = (len(self),) + tuple(len(e) + 1 for e in self.edges)
+        return self.sumw.reshape(shape)[(slice(None),) + tuple(slice(1, -1) for _ in self.edges)]
+
+
+
+    # Public conversion methods
+    # ----------------------------------------------------------------
+
+    def to_root (self, key, name=None):
+        """ Return variation `key`, by index or name, as a ROOT TH1F or TH2F. """
+        return self[key].to_root(name)
+
+    pass
+
+
+
+# Utility functions
+# --------------------------------------------------------------------
+
+def uncertainty_band (nominal, up, down=None, method='envelope', symmetric=False, stat=False, relative=False, bins=None):
+    """ Return the bin edges, central values, and lower and upper uncertainties of a band around `nominal`.
+
+    `nominal` is a ROOT TH1, a `histogram`, or an array of bin values with
+    bin edges `bins`. `up` and, optionally, `down` are the variations, each
+    given as a `variations` set, a (number of variations, number of bins)
+    array, or a list of any of the types accepted for `nominal`. Without
+    `down`, each variation is mirrored around the nominal.
+
+    For each pair of up/down variations, the largest upward and downward
+    shifts with respect to the nominal are combined over all pairs, either by
+    taking the maximum (`method='envelope'`) or the sum in quadrature
+    (`method='quadrature'`). With `stat=True`, the statistical uncertainty of
+    the nominal is added in quadrature, and with `symmetric=True` the larger
+    of the upper and lower uncertainties is used for both. With
+    `relative=True`, the band is returned relative to the nominal, i.e.
+    centred on one, e.g. for ratio pads.
+    """
+
+    # Check(s)
+    assert method in ['envelope', 'quadrature'], "Band method '{}' not recognised.".format(method)
+
+    nominal = _as_histogram(nominal, bins)
+    assert nominal.ndim == 1, "Uncertainty bands are only supported for 1D histograms."
+    values  = nominal.values
+    d_up    = _variation_values(up, nominal) - values
+    d_down  = -d_up if down is None else _variation_values(down, nominal) - values
+    assert d_up.shape == d_down.shape, "Numbers of up- and down variations are different."
+
+    # Largest upward and downward shifts of each pair of variations
+    upper = np.maximum(np.maximum(d_up, d_down), 0.)
+    lower = np.maximum(-np.minimum(d_up, d_down), 0.)
+
+    # Combine over all pairs
+    if method == 'envelope':
+        upper, lower = upper.max(axis=0), lower.max(axis=0)
+    else:
+        upper, lower = np.sqrt(np.square(upper).sum(axis=0)), np.sqrt(np.square(lower).sum(axis=0))
+        pass
+
+    if stat:
+        upper = np.sqrt(np.square(upper) + np.square(nominal.errors))
+        lower = np.sqrt(np.square(lower) + np.square(nominal.errors))
+        pass
+
+    if symmetric:
+        upper = lower = np.maximum(upper, lower)
+        pass
+
+    if relative:
+        scale  = np.where(values != 0, 1. / np.where(values != 0, np.abs(values), 1.), 0.)
+        values = np.ones_like(values)
+        upper, lower = upper * scale, lower * scale
+        pass
+
+    return nominal.edges[0], values.copy(), lower, upper
+
+
+def quantile_band (nominal, replicas, quantiles=QUANTILES, bins=None):
+    """ Return the bin edges, central values, and lower and upper uncertainties of a band around `nominal`,
+    given by the `quantiles` of the bin values of `replicas`, e.g. bootstrap replicas.
+
+    Inputs are as for `uncertainty_band`.
+    """
+    nominal = _as_histogram(nominal, bins)
+    assert nominal.ndim == 1, "Uncertainty bands are only supported for 1D histograms."
+    lower, upper = np.percentile(_variation_values(replicas, nominal), [100. * q for q in quantiles], axis=0)
+    values = nominal.values
+    return nominal.edges[0], values.copy(), np.maximum(values - lower, 0.), np.maximum(upper - values, 0.)
+
+
+def efficiency (passed, total, cl=0.682689492, method='clopper-pearson', bins=None):
+    """ Return the bin edges, efficiencies, and lower and upper uncertainties for histograms of `passed` and `total` entries.
+
+    Inputs are as for `nominal` in `uncertainty_band`, e.g. as returned by
+    `efficiency_histograms`. The confidence intervals are computed for all
+    bins at once, cf. `rootplotting.tools.efficiency_interval`. For weighted
+    entries, the intervals are computed for the effective number of entries,
+    (sum w)^2 / sum w^2, in each bin of `total`. Bins without entries have
+    efficiency NaN.
+    """
+    passed = _as_histogram(passed, bins)
+    total  = _as_histogram(total,  bins if bins is not None else passed.edges[0])
+    assert passed.ndim == 1 and np.allclose(passed.edges[0], total.edges[0]), "Passed and total must have the same 1D binning."
+
+    sumw, sumw2 = total.values, total.sumw2[total._inner()]
+    filled = sumw > 0
+    eff   = np.where(filled, passed.values / np.where(filled, sumw, 1.), np.nan)
+    n_eff = np.where(sumw2 > 0, np.square(sumw) / np.where(sumw2 > 0, sumw2, 1.), 0.)
+    lower, upper = efficiency_interval(np.nan_to_num(eff) * n_eff, n_eff, cl=cl, method=method)
+    return total.edges[0].copy(), eff, np.maximum(eff - lower, 0.), np.maximum(upper - eff, 0.)
+
+
+def efficiency_histograms (bins, values, passed, weights=None):
+    """ Return histograms of the passing and of all `values`, with optional `weights`.
+
+    The values are binned once, and both histograms filled from the same bin
+    indices, with `passed` a boolean mask of the same length as `values`.
+    """
+    total = histogram(bins)
+    cells = total.cell_indices(values)
+    w = np.ones(len(cells)) if weights is None else np.asarray(weights, dtype=np.float64)
+    wp = np.where(np.asarray(passed, dtype=bool), w, 0.)
+    size = total.sumw.size
+    total.sumw  += np.bincount(cells, weights=w,     minlength=size).reshape(total.sumw.shape)
+    total.sumw2 += np.bincount(cells, weights=w * w, minlength=size).reshape(total.sumw.shape)
+    result = histogram(bins)
+    result.sumw  += np.bincount(cells, weights=wp,      minlength=size).reshape(total.sumw.shape)
+    result.sumw2 += np.bincount(cells, weights=wp * wp, minlength=size).reshape(total.sumw.shape)
+    return result, total
+
+
+def profile (bins, x, y, weights=None, quantiles=None, chunksize=MAX_ELEMENTS):
+    """ Return the bin edges, and the weighted mean, standard deviation, and effective number of entries of `y` in each bin of `x`.
+
+    The moments are computed with weighted bincounts, in chunks of
+    `chunksize` entries to bound the memory used for temporary arrays. With
+    `quantiles`, e.g. (0.5,) for the median, the weighted quantiles of `y` in
+    each bin are returned as well, as an array of shape (number of quantiles,
+    number of bins), from a sort of all entries by bin and value and a
+    prefix sum of the sorted weights. Quantiles assume non-negative weights.
+    Empty bins have NaN mean and quantiles.
+
+    Returns (edges, mean, std, neff, quantiles), the last being None if no
+    `quantiles` are requested.
+    """
+    edges = np.asarray(bins, dtype=np.float64)
+    x, y  = np.asarray(x), np.asarray(y, dtype=np.float64)
+    w     = None if weights is None else np.asarray(weights, dtype=np.float64)
+    size  = len(edges) + 1
+
+    # Weighted moments
+    sumw, sumwy, sumwy2, sumw2 = [np.zeros(size) for _ in range(4)]
+    for start in range(0, len(x), chunksize):
+        chunk = slice(start, start + chunksize)
+        cells = bin_indices(x[chunk], edges)
+        wc = np.ones(len(cells)) if w is None else w[chunk]
+        yc = y[chunk]
+        sumw   += np.bincount(cells, weights=wc,           minlength=size)
+        sumw2  += np.bincount(cells, weights=wc * wc,      minlength=size)
+        sumwy  += np.bincount(cells, weights=wc * yc,      minlength=size)
+        sumwy2 += np.bincount(cells, weights=wc * yc * yc, minlength=size)
+        pass
+
+    filled = sumw != 0
+    safe   = np.where(filled, sumw, 1.)
+    mean = np.where(filled, sumwy / safe, np.nan)
+    std  = np.sqrt(np.clip(np.where(filled, sumwy2 / safe - np.square(sumwy / safe), 0.), 0., None))
+    neff = np.where(sumw2 > 0, np.square(sumw) / np.where(sumw2 > 0, sumw2, 1.), 0.)
+
+    # Weighted quantiles (opt.)
+    values = None
+    if quantiles is not None:
+        # Sort by value, then stably by bin; the latter is a radix sort for small integer types
+        order = np.argsort(y)
+        cells = bin_indices(x[order], edges).astype(np.min_scalar_type(size))
+        order = order[np.argsort(cells, kind='mergesort')]
+        ys = y[order]
+        cs = np.concatenate(([0.], np.cumsum(np.ones(len(ys)) if w is None else w[order])))
+
+        # Range of sorted entries in each bin, and the prefix sums at its ends
+        counts = np.bincount(cells, minlength=size)
+        last   = np.cumsum(counts)
+        first  = last - counts
+        total  = cs[last] - cs[first]
+        values = np.empty((len(quantiles), size))
+        for i, q in enumerate(quantiles):
+            pos = np.searchsorted(cs[1:], cs[first] + q * total, side='left')
+            pos = np.clip(pos, first, np.maximum(last - 1, first))
+            values[i] = np.where((counts > 0) & (total > 0), ys[np.clip(pos, 0, max(len(ys) - 1, 0))] if len(ys) else np.nan, np.nan)
+            pass
+        values = values[:, 1:-1]
+        pass
+
+    return edges.copy(), mean[1:-1], std[1:-1], neff[1:-1], values
+
+
+def _as_histogram (obj, bins=None):
+    """ Convert ROOT TH1, `histogram`, or array of bin values to a `histogram`. """
+    if isinstance(obj, histogram):
+        return obj
+    elif hasattr(obj, 'InheritsFrom'):
+        return histogram.from_root(obj)
+    assert bins is not None, "You need to specify 'bins' for array-type inputs."
+    return histogram.from_values(bins, np.asarray(obj, dtype=np.float64))
+
+
+def _variation_values (objs, nominal):
+    """ Return the in-range bin values of a set of variations of `nominal`, as a (number of variations, number of bins) array. """
+    if isinstance(objs, variations):
+        return objs.values
+    elif isinstance(objs, np.ndarray) and objs.ndim == 2:
+        return objs
+    return np.vstack([_as_histogram(obj, nominal.edges[0]).values for obj in objs])
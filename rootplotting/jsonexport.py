@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+
+""" JSON export of canvases, for rendering in the browser using JavaScript ROOT (JSROOT)."""
+
+# Basic import(s)
+import gzip
+import json
+import hashlib
+
+# Scientific import(s)
+import ROOT
+
+# Project import(s)
+from rootplotting.tools import *
+
+
+# Global definitions
+# TBufferJSON compact level: no whitespace (3), with runs of identical values,
+# and of zeros, in arrays stored only once (20). Both are decoded by JSROOT.
+COMPACT = 23
+
+# File name suffixes for which the canvas is exported as JSON
+EXTENSIONS = ['.json', '.json.gz']
+
+
+def is_json (path):
+    """ Whether `path` is a JSON export target. """
+    return any(path.endswith(ext) for ext in EXTENSIONS)
+
+
+def export (c, compact=COMPACT):
+    """ Return canvas `c`, with all its pads and primitives, as a JSON string readable by JSROOT. """
+    return str(ROOT.TBufferJSON.ConvertToJSON(c._bare(), compact))
+
+
+def update (c, digests, compact=COMPACT):
+    """ Return a JSON string with the histograms on canvas `c` whose contents changed.
+
+    `digests` maps (pad name, histogram name) to the digest of the histogram
+    contents when last exported, and is updated in place. The result is an
+    object of the form
+
+        {"update": true, "objects": [{"pad": ..., "name": ..., "object": ...}, ...]}
+
+    where each "object" is the histogram as exported by `export`, such that
+    the client can replace the histogram of that name on that pad and redraw.
+    Only histograms, also as part of stacks, are compared; other changes to
+    the canvas require a full export.
+    """
+    objects = list()
+    for key, hist in _histograms(c):
+        digest = _digest(hist)
+        if digests.get(key, None) == digest: continue
+        digests[key] = digest
+        objects.append('{{"pad":{},"name":{},"object":{}}}'.format(json.dumps(key[0]), json.dumps(key[1]),
+                                                                  str(ROOT.TBufferJSON.ConvertToJSON(hist, compact))))
+        pass
+    return '{{"update":true,"objects":[{}]}}'.format(','.join(objects))
+
+
+def digests (c):
+    """ Return the digests of all histograms on canvas `c`, keyed by (pad name, histogram name). """
+    return {key: _digest(hist) for key, hist in _histograms(c)}
+
+
+def write (string, path):
+    """ Write JSON `string` to `path`, gzipped if `path` ends in '.gz'. """
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'wb') as f:
+        f.write(string)
+        pass
+    return
+
+
+
+# Private helper function(s)
+# --------------------------------------------------------------------
+
+def _histograms (c):
+    """ Yield ((pad name, histogram name), histogram) for all histograms drawn on canvas `c`. """
+    for p in c._created_pads():
+        tpad = p._bare()
+        for obj in tpad.GetListOfPrimitives():
+            if obj.InheritsFrom('THStack'):
+                for hist in obj.GetHists():
+                    yield (tpad.GetName(), hist.GetName()), hist
+                    pass
+            elif obj.InheritsFrom('TH1'):
+                yield (tpad.GetName(), obj.GetName()), obj
+                pass
+            pass
+        pass
+    return
+
+
+def _digest (hist):
+    """ Return a digest of the contents and uncertainties of `hist`. """
+    sumw, sumw2 = hist_arrays(hist)
+    h = hashlib.sha1()
+    h.update(sumw.tobytes())
+    h.update(sumw2.tobytes())
+    h.update(str(hist.GetEntries()))
+    return h.hexdigest()
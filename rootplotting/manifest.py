@@ -0,0 +1,150 @@
+# -*- coding: utf-8 -*-
+
+""" Manifest of saved plots, used to skip regenerating plots whose inputs are unchanged."""
+
+# Basic import(s)
+import os
+import json
+import hashlib
+
+# Project import(s)
+from rootplotting.tools import *
+from rootplotting.spec import encode
+
+
+# Class definition
+class manifest (object):
+    """
+    Record of the fingerprint of each saved output file.
+
+    A fingerprint is a hash of the recorded plot specification, which covers
+    histogram contents, style arguments, text, axis settings, the canvas size,
+    and the package version, as well as of the output path. If an output file
+    still exists, unmodified since it was saved, and its fingerprint is
+    unchanged, rendering and saving it can be skipped.
+
+    Usage:
+        m = manifest('plots/manifest.json')
+        c = canvas(record=True)
+        ...
+        c.save('plots/myplot.pdf', manifest=m)
+        m.report()
+
+    The manifest is written by `report`, `write`, or on leaving a `with`
+    block, not on every saved plot.
+    """
+
+    def __init__ (self, path):
+        """ Constructor. Reads existing manifest at `path`, if any. """
+        super(manifest, self).__init__()
+
+        # Member variables
+        self._path    = path
+        self._entries = dict()
+        self._changed = False
+        self.rebuilt  = list()
+        self.skipped  = list()
+
+        if os.path.isfile(path):
+            try:
+                with open(path, 'r') as f:
+                    self._entries = json.load(f)
+                    pass
+            except ValueError:
+                warning("manifest: Could not read '{}'. Starting from an empty manifest.".format(path))
+                pass
+            pass
+        return
+
+
+    def __enter__ (self):
+        """ Enter context, writing the manifest on exit. """
+        return self
+
+
+    def __exit__ (self, *args):
+        """ Exit context, writing the manifest. """
+        self.write()
+        return False
+
+
+    def is_current (self, path, fingerprint):
+        """ Whether the output file at `path` exists and was saved from a plot with `fingerprint`. """
+        entry = self._entries.get(path, None)
+        if entry is None or entry['fingerprint'] != fingerprint:
+            return False
+        if not os.path.isfile(path):
+            return False
+        stat = os.stat(path)
+        return entry['size'] == stat.st_size and entry['mtime'] == stat.st_mtime
+
+
+    def add (self, path, fingerprint):
+        """ Register output file at `path` as saved from a plot with `fingerprint`. """
+        stat = os.stat(path)
+        self._entries[path] = {'fingerprint': fingerprint,
+                               'size':        stat.st_size,
+                               'mtime':       stat.st_mtime}
+        self.rebuilt.append(path)
+        self._changed = True
+        return
+
+
+    def skip (self, path):
+        """ Register output file at `path` as skipped. """
+        self.skipped.append(path)
+        return
+
+
+    def write (self):
+        """ Write the manifest to file, if changed, replacing any previous version atomically. """
+        if not self._changed:
+            return
+        tmp = self._path + '.tmp{}'.format(os.getpid())
+        with open(tmp, 'w') as f:
+            json.dump(self._entries, f, indent=1, sort_keys=True)
+            pass
+        os.rename(tmp, self._path)
+        self._changed = False
+        return
+
+
+    def report (self, verbose=False):
+        """ Write the manifest, and print and return the numbers of rebuilt and skipped plots. """
+        self.write()
+        total = len(self.rebuilt) + len(self.skipped)
+        print "Plots rebuilt: {} / {}, skipped: {} / {}".format(len(self.rebuilt), total, len(self.skipped), total)
+        if verbose:
+            for path in self.rebuilt:
+                print "  [rebuilt] {}".format(path)
+                pass
+            for path in self.skipped:
+                print "  [skipped] {}".format(path)
+                pass
+            pass
+        return {'rebuilt': list(self.rebuilt), 'skipped': list(self.skipped)}
+
+    pass
+
+
+def fingerprint (spec, path):
+    """ Return a hash of the plot specification `spec` as saved to `path`.
+
+    Arrays are hashed by their raw contents, rather than JSON-encoded. Plot
+    specifications only hold derived arrays, such as histogram contents and
+    drawn curves, cf. `rootplotting.spec.recorder`, such that the cost does
+    not scale with the number of entries plotted.
+    """
+    h = hashlib.sha1()
+    h.update(json.dumps(encode(spec, array=_digest), sort_keys=True, separators=(',', ':')))
+    h.update(path)
+    return h.hexdigest()
+
+
+def _digest (array):
+    """ Return a hash of the type, shape, and contents of a contiguous numpy `array`. """
+    h = hashlib.sha1()
+    h.update(array.dtype.str)
+    h.update(str(array.shape))
+    h.update(array.data)
+    return {'__sha1__': h.hexdigest()}
@@ -0,0 +1,1121 @@
+# -*- coding: utf-8 -*-
+
+""" Lightweight canvas and pad rendered through numpy and matplotlib, without ROOT graphics."""
+
+# Basic import(s)
+import re
+import sys
+
+# Scientific import(s)
+try:
+    import numpy as np
+    import matplotlib
+    from matplotlib.figure import Figure
+    from matplotlib.lines import Line2D
+    from matplotlib.patches import Patch
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+except:
+    print "ERROR: Scientific python packages were not set up properly."
+    print " $ pip install matplotlib"
+    print "or see e.g. [https://matplotlib.org/users/installing.html]."
+    raise
+
+# Project import(s)
+from rootplotting.tools import *
+from rootplotting.histogram import histogram, variations, uncertainty_band, quantile_band, efficiency, efficiency_histograms, profile, QUANTILES
+from rootplotting.spec import recorder, recorded
+from rootplotting import curves
+from rootplotting.canvas import canvas
+
+
+# Global definitions
+DPI = 100.
+
+# ROOT line- and marker styles, and their matplotlib equivalents
+LINESTYLES   = {1: '-', 2: '--', 3: ':', 4: '-.', 7: '--', 9: '--'}
+MARKERSTYLES = {1: '.', 2: '+', 3: '*', 5: 'x', 8: 'o', 20: 'o', 21: 's', 22: '^', 23: 'v', 24: 'o', 25: 's', 26: '^', 29: '*', 32: 'v', 33: 'D', 34: 'P'}
+OPENMARKERS  = [24, 25, 26, 32]
+
+# Style settings, cf. 'rootplotting.style', such that ROOT is not needed for rendering
+STYLE = {'PadLeftMargin': 0.15, 'PadRightMargin': 0.05, 'PadBottomMargin': 0.15, 'PadTopMargin': 0.06, 'TextFont': 43, 'TextSize': 20}
+
+# Right-hand margin for the first secondary axis, and spacing between stacked axes; cf. 'overlay'
+TWIN_MARGIN, TWIN_SPACING = 0.12, 0.10
+
+# ROOT colour indices, cf. 'TColor'
+kBlack, kRed, kGray = 1, 632, 920
+
+
+# Class definition
+class mpl_canvas (canvas):
+    """
+    Canvas rendered through matplotlib, using the Agg backend.
+
+    Provides the same interface as 'canvas', to which calls are deferred in
+    the same way, but all pads only store what is to be drawn, as numpy-backed
+    histograms and graphs; the matplotlib figure is built when saving. No ROOT
+    canvases, pads, or histograms are created. ROOT histograms and graphs are
+    accepted as inputs, and are converted to arrays.
+
+    Created through `canvas(..., backend='matplotlib')`.
+    """
+
+    def __init__ (self, num_pads=1, size=None, fraction=0.3, batch=False, ratio=True, lazy=False, record=False, backend='matplotlib'):
+        """ Constructor. Arguments `batch` and `lazy` have no effect. """
+
+        # Member variables
+        self._num_pads = num_pads
+        self._fraction = fraction if num_pads == 2 else 0.
+        self._size = size or ((600, int(521.79/float(1. - 0.3))) if (num_pads == 2 and ratio) else (600,500))
+        self._canvas = None
+        self._ratio = ratio and self._num_pads == 2
+        self._setup = False
+        self._existinglines = set()
+        self._right_margin = None
+        self._recorder = recorder(num_pads=num_pads, size=size, fraction=fraction, ratio=ratio, lazy=lazy) if record else None
+
+        # -- Pads
+        coords, _ = self._layout(fraction)
+        self._pads = [mpl_pad(self, c) for c in coords]
+        return
+
+
+    def __del__ (self):
+        """ Destructor. """
+        return
+
+
+
+    # Public high-level/management methods
+    # ----------------------------------------------------------------
+
+    def show (self):
+        """ ... """
+        warning("show: Not supported by the matplotlib backend. Use 'save' instead.")
+        return
+
+
+    def fill (self, hist, data, weights=None):
+        """ ... """
+        warning("fill: Live updates are not supported by the matplotlib backend.")
+        return None
+
+
+    def refresh (self, path=None, max_fps=10., force=False, **kwargs):
+        """ ... """
+        warning("refresh: Live updates are not supported by the matplotlib backend.")
+        return False
+
+
+    @recorded
+    def region (self, name, xmin, xmax, offset=0.10):
+        """ ... """
+
+        # Check(s)
+        if xmax <= self.xlim()[0] or xmin >= self.xlim()[1]: return
+
+        drawmin = xmin not in self._existinglines
+        drawmax = xmax not in self._existinglines
+
+        self._existinglines.add(xmin)
+        self._existinglines.add(xmax)
+
+        main = self._pads[0]
+        for p in self._pads:
+            if drawmin: p.xline(xmin, linewidth=2)
+            if drawmax: p.xline(xmax, linewidth=2)
+            pass
+
+        # Centre label on the region, in pad coordinates
+        xlim = main.xlim()
+        l, r = STYLE['PadLeftMargin'], STYLE['PadRightMargin']
+        xNDC = l + (0.5 * (xmin + xmax) - xlim[0]) / (xlim[1] - xlim[0]) * (1 - l - r)
+        main.latex(name, xNDC, offset, NDC=True)
+        return
+
+
+
+    # Private accessor methods
+    # ----------------------------------------------------------------
+
+    def _bare (self):
+        """ ... """
+        return self._canvas
+
+
+    def _get_pad (self, idx):
+        """ ... """
+        return self._pads[idx]
+
+
+    def _created_pads (self):
+        """ ... """
+        return list(self._pads)
+
+
+
+    # Private rendering methods
+    # ----------------------------------------------------------------
+
+    def _update (self):
+        """ Nothing to update; the figure is built when saving. """
+        return
+
+
+    def _save (self, path, dpi=DPI):
+        """ Build the matplotlib figure and write it to `path`. """
+
+        w, h = self._size
+        self._canvas = Figure(figsize=(w / DPI, h / DPI), dpi=dpi)
+        FigureCanvasAgg(self._canvas)
+
+        for idx, p in enumerate(self._pads):
+            margins = [STYLE['PadLeftMargin'],   STYLE['PadRightMargin'],
+                       STYLE['PadBottomMargin'], STYLE['PadTopMargin']]
+            if self._ratio:
+                # Main- and ratio pads share the x-axis
+                margins[2:] = [0.030, margins[3]] if idx == 0 else [0.30, 0.040]
+                pass
+            if p._children:
+                # Make room for secondary axes
+                margins[1] = max(margins[1], TWIN_MARGIN + TWIN_SPACING * (len(p._children) - 1))
+                pass
+            p._render(self._canvas, margins, xlabels=not (self._ratio and idx == 0))
+            pass
+
+        self._canvas.savefig(path, dpi=dpi)
+        return
+
+
+    def _save_json (self, path, incremental=False):
+        """ ... """
+        warning("save: JSON export requires the 'root' backend. Skipping '{}'.".format(path))
+        return
+
+
+    def _save_preview (self, path, scale):
+        """ Write the figure at reduced resolution. """
+        return self._save(path, dpi=DPI * scale)
+
+    pass
+
+
+
+# Class definition
+class mpl_pad (object):
+    """
+    Pad rendered through matplotlib; cf. 'pad' for the interface.
+
+    Plotting methods return the numpy-backed histogram (or, for graphs, the
+    tuple of arrays) that is drawn.
+    """
+
+    def __init__ (self, base, coords):
+        """ Constructor. """
+        super(mpl_pad, self).__init__()
+
+        # Check(s)
+        assert type(coords) in [list, tuple], "Pad coordinates must be of type list or tuple."
+        assert len(coords) == 4, "Number of coordinates provided {} is not equal to 4.".format(len(coords))
+
+        # Member variables
+        # -- Management
+        self._base = base
+        self._coords = coords
+        self._axes = None
+
+        # -- Book-keeping
+        self._items    = list() # (kind, data, option, style), drawn in order
+        self._stack    = list() # (histogram, style, label)
+        self._entries  = list() # (item, label, legend option)
+        self._legends  = list() # (entries, categories, options)
+        self._texts    = list() # (string, x, y, align, angle, NDC, style)
+        self._children = list()
+
+        # -- Plotting cosmetics
+        self._padding = 0.4
+        self._log  = False
+        self._logx = False
+        self._xlim = None
+        self._ylim = None
+        self._ymin = None # For log-plots
+        self._xlabel = None
+        self._ylabel = None
+        self._color  = None # Axis colour, for secondary axes; cf. 'significance'
+        return
+
+
+
+    # Public plotting methods
+    # ----------------------------------------------------------------
+
+    @recorded
+    def plot (self, data, **kwargs):
+        """ ... """
+        return self._plot('plot', data, **kwargs)
+
+
+    @recorded
+    def hist (self, data, **kwargs):
+        """ ... """
+        return self._plot('hist', data, **kwargs)
+
+
+    @recorded
+    def hist2d (self, data, **kwargs):
+        """ ... """
+        return self._plot('hist2d', data, **kwargs)
+
+
+    @recorded
+    def stack (self, data, **kwargs):
+        """ ... """
+        return self._plot('stack', data, **kwargs)
+
+
+    @recorded
+    def graph (self, data, **kwargs):
+        """ ... """
+        return self._plot('graph', data, **kwargs)
+
+
+    @recorded
+    def ratio_plot (self, data, offset=None, default=1, **kwargs):
+        """ ... """
+        num, den = [self._to_histogram(d, kwargs.get('bins', None), w) for d, w in zip(data, kwargs.pop('weights', None) or (None, None))]
+        kwargs.pop('bins', None)
+        h = num.divide(den, default=default)
+        if kwargs.get('errors', None) == 'poisson':
+            kwargs['poisson'] = (num.values, np.where(den.values != 0, 1. / np.where(den.values != 0, den.values, 1.), 0.))
+            pass
+        return self._plot_with_offset(h, offset, **kwargs)
+
+
+    @recorded
+    def diff_plot (self, data, offset=None, uncertainties=True, **kwargs):
+        """ ... """
+        first, second = [self._to_histogram(d, kwargs.get('bins', None), w) for d, w in zip(data, kwargs.pop('weights', None) or (None, None))]
+        kwargs.pop('bins', None)
+        h = first - second
+        if not uncertainties:
+            h.sumw2 = first.sumw2.copy()
+            pass
+        return self._plot_with_offset(h, offset, **kwargs)
+
+
+    def band (self, nominal, up, down=None, method='envelope', symmetric=False, stat=False, relative=False, bins=None, label=None, option='E2', **kwargs):
+        """ ... """
+        data = uncertainty_band(nominal, up, down, method=method, symmetric=symmetric, stat=stat, relative=relative, bins=bins)
+        kwargs.setdefault('fillcolor', kGray + 2)
+        self.graph(band_points(*data), label=label, option=option, **kwargs)
+        return data
+
+
+    def roc (self, sig, bkg, weights=(None, None), order=(None, None), rejection=False, resolution=None, **kwargs):
+        """ ... """
+        eff_bkg, eff_sig, auc = curves.roc(sig, bkg, weights=weights, order=order)
+        if rejection:
+            msk = eff_bkg > 0
+            x, y = eff_sig[msk], 1. / eff_bkg[msk]
+        else:
+            x, y = eff_bkg, eff_sig
+            pass
+        if 'label' in kwargs:
+            kwargs['label'] = kwargs['label'].format(auc=auc)
+            pass
+        return self._plot_curve(x, y, logy=rejection or self._log, resolution=resolution, **kwargs), auc
+
+
+    def cumulative (self, scores, weights=None, order=None, upper=True, normalise=True, resolution=None, **kwargs):
+        """ ... """
+        x, y = curves.cumulative(scores, weights=weights, order=order, upper=upper, normalise=normalise)
+        return self._plot_curve(x, y, logy=self._log, resolution=resolution, **kwargs)
+
+
+    def efficiency (self, data, passed=None, bins=None, weights=None, method='clopper-pearson', cl=0.682689492, label=None, option='PE0', **kwargs):
+        """ ... """
+        if isinstance(data, tuple):
+            num, den = data
+        else:
+            assert passed is not None and bins is not None, "You need to specify 'passed' and 'bins' when plotting a numpy-type input."
+            num, den = efficiency_histograms(bins, data, passed, weights)
+            pass
+        edges, eff, lower, upper = efficiency(num, den, cl=cl, method=method, bins=bins)
+
+        msk = np.isfinite(eff)
+        return self.graph(tuple(a[msk] for a in band_points(edges, eff, lower, upper)), label=label, option=option, **kwargs)
+
+
+    def profile (self, x, y, bins, weights=None, errors='mean', median=False, quantiles=None, label=None, option='PE0', **kwargs):
+        """ ... """
+        q = (list(quantiles) if quantiles is not None else []) + ([0.5] if median else [])
+        edges, mean, std, neff, values = profile(bins, x, y, weights=weights, quantiles=q or None)
+        y = values[-1] if median else mean
+        if quantiles is not None:
+            lower, upper = np.maximum(y - values[0], 0.), np.maximum(values[1] - y, 0.)
+        else:
+            lower = upper = std if errors == 'rms' else std / np.sqrt(np.where(neff > 0, neff, 1.))
+            pass
+
+        msk = np.isfinite(y)
+        return self.graph(tuple(a[msk] for a in band_points(edges, y, lower, upper)), label=label, option=option, **kwargs)
+
+
+    @recorded
+    def significance (self, sig, bkg, bins=None, weights=(None, None), cut='lower', method='asimov', color=kRed, ylabel='Significance', **kwargs):
+        """ Draw the expected significance of a cut at each bin edge on a secondary y-axis, with colour `color` and title `ylabel`; cf. 'pad'.
+
+        The secondary axis shares the x-axis of this pad, and is drawn at its
+        right-hand side. Returns the drawn graph.
+        """
+        twin = mpl_pad(self._base, self._coords)
+        twin._color  = color
+        twin._ylabel = ylabel
+        self._children.append(twin)
+
+        edges, z = curves.significance(sig, bkg, bins=bins, weights=weights, cut=cut, method=method)
+        kwargs.setdefault('linecolor', color)
+        return twin._plot_curve(edges, z, logy=twin._log, **kwargs)
+
+
+
+    # Public accessor/mutator methods
+    # ----------------------------------------------------------------
+
+    def getStackSum (self):
+        """ ... """
+        if len(self._stack) == 0: return None
+        total = self._stack[0][0].copy()
+        for h, _, _ in self._stack[1:]:
+            total += h
+            pass
+        return total
+
+
+    @recorded
+    def log (self, log=True):
+        """ ... """
+        assert type(log) == bool, "Log parameter must be a boolean"
+        self._log = log
+        return
+
+
+    @recorded
+    def logx (self, logx=True):
+        """ ... """
+        assert type(logx) == bool, "Logx parameter must be a boolean"
+        self._logx = logx
+        return
+
+
+    @recorded
+    def logy (self, **kwargs):
+        """ Alias method for 'log'. """
+        return self.log(**kwargs)
+
+
+    @recorded
+    def xlim (self, *args):
+        """ ... """
+
+        # Check(s)
+        if len(args) == 0: # Accessor
+            return self._xlim or self._data_xlim()
+
+        assert len(args) == 2, "X-axis limits have size {}, which is different from two as required.".format(len(args))
+        self._xlim = args
+        return
+
+
+    @recorded
+    def ylim (self, *args):
+        """ ... """
+
+        # Check(s)
+        if len(args) == 0: # Accessor
+            return self._ylim or self._axisrange()
+
+        assert len(args) == 2, "Y-axis limits have size {}, which is different from two as required.".format(len(args))
+        self._ylim = args
+        return
+
+
+    @recorded
+    def ymin (self, ymin):
+        """ ... """
+        self._ymin = ymin
+        return
+
+
+    @recorded
+    def padding (self, padding):
+        """ ... """
+
+        # Check(s)
+        assert padding > 0, "Padding must be greater than zero; %.2f requested." % padding
+        assert padding < 1, "Padding must be smaller than one; %.2f requested." % padding
+
+        self._padding = padding
+        return
+
+
+    @recorded
+    def line (self, x1, y1, x2, y2, **kwargs):
+        """ ... """
+        self._items.append(('line', ((x1, x2), (y1, y2)), '', kwargs))
+        return
+
+
+    @recorded
+    def lines (self, coords, **kwargs):
+        """ ... """
+        for coord in coords:
+            self.line(*coord, **kwargs)
+            pass
+        return
+
+
+    @recorded
+    def ylines (self, ys, **kwargs):
+        """ ... """
+        for y in ys:
+            self.yline(y, **kwargs)
+            pass
+        return
+
+
+    @recorded
+    def xlines (self, xs, **kwargs):
+        """ ... """
+        for x in xs:
+            self.xline(x, **kwargs)
+            pass
+        return
+
+
+    @recorded
+    def yline (self, y, **kwargs):
+        """ ... """
+        self._items.append(('yline', y, '', kwargs))
+        return
+
+
+    @recorded
+    def xline (self, x, ymin=None, ymax=None, snap=False, text=None, text_align='TL', **kwargs):
+        """ ... """
+        self._items.append(('xline', (x, ymin, ymax), '', kwargs))
+        if text is not None:
+            self._texts.append((text, x, ymax, 13 if text_align.endswith('L') else 33, 90, False, kwargs))
+            pass
+        return x
+
+
+    @recorded
+    def xlabel (self, title):
+        """ ... """
+        self._xlabel = title
+        return
+
+
+    @recorded
+    def ylabel (self, title):
+        """ ... """
+        self._ylabel = title
+        return
+
+
+    @recorded
+    def text (self, lines=[], qualifier='', ATLAS=True, xmin=None, ymax=None, **kwargs):
+        """ ... """
+
+        # Compute drawing coordinates, in the same way as for ROOT pads
+        h = (self._coords[3] - self._coords[1]) * self._base._size[1]
+        size  = self._text_pixels(STYLE['TextSize']) / float(h)
+        ystep = size * 1.30
+
+        offset = 0.05
+        x = xmin if (xmin is not None) else       STYLE['PadLeftMargin'] + offset
+        y = ymax if (ymax is not None) else 1.0 - STYLE['PadTopMargin']  - offset - size
+
+        kwargs['align'] = kwargs.get('align', 11)
+
+        # Draw ATLAS line
+        if ATLAS or qualifier:
+            line = "{ATLAS}{qualifier}".format(ATLAS="#font[72]{ATLAS}  " if ATLAS else "", qualifier=qualifier)
+            self.latex(line, x, y, NDC=True, **kwargs)
+            y -= ystep * 1.30
+            pass
+
+        # Draw lines
+        for line in lines:
+            self.latex(line, x, y, NDC=True, **kwargs)
+            y -= ystep
+            pass
+        return
+
+
+    @recorded
+    def latex (self, string, x, y, align=21, angle=0, NDC=False, **kwargs):
+        """ ... """
+        self._texts.append((string, x, y, align, angle, NDC, kwargs))
+        return
+
+
+    @recorded
+    def legend (self, header=None, categories=None,
+                xmin=None,
+                xmax=None,
+                ymin=None,
+                ymax=None,
+                width=0.32,
+                horisontal='R',
+                vertical='T',
+                reverse=False,
+                sort=False,
+                columns=1,
+                margin=None):
+        """ Draw legend on pad. """
+
+        # Check(s)
+        if len(self._legends) > 0:
+            warning('A legend has already been constructed.')
+            pass
+
+        entries = list(self._entries) + [entry for child in self._children for entry in child._entries]
+        if sort:
+            # Items are (kind, data, option, style); stack components are (histogram, style, label)
+            data = lambda entry: entry[0][0] if len(entry[0]) == 3 else entry[0][1]
+            entries = sorted(entries, key=lambda entry: data(entry).integral() if is_histogram(data(entry)) else 0., reverse=True)
+            pass
+        if reverse:
+            entries = list(reversed(entries))
+            pass
+
+        loc = {'TR': 'upper right', 'TL': 'upper left', 'BR': 'lower right', 'BL': 'lower left'}.get(vertical + horisontal, 'best')
+        self._legends.append((entries, categories or list(), dict(title=header, loc=loc, ncol=columns)))
+
+        # Clear entries (allowing for multiple legends)
+        self._entries = list()
+        for child in self._children:
+            child._entries = list()
+            pass
+        return
+
+
+
+    # Private plotting methods
+    # ----------------------------------------------------------------
+
+    def _plot (self, kind, data, display=True, bins=None, weights=None, option=None, normalise=False, scale=None, label=None,
+               bootstrap=None, seed=None, quantiles=QUANTILES, bootstrap_label=None, **kwargs):
+        """ Store `data` to be drawn as `kind`, optionally with a bootstrap band; cf. 'pad'. """
+
+        # Get plot option
+        if option is None:
+            option = {'plot': 'PE0', 'hist': 'HIST', 'stack': 'HIST', 'graph': 'PE0', 'hist2d': 'COLZ'}[kind]
+            pass
+
+        # Points with asymmetric errors, drawn as a band
+        if isinstance(data, tuple) and len(data) == 6 and ('E2' in option.upper() or 'E3' in option.upper()):
+            x, y, exl, exh, eyl, eyh = map(np.asarray, data)
+            if not display: return data
+            return self._plot_band((np.append(x - exl, x[-1:] + exh[-1:]), y, eyl, eyh), label=label, option=option, **kwargs)
+
+        h = self._to_histogram(data, bins, weights)
+        replicas = None
+        if bootstrap and display and kind != 'stack' and bins is not None and len(data) not in [len(bins), len(bins) - 1]:
+            replicas = variations.bootstrap(bins, data, weights, ntoys=bootstrap, seed=seed).values
+            pass
+        if is_histogram(h):
+            if normalise:
+                h.normalise()
+                if replicas is not None:
+                    sums = replicas.sum(axis=1)[:, np.newaxis]
+                    replicas = replicas / np.where(sums != 0, sums, 1.)
+                    pass
+                pass
+            if scale is not None:
+                h.scale(scale)
+                if replicas is not None:
+                    replicas = replicas * scale
+                    pass
+                pass
+            pass
+
+        # Only plot if requested
+        if not display: return h
+
+        if kind == 'stack':
+            if len(self._stack) == 0:
+                self._items.append(('stack', None, option, {}))
+                pass
+            component = (h, kwargs, label)
+            self._stack.append(component)
+            if label is not None:
+                self._entries.append((component, label, 'F'))
+                pass
+            return h
+
+        item = ('graph' if isinstance(h, tuple) else kind, h, option, kwargs)
+        self._items.append(item)
+
+        # Store legend entry
+        if label is not None:
+            opt = kwargs.get('legend_option', self._get_label_option(option, kwargs))
+            if 'data' in label.strip().lower():
+                self._entries.insert(0, (item, label, opt))
+            else:
+                self._entries.append((item, label, opt))
+                pass
+            pass
+
+        # Bootstrap band (opt.)
+        if replicas is not None:
+            self._plot_band(quantile_band(h, replicas, quantiles), label=bootstrap_label)
+            pass
+        return h
+
+
+    def _plot_band (self, data, label=None, option='E2', **kwargs):
+        """ Store band `data`, i.e. (edges, central values, lower and upper uncertainties), to be drawn. """
+        kwargs.setdefault('fillcolor', kGray + 2)
+        item = ('band', data, option, kwargs)
+        self._items.append(item)
+        if label is not None:
+            self._entries.append((item, label, 'F'))
+            pass
+        return data
+
+
+    def _plot_curve (self, x, y, logy=False, resolution=None, option='L', **kwargs):
+        """ Store curve (`x`, `y`) to be drawn as a line, keeping only points which are at least one pixel apart. """
+        if resolution is None:
+            resolution = (int((self._coords[2] - self._coords[0]) * self._base._size[0]),
+                          int((self._coords[3] - self._coords[1]) * self._base._size[1]))
+            pass
+        if logy:
+            msk = y > 0
+            x, y = x[msk], y[msk]
+            pass
+        if len(x) > 2:
+            t = np.log10(y) if logy else y
+            keep = curves.downsample(x, t, resolution[0], resolution[1], xrange=(x.min(), x.max()), yrange=(t.min(), t.max()))
+            x, y = x[keep], y[keep]
+            pass
+        return self.graph(y, bins=x, option=option, **kwargs)
+
+
+    def _plot_with_offset (self, h, offset=None, **kwargs):
+        """ Plot derived histogram `h`, optionally shifted by `offset`. """
+        if offset is not None:
+            h.sumw += offset
+            pass
+        return self._plot('plot', h, **kwargs)
+
+
+    def _to_histogram (self, data, bins=None, weights=None):
+        """ Convert input `data` to a histogram, or a tuple of graph arrays. """
+
+        if is_histogram(data):
+            return data.copy()
+
+        elif type(data).__module__.startswith(np.__name__) or type(data) == list:
+            # Numpy-/list-type
+            assert bins is not None, "You need to specify 'bins' when plotting a numpy-type input."
+            if len(data) == len(bins):
+                # Assuming 'data' and 'bins' are sets of (x,y)-points
+                return (np.asarray(bins, dtype=np.float64), np.asarray(data, dtype=np.float64), None)
+            elif len(data) == len(bins) - 1:
+                # Assuming 'data' are bin values
+                return histogram.from_values(bins, data)
+            return histogram(bins).fill(data, weights=weights)
+
+        elif isinstance(data, tuple) and len(data) == 6:
+            # Points with asymmetric errors, (x, y, exl, exh, eyl, eyh)
+            x, y, _, _, eyl, eyh = [np.asarray(a, dtype=np.float64) for a in data]
+            return (x, y, np.vstack((eyl, eyh)))
+
+        elif hasattr(data, 'InheritsFrom') and data.InheritsFrom('TGraph'):
+            N = data.GetN()
+            x = np.frombuffer(data.GetX(), dtype=np.float64, count=N).copy()
+            y = np.frombuffer(data.GetY(), dtype=np.float64, count=N).copy()
+            ey = None
+            if data.InheritsFrom('TGraphAsymmErrors'):
+                ey = np.vstack((np.frombuffer(data.GetEYlow(),  dtype=np.float64, count=N),
+                                np.frombuffer(data.GetEYhigh(), dtype=np.float64, count=N)))
+            elif data.InheritsFrom('TGraphErrors'):
+                ey = np.frombuffer(data.GetEY(), dtype=np.float64, count=N).copy()
+                pass
+            return (x, y, ey)
+
+        elif hasattr(data, 'InheritsFrom') and data.InheritsFrom('TH1'):
+            return histogram.from_root(data)
+
+        warning("_to_histogram: Input data type not recognised: {}".format(type(data)))
+        return None
+
+
+    def _get_label_option (self, plot_option, style):
+        """ ... """
+        plot_option = plot_option.split()[0].upper()
+        if 'HIST' in plot_option:
+            return 'F' if style.get('fillcolor', 0) else 'L'
+        elif 'E2' in plot_option or 'E3' in plot_option:
+            return 'F'
+        elif 'L' in plot_option and 'P' not in plot_option:
+            return 'L'
+        return 'PEL'
+
+
+
+    # Private range-finding methods
+    # ----------------------------------------------------------------
+
+    def _range_objects (self):
+        """ Return all drawn histograms and graphs, incl. the summed stack and the upper edges of bands. """
+        objects = [data for kind, data, _, _ in self._items if kind in ['plot', 'hist', 'graph']]
+        objects += [(0.5 * (edges[1:] + edges[:-1]), y + upper, None) for kind, (edges, y, _, upper), _, _ in filter(lambda item: item[0] == 'band', self._items)]
+        if self._stack:
+            objects.append(self.getStackSum())
+            pass
+        return objects
+
+
+    def _data_xlim (self):
+        """ Return the x-axis range spanned by the drawn objects. """
+        objects = self._range_objects() + [data for kind, data, _, _ in self._items if kind == 'hist2d'] \
+                + [histogram(data[0]) for kind, data, _, _ in self._items if kind == 'band']
+        if len(objects) == 0: return (0., 1.)
+        xmin = min(o.edges[0][0]  if is_histogram(o) else o[0].min() for o in objects)
+        xmax = max(o.edges[0][-1] if is_histogram(o) else o[0].max() for o in objects)
+        return (xmin, xmax)
+
+
+    def _axisrange (self):
+        """ Return the y-axis range, including padding, as for ROOT pads. """
+
+        objects = self._range_objects()
+        if len(objects) == 0: return (0., 1.)
+
+        ymax = max(o.maximum() if is_histogram(o) else o[1].max() for o in objects)
+        if self._log:
+            if self._ymin:
+                ymin = self._ymin
+            else:
+                positive = [o.minimum_positive() if is_histogram(o) else (o[1][o[1] > 0].min() if np.any(o[1] > 0) else None) for o in objects]
+                positive = filter(lambda y: y is not None, positive)
+                ymin = (min(positive) if positive else 1.) * 0.8
+                pass
+            return (ymin, np.exp((np.log(ymax) - np.log(ymin)) / (1. - self._padding) + np.log(ymin)))
+        return (0, ymax / (1. - self._padding))
+
+
+
+    # Private rendering methods
+    # ----------------------------------------------------------------
+
+    def _render (self, figure, margins, xlabels=True, axes=None):
+        """ Draw all stored items on new axes in `figure`, with pad margins (left, right, bottom, top).
+
+        Secondary axes are drawn on `axes`, sharing the x-axis of their base
+        pad. Returns the artist drawn for each item, by item id.
+        """
+
+        x1, y1, x2, y2 = self._coords
+        l, r, b, t = margins
+        w, h = x2 - x1, y2 - y1
+        ax = axes or figure.add_axes((x1 + l * w, y1 + b * h, (1 - l - r) * w, (1 - b - t) * h))
+        self._axes = ax
+
+        # Text sizes in points; one pixel is 72/DPI points
+        fontsize = self._text_pixels(STYLE['TextSize']) * 72. / DPI
+        artists = dict()
+        for item in self._items:
+            if item[0] == 'stack':
+                artists.update(self._render_stack(ax))
+            else:
+                artists[id(item)] = self._render_item(ax, item)
+                if item[3].get('rasterize', False) and hasattr(artists[id(item)], 'set_rasterized'):
+                    artists[id(item)].set_rasterized(True)
+                    pass
+                pass
+            pass
+
+        # Axes
+        if axes is None:
+            ax.set_xscale('log' if self._logx else 'linear')
+            ax.set_xlim(*self.xlim())
+            pass
+        ax.set_yscale('log' if self._log  else 'linear')
+        if any(kind != 'hist2d' for kind, _, _, _ in self._items):
+            ax.set_ylim(*self.ylim())
+            pass
+        ax.tick_params(which='both', direction='in', top=True, right=not self._children, labelsize=fontsize * 0.9)
+        if axes is not None:
+            colour = mpl_colour(self._color)
+            ax.tick_params(axis='y', which='both', left=False, right=True, colors=colour)
+            ax.spines['right'].set_color(colour)
+            ax.yaxis.label.set_color(colour)
+            pass
+        if not xlabels:
+            ax.tick_params(labelbottom=False)
+            pass
+        if self._xlabel and xlabels:
+            ax.set_xlabel(mpl_text(self._xlabel), ha='right', x=1.0, fontsize=fontsize)
+            pass
+        if self._ylabel:
+            ax.set_ylabel(mpl_text(self._ylabel), ha='right', y=1.0, fontsize=fontsize)
+            pass
+
+        # Text
+        for string, x, y, align, angle, NDC, style in self._texts:
+            ha = {1: 'left', 2: 'center', 3: 'right'}[align // 10]
+            va = {1: 'bottom', 2: 'center', 3: 'top'}[align % 10]
+            kwargs = dict(ha=ha, va=va, rotation=angle, fontsize=fontsize * style.get('textsize', STYLE['TextSize']) / STYLE['TextSize'],
+                          color=mpl_colour(style.get('textcolor', kBlack)))
+            if '#font[72]' in string:
+                kwargs.update(weight='bold', style='italic')
+                pass
+            if NDC:
+                figure.text(x1 + x * w, y1 + y * h, mpl_text(string), **kwargs)
+            else:
+                ax.text(x, y if y is not None else ax.get_ylim()[1], mpl_text(string), **kwargs)
+                pass
+            pass
+
+        # Secondary axes, stacked on the right-hand side as for overlays
+        for idx, child in enumerate(self._children):
+            twin = ax.twinx()
+            twin.spines['right'].set_position(('axes', 1. + idx * TWIN_SPACING / (1 - l - r)))
+            artists.update(child._render(figure, margins, xlabels=False, axes=twin))
+            pass
+
+        # Legends
+        for entries, categories, options in self._legends:
+            handles, labels = list(), list()
+            for item, label, opt in entries:
+                handles.append(artists[id(item)])
+                labels.append(mpl_text(label))
+                pass
+            for name, style in categories:
+                handles.append(Line2D([], [], color=mpl_colour(style.get('linecolor', kGray + 3)),
+                                      linestyle=LINESTYLES.get(style.get('linestyle', 1), '-'),
+                                      marker=MARKERSTYLES.get(style.get('markerstyle', None), None)))
+                labels.append(mpl_text(name))
+                pass
+            ax.legend(handles, labels, frameon=False, fontsize=fontsize * 0.9, **options)
+            pass
+        return artists
+
+
+    def _text_pixels (self, size):
+        """ Return text `size` in pixels.
+
+        For fonts of precision 3, as used by the style, ROOT text sizes are
+        given in pixels; otherwise, they are relative to the smaller dimension
+        of the pad, here taken as the main pad such that all pads match.
+        """
+        if STYLE['TextFont'] % 10 == 3:
+            return size
+        c = self._base._pads[0]._coords
+        return size * min((c[2] - c[0]) * self._base._size[0], (c[3] - c[1]) * self._base._size[1])
+
+
+    def _render_item (self, ax, item):
+        """ Draw a single stored item on `ax`, returning the artist used for its legend entry. """
+
+        kind, data, option, style = item
+        option = option.upper()
+
+        if kind == 'hist2d':
+            mesh = ax.pcolormesh(data.edges[0], data.edges[1], data.values.T)
+            if 'Z' in option:
+                ax.figure.colorbar(mesh, ax=ax)
+                pass
+            return mesh
+
+        elif kind == 'line':
+            return ax.plot(data[0], data[1], **mpl_line(style))[0]
+
+        elif kind == 'xline':
+            x, ymin, ymax = data
+            if ymin is None and ymax is None:
+                return ax.axvline(x, **mpl_line(style))
+            ylim = self.ylim()
+            return ax.plot((x, x), (ylim[0] if ymin is None else ymin, ylim[1] if ymax is None else ymax), **mpl_line(style))[0]
+
+        elif kind == 'yline':
+            return ax.axhline(data, **mpl_line(style))
+
+        elif kind == 'band':
+            edges, y, lower, upper = data
+            return ax.fill_between(edges, np.append(y - lower, (y - lower)[-1]), np.append(y + upper, (y + upper)[-1]), step='post', linewidth=0,
+                                   color=mpl_colour(style.get('fillcolor'), style.get('alpha', 0.5)))
+
+        elif kind == 'graph':
+            x, y, ey = data if isinstance(data, tuple) else (data.centres, data.values, data.errors)
+            if 'P' in option:
+                return ax.errorbar(x, y, yerr=ey, **mpl_marker(style))
+            return ax.plot(x, y, **mpl_line(style))[0]
+
+        # Histograms
+        edges = data.edges[0]
+        if 'HIST' in option:
+            artist = self._render_hist(ax, edges, data.values, style, fill=bool(style.get('fillcolor', 0)))
+            if 'P' in option:
+                ax.plot(data.centres, data.values, linestyle='none', **mpl_marker(style))
+                pass
+            return artist
+        elif 'E2' in option or 'E3' in option:
+            lower, upper = data.values - data.errors, data.values + data.errors
+            return ax.fill_between(edges, np.append(lower, lower[-1]), np.append(upper, upper[-1]), step='post', linewidth=0,
+                                   color=mpl_colour(style.get('fillcolor', kGray), style.get('alpha', None)))
+        xerr = None if 'X0' in option else 0.5 * data.widths
+        yerr = data.errors
+        if style.get('errors', None) == 'poisson':
+            counts, factor = style.get('poisson', (data.values, 1.))
+            lower, upper = poisson_interval(counts)
+            yerr = np.vstack(((counts - lower) * factor, (upper - counts) * factor))
+            pass
+        return ax.errorbar(data.centres, data.values, xerr=xerr, yerr=yerr, **mpl_marker(style))
+
+
+    def _render_stack (self, ax):
+        """ Draw the stack from a single prefix sum over its components, back-to-front.
+
+        Returns the artist drawn for each component, by component id.
+        """
+        artists = dict()
+        edges  = self._stack[0][0].edges[0]
+        cumsum = np.cumsum(np.vstack([h.values for h, _, _ in self._stack]), axis=0)
+        for icomp in reversed(range(len(self._stack))):
+            component = self._stack[icomp]
+            artists[id(component)] = self._render_hist(ax, edges, cumsum[icomp], component[1], fill=True)
+            pass
+        return artists
+
+
+    def _render_hist (self, ax, edges, values, style, fill=False):
+        """ Draw step histogram, optionally filled down to zero. """
+        y = np.append(values, values[-1])
+        if fill:
+            ax.fill_between(edges, y, 0, step='post', linewidth=0,
+                            color=mpl_colour(style.get('fillcolor', kGray), style.get('alpha', None)))
+            return Patch(facecolor=mpl_colour(style.get('fillcolor', kGray), style.get('alpha', None)),
+                         edgecolor=mpl_colour(style.get('linecolor', kBlack)))
+        return ax.step(edges, y, where='post', **mpl_line(style))[0]
+
+    pass
+
+
+
+# Utility functions
+# --------------------------------------------------------------------
+
+def mpl_colour (colour, alpha=None):
+    """ Convert ROOT colour index to an RGBA tuple; other colour specifications are returned as-is.
+
+    Colours are looked up in `COLOURS`. Other indices, e.g. user-defined
+    colours and the mixed colours of the colour wheel, are taken from ROOT if
+    it has been loaded, and are otherwise approximated; cf. `_approximate`.
+    ROOT is never imported for this purpose.
+    """
+    if not isinstance(colour, (int, long)):
+        return colour
+    rgb = COLOURS.get(colour, None)
+    if rgb is None:
+        root = sys.modules.get('ROOT', None)
+        c = root.gROOT.GetColor(colour) if root is not None else None
+        if c:
+            return (c.GetRed(), c.GetGreen(), c.GetBlue(), c.GetAlpha() if alpha is None else alpha)
+        rgb = _approximate(colour)
+        pass
+    return rgb + (1. if alpha is None else alpha,)
+
+
+def mpl_line (style):
+    """ Convert ROOT line style arguments to matplotlib keyword arguments. """
+    return dict(color=mpl_colour(style.get('linecolor', kBlack), style.get('alpha', None)),
+                linestyle=LINESTYLES.get(style.get('linestyle', 1), '-'),
+                linewidth=style.get('linewidth', 2) * 72. / DPI)
+
+
+def mpl_marker (style):
+    """ Convert ROOT marker style arguments to matplotlib keyword arguments. """
+    markerstyle = style.get('markerstyle', 20)
+    colour = mpl_colour(style.get('markercolor', style.get('linecolor', kBlack)), style.get('alpha', None))
+    return dict(marker=MARKERSTYLES.get(markerstyle, 'o'),
+                markersize=style.get('markersize', 1.) * 6.,
+                color=colour,
+                markerfacecolor='none' if markerstyle in OPENMARKERS else colour,
+                linestyle='none')
+
+
+def band_points (edges, y, lower, upper):
+    """ Return the band with bin `edges`, central values `y`, and `lower` and `upper` uncertainties as points with asymmetric errors, (x, y, exl, exh, eyl, eyh). """
+    ex = 0.5 * np.diff(edges)
+    return (0.5 * (edges[1:] + edges[:-1]), y, ex, ex, lower, upper)
+
+
+def mpl_text (string):
+    """ Convert ROOT TLatex markup to matplotlib mathtext, as far as possible. """
+    string = re.sub(r'#font\[\d+\]\{([^{}]*)\}', r'\1', string)
+    string = re.sub(r'#scale\[[\d.]+\]\{([^{}]*)\}', r'\1', string)
+    string = re.sub(r'#(\w+)(\{[^{}]*\})?', lambda m: '$\\' + m.group(1) + (m.group(2) or '') + '$', string)
+    string = re.sub(r'([\^_]\{[^{}]*\})', r'$\1$', string)
+    return string.replace('$$', '')
+
+
+
+# Private helper function(s)
+# --------------------------------------------------------------------
+
+def _colour_wheel ():
+    """ Return the RGB values of the standard ROOT colours which are defined by rule, cf. `TColor::CreateColorWheel`.
+
+    These are the basic colours 0-9, the greys, and the colours on the circle
+    of the wheel, i.e. `kRed`, `kGreen`, `kBlue`, `kYellow`, `kMagenta`, and
+    `kCyan` with offsets -10 to +4.
+    """
+    colours = {0: (1., 1., 1.), 1: (0., 0., 0.), 2: (1., 0., 0.), 3: (0., 1., 0.), 4: (0., 0., 1.),
+               5: (1., 1., 0.), 6: (1., 0., 1.), 7: (0., 1., 1.), 8: (0.35, 0.83, 0.33), 9: (0.35, 0.33, 0.85)}
+    for offset in range(4):
+        colours[kGray + offset] = (0.8 - 0.2 * offset,) * 3
+        pass
+
+    # Lighter colours mix in the other channels; darker colours reduce the base channels
+    idx = 0
+    for row in range(5):
+        for col in range(row + 1):
+            on, off = (255 - 51 * col) / 255., (204 - 51 * row) / 255.
+            for base, channels in _CIRCLE.items():
+                colours[base - 10 + idx] = tuple(on if channel else off for channel in channels)
+                pass
+            idx += 1
+            pass
+        pass
+    return colours
+
+
+def _approximate (colour):
+    """ Return approximate RGB values of ROOT colour index `colour`, or black if it is not a standard colour.
+
+    Used for the colours on the rectangles of the colour wheel, i.e. `kOrange`,
+    `kSpring`, `kTeal`, `kAzure`, `kViolet`, and `kPink` with offsets -9 to +10,
+    when ROOT is not loaded: positive offsets darken, and negative offsets
+    lighten, the base colour in equal steps.
+    """
+    for base, rgb in _RECTANGLE.items():
+        offset = colour - base
+        if -9 <= offset <= 10:
+            if offset >= 0:
+                return tuple(c * (1. - offset / 12.) for c in rgb)
+            return tuple(c + (1. - c) * (-offset / 10.) for c in rgb)
+        pass
+    return (0., 0., 0.)
+
+
+# Base colours of the colour wheel, cf. 'TColor'
+_CIRCLE    = {400: (1, 1, 0), 416: (0, 1, 0), 432: (0, 1, 1), 600: (0, 0, 1), 616: (1, 0, 1), 632: (1, 0, 0)}
+_RECTANGLE = {800: (1., 0.8, 0.), 820: (0.8, 1., 0.), 840: (0., 1., 0.8), 860: (0., 0.8, 1.), 880: (0.8, 0., 1.), 900: (1., 0., 0.8)}
+COLOURS = _colour_wheel()
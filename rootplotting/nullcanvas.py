@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+
+""" Canvas which renders nothing, but logs all drawing, styling, and layout operations."""
+
+# Basic import(s)
+import collections
+
+# Scientific import(s)
+import ROOT
+
+# Project import(s)
+from rootplotting.tools import *
+from rootplotting.canvas import canvas
+from rootplotting.pad import pad
+
+
+# Class definition
+class null_canvas (canvas):
+    """
+    Canvas on which nothing is painted or written to file.
+
+    All calls are processed as for 'canvas', but the underlying ROOT canvas
+    and pads, incl. those of overlays, are wrapped in proxies which log,
+    instead of carrying out, all `Modified`, `Update`, `Paint`, `Draw`, and
+    `SaveAs` calls, and which log all objects drawn on them, with their draw
+    options, as well as all styling and axis range calls (`Set*`, e.g.
+    `SetRangeUser`). This allows for validating plot configurations quickly,
+    and for profiling the Python side separately from ROOT's rendering.
+
+    The ROOT canvas, pads, and drawn objects are still created, as the
+    plotting logic queries them, e.g. for margins and axis ranges; they are
+    only never painted, attached to each other, or written to file.
+
+    Created through `canvas(..., backend='null')`. The log is available as
+    `operations`, a list of (target, operation, arguments) tuples.
+    """
+
+    def __init__ (self, *args, **kwargs):
+        """ Constructor. Always runs in batch mode. """
+        self.operations = list()
+        kwargs['batch'] = True
+        super(null_canvas, self).__init__(*args, **kwargs)
+        return
+
+
+
+    # Public high-level/management methods
+    # ----------------------------------------------------------------
+
+    def show (self):
+        """ ... """
+        self._update()
+        return
+
+
+    def save (self, path, manifest=None, **kwargs):
+        """ Log saving the canvas to `path`, without writing anything. """
+        if manifest is not None:
+            warning("save: Manifests are not updated by the null backend.")
+            pass
+        self._save(path)
+        return
+
+
+    def summary (self):
+        """ Return the number of logged calls for each operation. """
+        return collections.Counter(operation for _, operation, _ in self.operations)
+
+
+
+    # Private accessor methods
+    # ----------------------------------------------------------------
+
+    def _create_canvas (self):
+        """ ... """
+        return null_proxy(super(null_canvas, self)._create_canvas(), self.operations)
+
+
+    def _create_pad (self, coords, draw=True):
+        """ ... """
+        return null_pad(self, coords, draw=draw)
+
+
+    def _wrap (self, tpad):
+        """ Wrap the ROOT pads of all pads and overlays on this canvas, such that their operations are logged. """
+        return null_proxy(tpad, self.operations)
+
+    pass
+
+
+
+# Class definition
+class null_pad (pad):
+    """ Pad whose ROOT pad and axes log the operations carried out on them; cf. 'null_canvas'. """
+
+    def __init__ (self, base, coords, draw=True):
+        """ Constructor. """
+        super(null_pad, self).__init__(base, coords, draw=draw)
+        return
+
+
+    def _xaxis (self):
+        """ ... """
+        axis = super(null_pad, self)._xaxis()
+        return None if axis is None else null_proxy(axis, self._base.operations, self._pad.GetName() + '.xaxis')
+
+
+    def _yaxis (self):
+        """ ... """
+        axis = super(null_pad, self)._yaxis()
+        return None if axis is None else null_proxy(axis, self._base.operations, self._pad.GetName() + '.yaxis')
+
+    pass
+
+
+
+# Class definition
+class null_proxy (object):
+    """
+    Proxy for a ROOT object, logging calls made on it.
+
+    Painting and output methods are logged and skipped; styling methods
+    (`Set*`) and changes to the list of primitives, i.e. drawing, are logged
+    and forwarded. All other attribute access is forwarded as-is.
+    """
+
+    # Methods which are logged but not carried out
+    skipped = ['Modified', 'Update', 'Paint', 'Draw', 'SaveAs', 'Print']
+
+    # Methods on lists of primitives which correspond to drawing an object
+    drawing = ['Add', 'AddFirst', 'AddLast', 'AddAfter', 'AddBefore']
+
+    def __init__ (self, obj, log, name=None, draws=False):
+        """ Constructor. """
+        super(null_proxy, self).__init__()
+
+        # Member variables
+        self._obj   = obj
+        self._log   = log
+        self._name  = name or obj.GetName()
+        self._draws = draws # Whether `obj` is a list of primitives
+        return
+
+
+    def __getattr__ (self, attr):
+        """ Forward attribute access to the proxied object, logging calls as appropriate. """
+
+        if self._draws and attr in self.drawing:
+            method = getattr(self._obj, attr)
+            def draw (*args):
+                args = map(unwrap, args)
+                # Drawn object, and draw option or neighbouring object
+                idx = 1 if attr in ['AddAfter', 'AddBefore'] else 0
+                self._log.append((self._name, 'Draw', (name_of(args[idx]),) + tuple(map(name_of, args[:idx] + args[idx + 1:]))))
+                return method(*args)
+            return draw
+
+        elif attr in self.skipped:
+            def skip (*args):
+                self._log.append((self._name, attr, tuple(map(name_of, args))))
+                return None
+            return skip
+
+        elif attr == 'GetListOfPrimitives':
+            return lambda: null_proxy(self._obj.GetListOfPrimitives(), self._log, self._name, draws=True)
+
+        elif attr.startswith('Set'):
+            method = getattr(self._obj, attr)
+            def forward (*args):
+                self._log.append((self._name, attr, tuple(map(name_of, args))))
+                return method(*map(unwrap, args))
+            return forward
+
+        return getattr(self._obj, attr)
+
+
+    # Special methods are looked up on the type, not through `__getattr__`
+    def __len__ (self):
+        """ ... """
+        return len(self._obj)
+
+
+    def __getitem__ (self, idx):
+        """ ... """
+        return self._obj[idx]
+
+
+    def __iter__ (self):
+        """ ... """
+        return iter(self._obj)
+
+    pass
+
+
+
+# Utility functions
+# --------------------------------------------------------------------
+
+def unwrap (obj):
+    """ Return the ROOT object proxied by `obj`, if any. """
+    return obj._obj if isinstance(obj, null_proxy) else obj
+
+
+def name_of (obj):
+    """ Return the name of ROOT objects, leaving other values as they are. """
+    obj = unwrap(obj)
+    return obj.GetName() if hasattr(obj, 'GetName') else obj
@@ -17,6 +17,7 @@ except:
 from rootplotting.tools import *
 from rootplotting.style import *
 from rootplotting import pad
+from rootplotting.spec import recorded, get_recorder
 
 
 # Class definition
@@ -24,21 +25,28 @@ class overlay (pad):
     """
     docstring for overlay
     @TODO: Elaborate!
+
+    Several overlays may be added to the same pad; their axes are stacked on
+    the right-hand side, each offset by `axis_spacing` (in NDC) from the
+    previous one. The canvas and pad margins are laid out once, at render
+    time, to make room for all overlay axes.
     """
 
+    # Right-hand margin for the first overlay axis, and spacing between stacked axes
+    right_margin = 0.12
+    axis_spacing = 0.10
+
     def __init__ (self, base, color=ROOT.kRed, ndiv=520):
         """ Constructor. """
         # Check if canvas
         if hasattr(base, 'pads'):
             base = base.pads()[0]
             pass
-        super(overlay, self).__init__(base, (0, 0, 1, 1)) # 'pad' contructor
+        super(overlay, self).__init__(base, (0, 0, 1, 1), draw=False) # 'pad' contructor
 
         # Check(s)
         # ...
 
-        base._update()
-
         # Add 'self' to canvas' list of pads
         idx = base._base._pads.index(base)
         base._base._pads.insert(idx + 1, self)
@@ -61,19 +69,8 @@ class overlay (pad):
         self._label = None
         self._ndiv  = ndiv
 
-        # Resize canvas and pad(s)
-        right_margin = 0.12
-        c = base._bare() # Getting parent TCanvas; assuming 'canvas' > 'pad' > 'overlay' structure. @TODO: Improve?
-        w_initial = 1 - c.GetLeftMargin() - c.GetRightMargin()
-        w_final   = 1 - c.GetLeftMargin() - right_margin
-        c.SetCanvasSize(int(c.GetWw() * w_initial / w_final), c.GetWh())
-        for p in base._base._pads:
-            p._bare().SetRightMargin(right_margin)
-            pass
-
+        # Canvas and pad margins are laid out at render time; cf. 'canvas._layout_overlays'
         base._bare().SetTicks(1,0) # Remove y-axis tick on right-hand side
-        base._bare().Update()
-        base._bare().cd()
 
 
         # Store coordinates
@@ -81,14 +78,17 @@ class overlay (pad):
         self._xmax = base._xaxis().GetXmax()
 
         # Draw overlay pad and axis
-        self._pad.Draw()
+        base._draw(self._pad)
         self._pad.cd()
 
         # Axis
         self._update_axis()
 
-        self._pad.Modified()
-        self._pad.Update()
+        # Record creation, if the canvas is recording
+        rec = get_recorder(base)
+        if rec is not None and rec.depth == 0:
+            rec.add_overlay(base, color=color, ndiv=ndiv)
+            pass
         return
 
 
@@ -103,6 +103,7 @@ class overlay (pad):
                 self._pad.cd()
                 pass
             return func(self, *args, **kwargs)
+        wrapper.__name__ = func.__name__
         return wrapper
 
     # Update pad upon completion of methdd
@@ -110,10 +111,13 @@ class overlay (pad):
         def wrapper(self, *args, **kwargs):
             result = func(self, *args, **kwargs)
             if hasattr(self._pad, 'Modified'):
-                self._pad.Modified()
-                self._pad.Update()
+                with render_lock:
+                    self._pad.Modified()
+                    self._pad.Update()
+                    pass
                 pass
             return result
+        wrapper.__name__ = func.__name__
         return wrapper
 
 
@@ -121,34 +125,59 @@ class overlay (pad):
     # Public accessor/mutator methods
     # ----------------------------------------------------------------
 
+    @recorded
     def lim (self, ymin, ymax, force=True):
         """ ... """
+        return self._lim(ymin, ymax, force)
+
+
+    @recorded
+    @update
+    def label (self, label):
+        """ ... """
+        self._label = label
+        return
+
+
+    @recorded
+    @update
+    def ylabel (self, label):
+        """ ... """
+        return self.label(label)
+
+
+
+    # Private accessor/mutator methods
+    # ----------------------------------------------------------------
+
+    def _lim (self, ymin, ymax, force=True):
+        """ ... """
 
         # Check(s)
         assert ymin < ymax, "Axis limits must be given in increasing order; recieved (%.1e, %.1e)" % (ymin, ymax)
 
-        # Decide whether to set limits
+        # Decide whether to set limits. The axis itself is updated at render time.
         if force or not self._lims_set:
             self._ymin = ymin
             self._ymax = ymax
             self._lims_set = force
-            self._update_axis()
             pass
 
         return
 
 
-    @update
-    def label (self, label):
-        """ ... """
-        self._label = label
-        return
 
+    # Private accessor methods
+    # ----------------------------------------------------------------
 
-    @update
-    def ylabel (self, label):
-        """ ... """
-        return self.label(label)
+    def _index (self):
+        """ Return the index of this overlay among the overlays on its base pad. """
+        return filter(is_overlay, self._base._children).index(self)
+
+
+    def _required_right_margin (self):
+        """ Return the right margin needed to fit this overlay's axis. """
+        return self.right_margin + self._index() * self.axis_spacing
 
 
 
@@ -218,11 +247,21 @@ class overlay (pad):
                         self._xmax + base.GetRightMargin()  * dx,
                         ymax       + base.GetTopMargin()    * dy)
 
-        # Create and draw axis
-        self._axis = ROOT.TGaxis(self._xmax, ymin,
-                                 self._xmax, ymax,
-                                 ymin, ymax, self._ndiv, "+L")
-        self._axis.Draw()
+        # Create and draw axis once; re-use it on subsequent updates
+        x = self._xmax + self._index() * self.axis_spacing * dx
+        if self._axis is None:
+            self._axis = ROOT.TGaxis(x, ymin,
+                                     x, ymax,
+                                     ymin, ymax, self._ndiv, "+L")
+            self._draw(self._axis)
+        else:
+            self._axis.SetX1(x)
+            self._axis.SetX2(x)
+            self._axis.SetY1(ymin)
+            self._axis.SetY2(ymax)
+            self._axis.SetWmin(ymin)
+            self._axis.SetWmax(ymax)
+            pass
 
         # Set axis label (opt.)
         if self._label:
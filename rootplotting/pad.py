@@ -2,9 +2,6 @@
 
 """ Wrapper around ROOT TPad, handling plotting, labeling, text, and legend."""
 
-# Basic import(s)
-import time
-
 # Scientific import(s)
 import ROOT
 try:
@@ -19,6 +16,11 @@ except:
 # Project import(s)
 from rootplotting.tools import *
 from rootplotting.style import *
+from rootplotting.stack import cumulative_stack
+from rootplotting.histogram import histogram, variations, uncertainty_band, quantile_band, efficiency, efficiency_histograms, profile, QUANTILES
+from rootplotting.spec import recorded
+from rootplotting import raster
+from rootplotting import curves
 
 
 # Enum class, for easy handling different plotting cases
@@ -36,8 +38,12 @@ class pad (object):
     @TODO: Elaborate!
     """
 
-    def __init__(self, base, coords):
-        """ Constructor. """
+    def __init__(self, base, coords, draw=True):
+        """ Constructor.
+
+        If `draw` is False, the TPad is created but not drawn on the base
+        canvas, allowing the caller to draw several pads in bulk.
+        """
         super(pad, self).__init__()
 
         # Check(s)
@@ -51,18 +57,25 @@ class pad (object):
         # -- TPad-type
         self._base = base
         self._base._bare().cd()
-        self._pad = ROOT.TPad('pad_{}_{}'.format(self._base._bare().GetName(), id(self)), "", *coords)
+        self._pad = self._get_canvas()._wrap(ROOT.TPad(unique_name('pad_{}'.format(self._base._bare().GetName())), "", *coords))
         self._coords = coords
         self._scale  = (1./float(coords[2] - coords[0]), 1./float(coords[3] - coords[1]))
 
         # -- Book-keeping
         self._primitives = list()
+        self._arrays = dict() # id(primitive) -> numpy-backed histogram, for range finding
+        self._poisson = dict() # id(primitive) -> graph with Poisson errors drawn in its stead, for range finding
+        self._rasterized = list() # (drawn primitive, DPI), rasterised in vector output
         self._entries = list()
         self._stack = None
         self._legends = list()
         self._children = list()
         self._oob_up   = None
         self._oob_down = None
+        self._oob_source = None # Histogram for which out-of-bounds markers are drawn
+        self._live    = dict()  # id(histogram returned by plotting method) -> (histogram, copies receiving the same fills, whether stacked)
+        self._derived = list()  # (derived histogram or graph, sources, function computing its contents, offset)
+        self._changed = set()   # ids of histograms changed since the last refresh
 
         # -- Plotting cosmetics
         self._padding = 0.4
@@ -74,10 +87,13 @@ class pad (object):
         self._line  = None
         self._latex = None
 
-        # Draw pad
-        self._base._bare().cd()
-        self._pad.Draw()
-        self._base._bare().Update()
+        # Draw pad (opt.)
+        if draw:
+            draw_on(self._base._bare(), self._pad)
+            with render_lock:
+                self._base._bare().Update()
+                pass
+            pass
         return
 
 
@@ -100,6 +116,7 @@ class pad (object):
                 self._pad.cd()
                 pass
             return func(self, *args, **kwargs)
+        wrapper.__name__ = func.__name__
         return wrapper
 
     # Update pad upon completion of methdd
@@ -107,10 +124,13 @@ class pad (object):
         def wrapper(self, *args, **kwargs):
             result = func(self, *args, **kwargs)
             if hasattr(self._pad, 'Modified'):
-                self._pad.Modified()
-                self._pad.Update()
+                with render_lock:
+                    self._pad.Modified()
+                    self._pad.Update()
+                    pass
                 pass
             return result
+        wrapper.__name__ = func.__name__
         return wrapper
 
 
@@ -118,40 +138,211 @@ class pad (object):
     # Public plotting methods
     # ----------------------------------------------------------------
 
+    @recorded
     def plot (self, data, **kwargs):
-        """ ... """
+        """ ...
+
+        With `errors='poisson'`, the data are drawn with asymmetric Garwood
+        Poisson errors, computed for all bins at once, as a TGraphAsymmErrors.
+        The same option propagates the numerator's Poisson errors to
+        `ratio_plot`.
+        """
         return self._plot(PlotType.plot, data, **kwargs)
 
 
+    @recorded
     def hist (self, data, **kwargs):
         """ ... """
         return self._plot(PlotType.hist, data, **kwargs)
 
 
+    @recorded
     def hist2d (self, data, **kwargs):
         """ ... """
         return self._plot(PlotType.hist2d, data, **kwargs)
 
 
+    @recorded
     def stack (self, data, **kwargs):
         """ ... """
         return self._plot(PlotType.stack, data, **kwargs)
 
 
+    @recorded
     def graph (self, data, **kwargs):
-        """ ... """
+        """ ...
+
+        Besides ROOT graphs, and arrays of y-values with the x-values given as
+        `bins`, `data` may be a tuple of arrays (x, y, exl, exh, eyl, eyh),
+        which is drawn as a TGraphAsymmErrors.
+        """
         return self._plot(PlotType.graph, data, **kwargs)
 
 
+    @recorded
     def ratio_plot (self, data, **kwargs):
         """ ... """
         return self._ratio_plot(PlotType.plot, data, **kwargs)
 
+    @recorded
     def diff_plot (self, data, **kwargs):
         """ ... """
         return self._diff_plot(PlotType.plot, data, **kwargs)
 
 
+    def band (self, nominal, up, down=None, method='envelope', symmetric=False, stat=False, relative=False, bins=None, **kwargs):
+        """ Draw an uncertainty band around `nominal`, from `up` and, optionally, `down` variations.
+
+        The band is computed using array reductions over all variations at
+        once, cf. `rootplotting.histogram.uncertainty_band` for the accepted
+        inputs and the meaning of the options, and drawn as a single
+        TGraphAsymmErrors. Style arguments are as for `hist`. Only the band
+        is recorded in plot specifications, as a `graph` call.
+        """
+        edges, y, lower, upper = uncertainty_band(nominal, up, down, method=method, symmetric=symmetric, stat=stat, relative=relative, bins=bins)
+        return self._plot_band(edges, y, lower, upper, **kwargs)
+
+
+    def roc (self, sig, bkg, weights=(None, None), order=(None, None), rejection=False, resolution=None, **kwargs):
+        """ Draw the ROC curve of lower cuts on the signal and background scores `sig` and `bkg`.
+
+        The curve is computed using one weighted sort and prefix sum per
+        sample, cf. `rootplotting.curves.roc`; pass the sorting indices, e.g.
+        `order=(curves.order(sig), curves.order(bkg))`, to reuse them across
+        several curves drawn from the same samples. The curve is drawn as the
+        signal- versus background efficiency or, with `rejection=True`, as the
+        background rejection (1/efficiency) versus the signal efficiency.
+        Points are downsampled to the pixel resolution of the pad, or to an
+        (nx, ny) `resolution`, before the graph is created. The `label` may
+        refer to the area under the curve, e.g. `label='BDT (AUC: {auc:.3f})'`.
+        Only the drawn curve is recorded in plot specifications, as a `graph`
+        call, rather than the scores.
+
+        Returns the drawn graph and the area under the curve.
+        """
+        eff_bkg, eff_sig, auc = curves.roc(sig, bkg, weights=weights, order=order)
+        if rejection:
+            msk = eff_bkg > 0
+            x, y = eff_sig[msk], 1. / eff_bkg[msk]
+        else:
+            x, y = eff_bkg, eff_sig
+            pass
+        if 'label' in kwargs:
+            kwargs['label'] = kwargs['label'].format(auc=auc)
+            pass
+        g = self._plot_curve(x, y, logy=rejection or self._log, resolution=resolution, **kwargs)
+        return g, auc
+
+
+    def cumulative (self, scores, weights=None, order=None, upper=True, normalise=True, resolution=None, **kwargs):
+        """ Draw the cumulative distribution of `scores`, i.e. the weight at or above (`upper=True`) or below each value.
+
+        The distribution is computed using one weighted sort and prefix sum,
+        cf. `rootplotting.curves.cumulative`, at each distinct value, without
+        binning; pass `order=curves.order(scores)` to reuse the sort across
+        several curves drawn from the same sample. Points are downsampled, and
+        recorded, as for `roc`.
+
+        Returns the drawn graph.
+        """
+        x, y = curves.cumulative(scores, weights=weights, order=order, upper=upper, normalise=normalise)
+        return self._plot_curve(x, y, logy=self._log, resolution=resolution, **kwargs)
+
+
+    def efficiency (self, data, passed=None, bins=None, weights=None, method='clopper-pearson', cl=0.682689492, **kwargs):
+        """ Draw efficiencies, with confidence intervals, as a single TGraphAsymmErrors.
+
+        `data` is either an array of values, binned with `bins` and optional
+        `weights`, of which those passing are selected by the boolean mask
+        `passed`; or a tuple of (passed, total) histograms, ROOT or
+        `histogram`. The values are binned once for both histograms, cf.
+        `rootplotting.histogram.efficiency_histograms`, and the efficiencies
+        and their Clopper-Pearson, Wilson, or normal intervals computed as
+        arrays, cf. `rootplotting.histogram.efficiency`. Bins without entries
+        are not drawn. Several efficiency curves may be drawn on the same pad;
+        style arguments are as for `graph`. Only the efficiencies and their
+        intervals are recorded in plot specifications, as a `graph` call.
+
+        Returns the drawn graph.
+        """
+        if isinstance(data, tuple):
+            num, den = data
+        else:
+            assert passed is not None and bins is not None, "You need to specify 'passed' and 'bins' when plotting a numpy-type input."
+            num, den = efficiency_histograms(bins, data, passed, weights)
+            pass
+        edges, eff, lower, upper = efficiency(num, den, cl=cl, method=method, bins=bins)
+
+        msk = np.isfinite(eff)
+        x  = 0.5 * (edges[1:] + edges[:-1])
+        ex = 0.5 * np.diff(edges)
+        kwargs.setdefault('option', self._get_plot_option(PlotType.graph))
+        return self.graph((x[msk], eff[msk], ex[msk], ex[msk], lower[msk], upper[msk]), **kwargs)
+
+
+    def profile (self, x, y, bins, weights=None, errors='mean', median=False, quantiles=None, **kwargs):
+        """ Draw the profile of `y` versus `x`, with optional `weights`, as a single TGraphAsymmErrors.
+
+        The weighted mean and standard deviation of `y` in each bin of `x` are
+        computed with bincounts, cf. `rootplotting.histogram.profile`, without
+        filling a TProfile entry by entry. The central values are the means,
+        or, with `median=True`, the medians. The uncertainties are the errors
+        on the mean (`errors='mean'`) or the standard deviations
+        (`errors='rms'`); or, if `quantiles` are given, e.g. (0.16, 0.84), the
+        interval between these quantiles of `y`. Quantiles and medians require
+        a sort of all entries. The profile is drawn as error bars or, e.g.
+        with `option='E3'`, as a band. Empty bins are not drawn. Style
+        arguments are as for `graph`. Only the drawn points and their errors
+        are recorded in plot specifications, as a `graph` call.
+
+        Returns the drawn graph.
+        """
+
+        # Check(s)
+        assert errors in ['mean', 'rms'], "Profile errors '{}' not recognised.".format(errors)
+        assert quantiles is None or len(quantiles) == 2, "Profile quantiles must be a (lower, upper) pair."
+
+        q = (list(quantiles) if quantiles is not None else []) + ([0.5] if median else [])
+        edges, mean, std, neff, values = profile(bins, x, y, weights=weights, quantiles=q or None)
+        y = values[-1] if median else mean
+        if quantiles is not None:
+            lower, upper = np.maximum(y - values[0], 0.), np.maximum(values[1] - y, 0.)
+        else:
+            lower = upper = std if errors == 'rms' else std / np.sqrt(np.where(neff > 0, neff, 1.))
+            pass
+
+        msk = np.isfinite(y)
+        x  = 0.5 * (edges[1:] + edges[:-1])
+        ex = 0.5 * np.diff(edges)
+        kwargs.setdefault('option', self._get_plot_option(PlotType.graph))
+        return self.graph((x[msk], y[msk], ex[msk], ex[msk], lower[msk], upper[msk]), **kwargs)
+
+
+    def significance (self, sig, bkg, bins=None, weights=(None, None), cut='lower', method='asimov', color=ROOT.kRed, ylabel='Significance', **kwargs):
+        """ Draw the expected significance of a lower or upper cut at each bin edge, on a secondary axis.
+
+        The significance is computed for all edges at once from cumulative
+        sums of the signal and background yields, cf.
+        `rootplotting.curves.significance` for the accepted inputs and
+        options. On a pad, the curve is drawn on a new `overlay` with axis
+        colour `color` and title `ylabel`; on an overlay, it is drawn directly,
+        such that the axis can be configured beforehand, e.g.
+
+            overlay(pad, color=ROOT.kBlue).significance(sig, bkg, bins=bins)
+
+        Returns the drawn graph.
+        """
+        from rootplotting.overlay import overlay
+        target = self
+        if not is_overlay(self):
+            target = overlay(self, color=color)
+            target.label(ylabel)
+            pass
+        edges, z = curves.significance(sig, bkg, bins=bins, weights=weights, cut=cut, method=method)
+        kwargs.setdefault('linecolor', color)
+        return target._plot_curve(edges, z, logy=target._log, **kwargs)
+
+
 
     # Public accessor/mutator methods
     # ----------------------------------------------------------------
@@ -161,9 +352,48 @@ class pad (object):
 
         # Check(s)
         if self._stack is None: return None
-        return get_stack_sum(self._stack, only_first=False)
+        h = get_stack_sum(self._stack, only_first=False)
+        self._derive(h, [self._stack], lambda: histogram.from_root(get_stack_sum(self._stack, only_first=False)))
+        return h
+
+
+    def fill (self, hist, data, weights=None):
+        """ Append entries `data`, with optional `weights`, to histogram `hist` already drawn on this pad.
+
+        `hist` is the histogram returned by the plotting method, e.g. `hist`,
+        `plot`, or `stack`. The entries are added, as arrays, to all copies of
+        the histogram held by the pad, including stacks; any scaling or
+        normalisation requested when plotting is not re-applied. Derived
+        histograms, i.e. stack sums, and ratio- and difference plots, Poisson
+        errors, as well as axis ranges and out-of-bounds markers, are only
+        recomputed on the next call to `canvas.refresh`. Fills are not recorded in plot
+        specifications.
 
+        Returns the updated histogram.
+        """
+
+        # Check(s)
+        if id(hist) not in self._live:
+            warning("fill: Histogram {} is not drawn on this pad.".format(hist.GetName() if hasattr(hist, 'GetName') else hist))
+            return None
+        if not type(hist).__name__.startswith('TH') or hist.InheritsFrom('TProfile'):
+            warning("fill: Cannot fill objects of type {}.".format(type(hist).__name__))
+            return None
+
+        # Fill increment as arrays, with the binning of `hist`
+        arrays = self._arrays.get(id(hist), None)
+        if arrays is None:
+            arrays = histogram.from_root(hist)
+            pass
+        increment = histogram(arrays.edges if arrays.ndim > 1 else arrays.edges[0]).fill(data, weights=weights)
 
+        arrays += increment
+        N = len(data[0]) if isinstance(data, tuple) else len(data)
+        self._set_contents(hist, arrays.sumw, arrays.sumw2, entries=hist.GetEntries() + N)
+        return hist
+
+
+    @recorded
     @update
     def log (self, log=True):
         """ ... """
@@ -177,6 +407,7 @@ class pad (object):
         return
 
 
+    @recorded
     @update
     def logx (self, logx=True):
         """ ... """
@@ -190,11 +421,13 @@ class pad (object):
         return
 
 
+    @recorded
     def logy (self, **kwargs):
         """ Alias method for 'log'. """
         return self.log(**kwargs)
 
 
+    @recorded
     @update
     def xlim (self, *args):
         """ ... """
@@ -220,6 +453,7 @@ class pad (object):
         return
 
 
+    @recorded
     @cd
     @update
     def ylim (self, *args):
@@ -246,6 +480,7 @@ class pad (object):
         return
 
 
+    @recorded
     @update
     def ymin (self, ymin):
         """ ... """
@@ -259,6 +494,7 @@ class pad (object):
         return
 
 
+    @recorded
     @update
     def padding (self, padding):
         """ ... """
@@ -277,21 +513,23 @@ class pad (object):
     # Public line-drawing methods
     # ----------------------------------------------------------------
 
+    @recorded
     @cd
     def line (self, x1, y1, x2, y2, **kwargs):
         """ ... """
 
         # Check(s)
-        self._line = ROOT.TLine()
+        self._line = ROOT.TLine(x1, y1, x2, y2)
         self._line.SetLineStyle(2)
         self._line.SetLineColor(ROOT.kGray + 3)
         self._style_line(self._line, **kwargs)
 
         # Draw line
-        self._line.DrawLine(x1, y1, x2, y2)
+        self._draw(self._line, owned=True)
         return
 
 
+    @recorded
     def lines (self, coords, **kwargs):
         """ ... """
 
@@ -301,6 +539,7 @@ class pad (object):
         return
 
 
+    @recorded
     def ylines (self, ys, **kwargs):
         """ ... """
 
@@ -310,6 +549,7 @@ class pad (object):
         return
 
 
+    @recorded
     def xlines (self, xs, **kwargs):
         """ ... """
 
@@ -319,6 +559,7 @@ class pad (object):
         return
 
 
+    @recorded
     @cd
     def yline (self, y, **kwargs):
         """ ... """
@@ -329,6 +570,7 @@ class pad (object):
         return
 
 
+    @recorded
     @cd
     def xline (self, x, ymin=None, ymax=None, snap=False, text=None, text_align='TL', **kwargs):
         """ ... """
@@ -350,7 +592,7 @@ class pad (object):
         if ymax is None:
             ymax = self.ylim()[1]
             if self._base._pads.index(self) == 0:
-                ymax = max(map(get_maximum, self._primitives))
+                ymax = max(map(get_maximum, self._range_objects()))
                 pass
             pass
         self.line(xdraw, ymin, xdraw, ymax, **kwargs)
@@ -421,6 +663,7 @@ class pad (object):
     # Public text/decoration methods
     # ----------------------------------------------------------------
 
+    @recorded
     def xlabel (self, title):
         """ ... """
 
@@ -432,6 +675,7 @@ class pad (object):
         return
 
 
+    @recorded
     def ylabel (self, title):
         """ ... """
 
@@ -443,6 +687,7 @@ class pad (object):
         return
 
 
+    @recorded
     @cd
     @update
     def text (self, lines=[], qualifier='', ATLAS=True, xmin=None, ymax=None, **kwargs):
@@ -484,26 +729,25 @@ class pad (object):
         return
 
 
+    @recorded
     @cd
     @update
     def latex (self, string, x, y, align=21, angle=0, NDC=False, **kwargs):
         """ ... """
 
         # Check(s)
-        self._latex = ROOT.TLatex()
+        self._latex = ROOT.TLatex(x, y, string)
         self._latex.SetTextAlign(align)
         self._latex.SetTextAngle(angle)
+        self._latex.SetNDC(NDC)
         self._style_text(self._latex, **kwargs)
 
         # Draw line
-        if NDC:
-            self._latex.DrawLatexNDC(x, y, string)
-        else:
-            self._latex.DrawLatex(x, y, string)
-            pass
+        self._draw(self._latex, owned=True)
         return
 
 
+    @recorded
     @cd
     @update
     def legend (self, header=None, categories=None,
@@ -661,7 +905,7 @@ class pad (object):
                 pass
             pass
 
-        self._legends[-1].Draw()
+        self._draw(self._legends[-1])
 
         # Clear entries (allowing for multiple legends)
         self._clear_all_entries()
@@ -679,6 +923,15 @@ class pad (object):
         return
 
 
+    def _get_canvas (self):
+        """ Return the canvas owning this pad, also for overlays. """
+        base = self._base
+        while not is_canvas(base):
+            base = base._base
+            pass
+        return base
+
+
     def _xaxis (self):
         """ ... """
 
@@ -714,13 +967,14 @@ class pad (object):
     def _get_first_primitive (self):
         """ ... """
 
-        # Check(s)
-        if len(self._pad.GetListOfPrimitives()) < 2:
-            warning("Nothing was drawn; cannot access first primitive.")
-            return None
+        # Return first primitive, other than the frame, which only exists once the pad has been painted
+        for primitive in self._pad.GetListOfPrimitives():
+            if not primitive.InheritsFrom('TFrame'):
+                return primitive
+            pass
 
-        # Return first primitive
-        return self._pad.GetListOfPrimitives()[1]
+        warning("Nothing was drawn; cannot access first primitive.")
+        return None
 
 
 
@@ -735,7 +989,16 @@ class pad (object):
             kwargs['option'] = self._get_plot_option(plottype)
             pass
 
-        if type(data).__module__.startswith(np.__name__) or type(data) == list:
+        if is_histogram(data):
+            # Numpy-backed histogram
+            if plottype == PlotType.stack:
+                scale = kwargs.pop('scale', None) # Scale only once!
+                hist = self._plot1D      (data.copy(), display=False,   scale=scale, **kwargs)
+                return self._plot1D_stack(hist,        display=display, **kwargs)
+            else:
+                return self._plot1D      (data.copy(), display=display, **kwargs)
+
+        elif type(data).__module__.startswith(np.__name__) or type(data) == list:
             # Numpy-/list-type
             if plottype == PlotType.stack:
                 scale = kwargs.pop('scale', None) # Scale only once!
@@ -754,6 +1017,13 @@ class pad (object):
                 hist = data.Clone(data.GetName() + '_clone')
                 return self._plot1D      (hist, display=display, **kwargs)
 
+        elif isinstance(data, tuple) and plottype == PlotType.graph:
+            # Arrays of points with asymmetric errors, (x, y, exl, exh, eyl, eyh)
+            arrays = [np.asarray(a, dtype=np.float64) for a in data]
+            graph = ROOT.TGraphAsymmErrors(len(arrays[0]), *arrays)
+            graph.SetName(unique_name('graph'))
+            return self._plot1D      (graph, display=display, **kwargs)
+
         elif type(data).__name__.startswith('TH2'):
             # ROOT 2D-type
             assert plottype == PlotType.hist2d
@@ -783,7 +1053,7 @@ class pad (object):
             # Numpy-/list-type
             return self._ratio_plot1D_numpy(data, **kwargs)
 
-        elif type(data[0]).__name__.startswith('TH1') or type(data[0]) == ROOT.TProfile:
+        elif is_histogram(data[0]) or type(data[0]).__name__.startswith('TH1') or type(data[0]) == ROOT.TProfile:
             # ROOT-type
             return self._ratio_plot1D      (data, **kwargs)
 
@@ -809,7 +1079,7 @@ class pad (object):
             # Numpy-/list-type
             return self._diff_plot1D_numpy(data, **kwargs)
 
-        elif type(data[0]).__name__.startswith('TH1'):
+        elif is_histogram(data[0]) or type(data[0]).__name__.startswith('TH1'):
             # ROOT TH1-type
             return self._diff_plot1D      (data, **kwargs)
 
@@ -820,8 +1090,16 @@ class pad (object):
         return None
 
 
-    def _plot1D_numpy (self, data, bins, weights=None, option='', **kwargs):
-        """ ... """
+    def _plot1D_numpy (self, data, bins, weights=None, option='', bootstrap=None, seed=None, quantiles=QUANTILES, bootstrap_label=None, **kwargs):
+        """ ...
+
+        With `bootstrap` set to a number of replicas, and `data` being values
+        to be filled, Poisson-bootstrap replicas of the histogram are filled
+        as well, using `seed`, and the band spanned by their `quantiles` is
+        drawn around the histogram, optionally with legend `bootstrap_label`.
+        Normalisation and scaling are applied to each replica as to the
+        histogram; cf. `rootplotting.histogram.variations.bootstrap`.
+        """
 
         # Check(s)
         if bins is None:
@@ -836,19 +1114,117 @@ class pad (object):
         if len(data) == len(bins):
             # Assuming 'data' and 'bins' are sets of (x,y)-points
             h = ROOT.TGraph(len(bins), np.array(bins, dtype=np.float), np.array(data, dtype=np.float))
+        elif len(data) == len(bins) - 1:
+            # Assuming 'data' are bin values
+            h = histogram.from_values(bins, data)
         else:
-            h = ROOT.TH1F('h_{:d}'.format(int(time.time()*1E+06)), "", len(bins) - 1, np.array(bins, dtype=np.float))
-            if len(data) == len(bins) - 1:
-                # Assuming 'data' are bin values
-                array2hist(data, h)
+            # Assuming 'data' are values to be filled
+            h = histogram(bins).fill(data, weights=weights)
+            pass
+
+        # Bootstrap replicas (opt.)
+        replicas = None
+        if bootstrap:
+            if len(data) in [len(bins), len(bins) - 1] or not kwargs.get('display', True):
+                warning("_plot1D_numpy: Bootstrap bands are only drawn for displayed histograms of values to be filled.")
             else:
-                # Assuming 'data' are values to be filled
-                fill_hist(h, data, weights=weights)
+                replicas = variations.bootstrap(bins, data, weights, ntoys=bootstrap, seed=seed).values
                 pass
             pass
 
         # Plot histogram
-        return self._plot1D(h, option, **kwargs)
+        result = self._plot1D(h, option, **kwargs)
+
+        # Plot bootstrap band, with the normalisation and scaling applied to the histogram
+        if replicas is not None:
+            if kwargs.get('normalise', False):
+                sums = replicas.sum(axis=1)[:, np.newaxis]
+                replicas = replicas / np.where(sums != 0, sums, 1.)
+                pass
+            if kwargs.get('scale', None) is not None:
+                replicas = replicas * kwargs['scale']
+                pass
+            self._plot_band(*quantile_band(h, replicas, quantiles), label=bootstrap_label)
+            pass
+        return result
+
+
+    def _poisson_graph (self, hist, counts=None, factor=None, graph=None):
+        """ Return the contents of `hist` as a TGraphAsymmErrors with Garwood Poisson errors, styled as `hist`.
+
+        The intervals are computed for `counts`, by default the bin contents,
+        and scaled by `factor`, e.g. the inverse denominator for ratios. If
+        `graph` is given, its points and errors are updated in place instead.
+        """
+        sumw, _ = hist_arrays(hist)
+        y = sumw[1:-1]
+        counts = y if counts is None else np.asarray(counts, dtype=np.float64)
+        if counts is y and np.any(y != np.round(y)):
+            warning("_poisson_graph: Poisson errors assume unweighted, unscaled counts.")
+            pass
+        lower, upper = poisson_interval(counts)
+        factor = 1. if factor is None else factor
+
+        edges = axis_edges(hist.GetXaxis())
+        x  = 0.5 * (edges[1:] + edges[:-1])
+        ex = ROOT.gStyle.GetErrorX() * np.diff(edges)
+        eyl, eyh = (counts - lower) * factor, (upper - counts) * factor
+        if graph is not None:
+            for i in range(len(y)):
+                graph.SetPoint(i, x[i], y[i])
+                graph.SetPointError(i, ex[i], ex[i], eyl[i], eyh[i])
+                pass
+            return graph
+
+        g = ROOT.TGraphAsymmErrors(len(y), x, np.ascontiguousarray(y), ex, ex,
+                                   np.ascontiguousarray(eyl), np.ascontiguousarray(eyh))
+        g.SetName(unique_name(hist.GetName() + '_poisson'))
+        for att in [ROOT.TAttLine, ROOT.TAttFill, ROOT.TAttMarker]:
+            att.Copy(hist, g)
+            pass
+        return g
+
+
+    def _plot_band (self, edges, y, lower, upper, **kwargs):
+        """ Draw band with bin `edges`, central values `y`, and `lower` and `upper` uncertainties, as a single TGraphAsymmErrors. """
+        x  = 0.5 * (edges[1:] + edges[:-1])
+        ex = 0.5 * np.diff(edges)
+
+        # Default style, as for total uncertainty bands
+        kwargs.setdefault('option', ('A' if len(self._primitives) == 0 else '') + 'E2')
+        for key, value in [('fillstyle', 3245), ('fillcolor', ROOT.kGray + 2), ('linecolor', ROOT.kGray + 3)]:
+            kwargs.setdefault(key, value)
+            pass
+        return self.graph((x, y, ex, ex, lower, upper), **kwargs)
+
+
+    def _plot_curve (self, x, y, logy=False, resolution=None, **kwargs):
+        """ Draw curve (`x`, `y`) as a TGraph, keeping only points which are at least one pixel apart. """
+
+        # Downsample to the resolution of the pad, in the coordinates drawn
+        if resolution is None:
+            tpad = self._bare()
+            resolution = (int(tpad.GetWw() * tpad.GetAbsWNDC()), int(tpad.GetWh() * tpad.GetAbsHNDC()))
+            pass
+        if logy:
+            msk = y > 0
+            x, y = x[msk], y[msk]
+            pass
+        if len(x) > 2:
+            xrange = (x.min(), x.max())
+            if logy:
+                t = np.log10(y)
+                yrange = (t.min(), t.max())
+            else:
+                t = y
+                yrange = (y.min(), y.max())
+                pass
+            keep = curves.downsample(x, t, resolution[0], resolution[1], xrange=xrange, yrange=yrange)
+            x, y = x[keep], y[keep]
+            pass
+
+        kwargs.setdefault('option', ('A' if len(self._primitives) == 0 and not is_overlay(self) else '') + 'L')
+        return self.graph(np.asarray(y, dtype=np.float64), bins=np.asarray(x, dtype=np.float64), **kwargs)
 
 
     def _ratio_plot1D_numpy (self, data, bins, weights=None, option='', **kwargs):
@@ -864,12 +1240,11 @@ class pad (object):
             return
 
         # Fill histogram
-        h1 = ROOT.TH1F('h_num_{}'.format(id(data)), "", len(bins) - 1, bins)
-        h2 = ROOT.TH1F('h_den_{}'.format(id(data)), "", len(bins) - 1, bins)
-        fill_hist(h1, data[0], weights=weights[0])
-        fill_hist(h2, data[1], weights=weights[1])
+        weights = weights or (None, None)
+        h1 = histogram(bins).fill(data[0], weights=weights[0])
+        h2 = histogram(bins).fill(data[1], weights=weights[1])
 
-        return _ratio_plot1D((h1,h2), option, **kwargs)
+        return self._ratio_plot1D((h1,h2), option, **kwargs)
 
 
     def _diff_plot1D_numpy (self, data, bins, weights=None, option='', **kwargs):
@@ -885,12 +1260,11 @@ class pad (object):
             return
 
         # Fill histogram
-        h1 = ROOT.TH1F('h_num_{}'.format(id(data)), "", len(bins) - 1, bins)
-        h2 = ROOT.TH1F('h_den_{}'.format(id(data)), "", len(bins) - 1, bins)
-        fill_hist(h1, data[0], weights=weights[0])
-        fill_hist(h2, data[1], weights=weights[1])
+        weights = weights or (None, None)
+        h1 = histogram(bins).fill(data[0], weights=weights[0])
+        h2 = histogram(bins).fill(data[1], weights=weights[1])
 
-        return _diff_plot1D((h1,h2), option, **kwargs)
+        return self._diff_plot1D((h1,h2), option, **kwargs)
 
 
     @cd
@@ -901,6 +1275,22 @@ class pad (object):
         # Check(s)
         # ...
 
+        # Numpy-backed histograms are normalised and scaled as arrays, and
+        # only converted to ROOT for drawing
+        arrays = None
+        if is_histogram(hist):
+            arrays = hist
+            if kwargs.get('normalise', False):
+                arrays.normalise()
+                pass
+            if scale is not None:
+                arrays.scale(scale)
+                pass
+            kwargs['normalise'] = False
+            scale = None
+            hist = arrays.to_root()
+            pass
+
         # Normalise
         if 'normalise' in kwargs and kwargs['normalise']:
             if hist.Integral() > 0.:
@@ -910,7 +1300,7 @@ class pad (object):
             pass
 
         # Scale
-        if scale is not None and type(hist) != ROOT.THStack:
+        if scale is not None and not is_stack(hist):
             hist.Scale(scale)
             pass
 
@@ -929,22 +1319,53 @@ class pad (object):
         if display:
 
             # Draw histograms
-            if type(hist) in [ROOT.THStack, ROOT.TGraph, ROOT.TGraphErrors, ROOT.TGraphAsymmErrors]:
-                hist.Draw(option)
+            if kwargs.get('errors', None) == 'poisson' and type(hist).__name__.startswith('TH1') and not hist.InheritsFrom('TProfile'):
+                # Asymmetric Poisson errors, drawn as a graph; the histogram only defines the axes, if first
+                if len(self._primitives) == 0:
+                    frame = hist.Clone(unique_name(hist.GetName() + '_frame'))
+                    frame.SetDirectory(0)
+                    self._draw(frame, 'AXIS', owned=True)
+                    pass
+                poisson = kwargs.get('poisson', lambda: (None, None))
+                drawn = self._poisson_graph(hist, *poisson())
+                self._draw(drawn, 'P')
+            elif is_stack(hist) or type(hist) in [ROOT.TGraph, ROOT.TGraphErrors, ROOT.TGraphAsymmErrors]:
+                self._draw(hist, option)
+                drawn = hist
             else:
-                hist.DrawCopy(option)
+                # Equivalent to 'DrawCopy'
+                drawn = hist.Clone(unique_name(hist.GetName()))
+                drawn.SetDirectory(0)
+                self._draw(drawn, option, owned=True)
+                pass
+
+            # Rasterise layer in vector output (opt.)
+            if kwargs.get('rasterize', False):
+                if is_stack(drawn):
+                    warning("_plot1D: Stacks cannot be rasterised.")
+                else:
+                    self._rasterized.append((drawn, kwargs.get('dpi', raster.DPI)))
+                    pass
                 pass
 
             # Store reference to primitive
-            self._add_to_primitives(hist)
+            self._add_to_primitives(hist, arrays)
             hist = self._primitives[-1] # Reference the stored histogram
+            if not is_stack(hist):
+                self._live[id(hist)] = (hist, [drawn] if drawn is not hist and drawn.InheritsFrom('TH1') else [], False)
+                pass
+            if drawn is not hist and drawn.InheritsFrom('TGraph'):
+                # Poisson graph, rebuilt from the histogram on refresh, and used for range finding
+                self._poisson[id(hist)] = drawn
+                self._derive(drawn, [hist], lambda hist=hist, drawn=drawn: self._poisson_graph(hist, *poisson(), graph=drawn))
+                pass
 
             # Check whether several filled histograms have been added
-            if (type(hist) == ROOT.THStack or hist.GetFillColor() != 0) and len(filter(lambda h: type(h) == ROOT.THStack or (type(h).__name__.startswith('TH') and h.GetFillColor() != 0 and not option.startswith('E')), self._primitives)) == 2:
+            if (is_stack(hist) or hist.GetFillColor() != 0) and len(filter(lambda h: is_stack(h) or (type(h).__name__.startswith('TH') and h.GetFillColor() != 0 and not option.startswith('E')), self._primitives)) == 2:
                 warning("Several filled, non-stacked histograms have been added. This may be misleading.")
                 pass
 
-            if type(hist) != ROOT.THStack:
+            if not is_stack(hist):
                 # Store legend entry
                 if 'label' in kwargs and kwargs['label'] is not None:
 
@@ -969,29 +1390,11 @@ class pad (object):
                     pass
                 self._oob_up   = hist.Clone(hist.GetName() + '_oob_up')
                 self._oob_down = hist.Clone(hist.GetName() + '_oob_down')
-                ymin, ymax = self.ylim()
-
-                offset = 0.1
-                if self._log:
-                    lymin, lymax = map(np.log10, (ymin, ymax))
-                    ldiff = lymax - lymin
-                    ooby_up   = np.power(10, lymax - offset * ldiff)
-                    ooby_down = np.power(10, lymin + offset * ldiff)
-                else:
-                    diff = ymax - ymin
-                    ooby_up   = ymax - offset * diff
-                    ooby_down = ymin + offset * diff
-                    pass
-                
-                for bin in range(1, hist.GetXaxis().GetNbins() + 1):
-                    c = hist.GetBinContent(bin)
-                    if c > ymax: self._oob_up  .SetBinContent(bin, ooby_up)
-                    else:        self._oob_up  .SetBinContent(bin, -9999.)
-                    if c < ymin: self._oob_down.SetBinContent(bin, ooby_down)
-                    else:        self._oob_down.SetBinContent(bin, -9999.)
-                    self._oob_up  .SetBinError(bin, 0)
-                    self._oob_down.SetBinError(bin, 0)
-                    pass
+                self._oob_source = hist
+                up, down = self._oob_contents()
+                zeros = np.zeros_like(up)
+                array2hist(up,   self._oob_up,   errors=zeros)
+                array2hist(down, self._oob_down, errors=zeros)
 
                 markercolor = kwargs.get('oob_color', ROOT.kBlue)
                 self._plot1D(self._oob_up,   markercolor=markercolor, markerstyle=22, markersize=1.0, option='P HIST')
@@ -1007,80 +1410,90 @@ class pad (object):
     def _ratio_plot1D (self, hists, option='', offset=None, default=1, **kwargs):
         """ ... """
 
-        # Check(s)
-        if type(hists[0]) == ROOT.TProfile:
+        # Compute ratio as arrays
+        def compute ():
+            num, den = [h if is_histogram(h) else histogram.from_root(h) for h in hists]
+            return num.divide(den, default=default)
+        ratio = compute()
+
+        # Poisson errors on the numerator counts, scaled by the denominator (opt.); recomputed on refresh
+        if kwargs.get('errors', None) == 'poisson':
+            def poisson ():
+                num, den = [h if is_histogram(h) else histogram.from_root(h) for h in hists]
+                return (num.values, np.where(den.values != 0, 1. / np.where(den.values != 0, den.values, 1.), 0.))
+            kwargs['poisson'] = poisson
+            pass
+
+        if is_histogram(hists[0]) or type(hists[0]) == ROOT.TProfile:
             # Create a new TH1 histogram, instead of cloning, in case inputs are TProfiles for which SetBinContent makes little sense.
-            ax = hists[0].GetXaxis()
-            h = ROOT.TH1F(hists[0].GetName() + '_ratio', "", ax.GetNbins(), ax.GetXmin(), ax.GetXmax())
+            h = ratio
         else:
             # Clone if inputs are standard ROOT TH1*'s , in order to keep any style applied previously
             h = hists[0].Clone(hists[0].GetName() + '_ratio')
+            array2hist(ratio.sumw, h, errors=np.sqrt(ratio.sumw2))
             pass
 
-        # Fill bins with ratio
-        for bin in range(1, h.GetXaxis().GetNbins() + 1):
-            num   = hists[0].GetBinContent(bin)
-            num_e = hists[0].GetBinError  (bin)
-            denom = hists[1].GetBinContent(bin)
-            h.SetBinContent(bin, num   / denom if denom > 0 else default)
-            h.SetBinError  (bin, num_e / denom if denom > 0 else 9999.)
-            pass
-
-
-        # Add offset (opt.)
-        if offset is not None:
-            h_offset = h.Clone(h.GetName() + '_offset')
-            for bin in range(1, h.GetXaxis().GetNbins() + 1):
-                h       .SetBinContent(bin, offset + h.GetBinContent(bin))
-                h_offset.SetBinContent(bin, offset)
-                h_offset.SetBinError  (bin, 0)
-                pass
-            pass
-
-        # Plot histogram
-        result = self._plot1D(h, option, **kwargs)
-        if offset is not None:
-            self._plot1D(h_offset, 'HIST', fillcolor=10)
-            self._get_first_primitive().Draw('AXIS SAME')
-            pass
+        result = self._plot1D_with_offset(h, option, offset, **kwargs)
+        self._derive(result, hists, compute, offset)
         return result
 
 
     def _diff_plot1D (self, hists, option='', offset=None, uncertainties=True, **kwargs):
         """ ... """
 
-        h = hists[0].Clone(hists[0].GetName() + '_diff')
-        if uncertainties:
-            h.Add(hists[1], -1)
-        else:
-            for bin in range(1, h.GetXaxis().GetNbins() + 1):
-                denom = hists[1].GetBinContent(bin)
-                h.SetBinContent(bin, h.GetBinContent(bin) - denom)
+        # Compute difference as arrays; errors are added in quadrature, as for TH1::Add
+        def compute ():
+            first, second = [h if is_histogram(h) else histogram.from_root(h) for h in hists]
+            diff = first - second
+            if not uncertainties:
+                diff.sumw2 = first.sumw2.copy()
                 pass
+            return diff
+        diff = compute()
+
+        if is_histogram(hists[0]):
+            h = diff
+        else:
+            h = hists[0].Clone(hists[0].GetName() + '_diff')
+            array2hist(diff.sumw, h, errors=np.sqrt(diff.sumw2))
             pass
 
+        result = self._plot1D_with_offset(h, option, offset, **kwargs)
+        self._derive(result, hists, compute, offset)
+        return result
+
+
+    def _plot1D_with_offset (self, h, option, offset=None, **kwargs):
+        """ Plot derived histogram `h`, optionally shifted by `offset` and drawn above a filled baseline. """
+
         # Add offset (opt.)
         if offset is not None:
-            h_offset = h.Clone(h.GetName() + '_offset')
-            for bin in range(1, h.GetXaxis().GetNbins() + 1):
-                h       .SetBinContent(bin, offset + h.GetBinContent(bin))
-                h_offset.SetBinContent(bin, offset)
-                h_offset.SetBinError  (bin, 0)
+            if is_histogram(h):
+                h = h.to_root()
                 pass
+            h_offset = h.Clone(h.GetName() + '_offset')
+            sumw, sumw2 = hist_arrays(h)
+            array2hist(sumw + offset,              h,        errors=np.sqrt(sumw2))
+            array2hist(np.full_like(sumw, offset), h_offset, errors=np.zeros_like(sumw))
             pass
 
         # Plot histogram
         result = self._plot1D(h, option, **kwargs)
         if offset is not None:
             self._plot1D(h_offset, 'HIST', fillcolor=10)
-            self._get_first_primitive().Draw('AXIS SAME')
+            self._draw(self._get_first_primitive(), 'AXIS SAME')
             pass
         return result
 
 
     @update
-    def _plot1D_stack (self, hist, option='', **kwargs):
-        """ ... """
+    def _plot1D_stack (self, hist, option='', cumulative=False, **kwargs):
+        """ ...
+
+        With `cumulative=True` on the first stacked histogram, the stack is
+        drawn from precomputed cumulative sums, cf. 'cumulative_stack', rather
+        than as a ROOT THStack.
+        """
 
         # Manually add to legend entries
         if 'label' in kwargs:
@@ -1094,7 +1507,7 @@ class pad (object):
         hist = self._plot1D(hist, option=option, **kwargs)
         kwargs.pop('display')
 
-        first = self._add_to_stack(hist)
+        first = self._add_to_stack(hist, cumulative=cumulative)
         if first:
             self._plot1D(self._stack, option=option, **kwargs)
             pass
@@ -1102,21 +1515,37 @@ class pad (object):
         return hist
 
 
-    def _add_to_stack (self, hist, option='HIST'):
+    def _add_to_stack (self, hist, option='HIST', cumulative=False):
         """ ... """
 
         first = False
         if self._stack is None:
-            self._stack = ROOT.THStack('stack', "")
+            if cumulative:
+                self._stack = cumulative_stack(unique_name('stack'), "")
+            else:
+                self._stack = ROOT.THStack('stack', "")
+                pass
             first = True
+        elif cumulative != is_cumulative_stack(self._stack):
+            warning("Stacking mode is set by the first stacked histogram; ignoring 'cumulative={}'.".format(cumulative))
             pass
 
-        self._stack.Add(hist.Clone(hist.GetName() + "_stack"), option)
+        clone = hist.Clone(hist.GetName() + "_stack")
+        self._stack.Add(clone, option)
+        self._live[id(hist)] = (hist, [clone], True)
         return first
 
 
-    def _add_to_primitives (self, hist):
-        """ ... """
+    def _add_to_primitives (self, hist, arrays=None):
+        """ ...
+
+        Optionally, the numpy-backed histogram `arrays` from which `hist` was
+        created is stored alongside, and used for range finding.
+        """
+
+        if arrays is not None:
+            self._arrays[id(hist)] = arrays
+            pass
 
         if type(hist).__name__.startswith('TH1'):
             self._primitives.append(hist)#.Clone(hist.GetName() + "_prim"))
@@ -1127,6 +1556,110 @@ class pad (object):
 
 
 
+    def _derive (self, hist, sources, compute, offset=None):
+        """ Register `hist` as derived from `sources`, with contents given by the `histogram` returned by `compute`. """
+        self._derived.append((hist, sources, compute, offset))
+        return
+
+
+    def _set_contents (self, hist, sumw, sumw2, entries=None):
+        """ Set the contents of `hist`, and of all its copies held by the pad, from arrays incl. under- and overflow. """
+        hist, copies, stacked = self._live.get(id(hist), (hist, [], False))
+        for obj in [hist] + copies:
+            array2hist(sumw, obj, errors=np.sqrt(sumw2))
+            if entries is not None:
+                obj.SetEntries(entries)
+                pass
+            pass
+
+        if id(hist) in self._arrays:
+            arrays = self._arrays[id(hist)]
+            if arrays.sumw is not sumw:
+                arrays.sumw [...] = sumw
+                arrays.sumw2[...] = sumw2
+                pass
+            pass
+
+        if stacked:
+            if is_cumulative_stack(self._stack):
+                self._stack.SetComponent(copies[0], sumw, sumw2)
+            else:
+                self._stack.Modified()
+                pass
+            self._changed.add(id(self._stack))
+            pass
+        self._changed.add(id(hist))
+        return
+
+
+    def _update_derived (self, changed):
+        """ Recompute derived histograms with any source in `changed`, adding their own ids to `changed`.
+
+        Graphs, i.e. Poisson errors drawn for a histogram, are updated in place
+        by their `compute` function, after all histograms, since they may be
+        drawn for a derived histogram registered after them.
+        """
+        for hist, sources, compute, offset in sorted(self._derived, key=lambda derived: derived[0].InheritsFrom('TGraph')):
+            if not any(id(source) in changed for source in sources): continue
+            h = compute()
+            if not hist.InheritsFrom('TGraph'):
+                self._set_contents(hist, h.sumw + (offset or 0), h.sumw2)
+                pass
+            changed.add(id(hist))
+            pass
+        return
+
+
+    def _update_oob (self):
+        """ Recompute out-of-bounds markers, if any, from the current contents of their histogram. """
+
+        # Check(s)
+        if self._oob_source is None or id(self._oob_source) not in self._changed: return
+
+        up, down = self._oob_contents()
+        zeros = np.zeros_like(up)
+        self._set_contents(self._oob_up,   up,   zeros)
+        self._set_contents(self._oob_down, down, zeros)
+        return
+
+
+    def _oob_contents (self):
+        """ Return the contents of the upper and lower out-of-bounds marker histograms. """
+        hist = self._oob_source
+        ymin, ymax = self.ylim()
+        contents = self._arrays.get(id(hist), None)
+        contents = (contents if contents is not None else histogram.from_root(hist)).sumw
+
+        offset = 0.1
+        if self._log:
+            lymin, lymax = map(np.log10, (ymin, ymax))
+            ldiff = lymax - lymin
+            ooby_up   = np.power(10, lymax - offset * ldiff)
+            ooby_down = np.power(10, lymin + offset * ldiff)
+        else:
+            diff = ymax - ymin
+            ooby_up   = ymax - offset * diff
+            ooby_down = ymin + offset * diff
+            pass
+
+        return (np.where(contents > ymax, ooby_up,   -9999.),
+                np.where(contents < ymin, ooby_down, -9999.))
+
+
+    def _range_objects (self):
+        """ Return primitives for range finding, using numpy-backed histograms where available. """
+        return [self._poisson[id(p)] if id(p) in self._poisson else self._arrays.get(id(p), p) for p in self._primitives]
+
+
+    def _draw (self, obj, option='', owned=False):
+        """ Draw `obj` on this pad explicitly, rather than on the global gPad. """
+        if is_cumulative_stack(obj):
+            obj.Draw(option, pad=self._pad)
+            return obj
+        return draw_on(self._pad, obj, option, owned=owned)
+
+
+
     # Private cosmetics methods
     # ----------------------------------------------------------------
 
@@ -1157,6 +1690,11 @@ class pad (object):
         # Check(s)
         if len(self._primitives) == 0 or not hasattr(self._pad, 'SetLogy'): return
 
+        # Fill cumulative stack layers (opt.)
+        if is_cumulative_stack(self._stack):
+            self._stack._update()
+            pass
+
         # Set x-axis limits
         if self._xlim:
             self._xaxis().SetRangeUser(*self._xlim)
@@ -1174,13 +1712,13 @@ class pad (object):
             ymin, ymax = inf, -inf
 
             try:
-                ymin = min(filter(lambda y: y is not None, map(get_minimum, self._primitives)))
+                ymin = min(filter(lambda y: y is not None, map(get_minimum, self._range_objects())))
             except ValueError: # only stacked histogram
                 ymin = 0.
                 pass
 
             #ymin_positive = 100. #
-            ymax = max(map(get_maximum, self._primitives))
+            ymax = max(map(get_maximum, self._range_objects()))
             #for hist in self._primitives:
             #    ymax = max(get_maximum(hist), ymax)
             #    pass
@@ -1191,7 +1729,7 @@ class pad (object):
                     if self._ymin:
                         ymin_positive = self._ymin
                     else:
-                        ymin_positive = min(filter(lambda y: y is not None, map(get_minimum_positive, self._primitives)))
+                        ymin_positive = min(filter(lambda y: y is not None, map(get_minimum_positive, self._range_objects())))
                         ymin_positive *= 0.8
                         pass
                     axisrange = (ymin_positive, np.exp((np.log(ymax) - np.log(ymin_positive)) / (1. - self._padding) + np.log(ymin_positive)))
@@ -1202,7 +1740,7 @@ class pad (object):
                 # Set overlay axis limits
                 if is_overlay(self):
                     # self.lim(ymin, ymax)
-                    self.lim(0, ymax, force=False) # @TODO: Fix. Getting ymin == ymax
+                    self._lim(0, ymax, force=False) # @TODO: Fix. Getting ymin == ymax
                     pass
                 pass
             pass
@@ -1240,7 +1778,7 @@ class pad (object):
         """ ..."""
 
         # Check(s)
-        if type(h) == ROOT.THStack: return
+        if is_stack(h): return
 
         # Dispatch style methods
         dispatch = {
@@ -1264,7 +1802,7 @@ class pad (object):
 
         if 'alpha' in kwargs:
             if 'fillcolor' in kwargs:
-                h.SetFillColorAlpha(kwargs['fillcolor'], kwargs['alpha'])
+                h.SetFillColor(get_colour(kwargs['fillcolor'], kwargs['alpha']))
             else:
                 warning("Set 'alpha' without 'fillcolor'.")
                 pass
@@ -1323,7 +1861,7 @@ class pad (object):
         """ ... """
 
         # Check(s)
-        if type(h) == ROOT.THStack: return
+        if is_stack(h): return
 
         option = option.strip().upper()
         if 'P' not in option:
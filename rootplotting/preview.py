@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+
+""" Low-resolution previews of canvases, with an index page linking to deferred full-quality renders."""
+
+# Basic import(s)
+import os
+import cgi
+import contextlib
+
+# Scientific import(s)
+import ROOT
+try:
+    import numpy as np
+    from root_numpy import array2hist
+except:
+    print "ERROR: Scientific python packages were not set up properly."
+    print " $ source snippets/pythonenv.sh"
+    print "or see e.g. [http://rootpy.github.io/root_numpy/start.html]."
+    raise
+
+# Project import(s)
+from rootplotting.tools import *
+from rootplotting import spec
+
+
+# Global definitions
+SCALE      = 0.3 # Thumbnail size, relative to the canvas
+MAX_BINS   = 40  # Maximal number of bins along each axis of 2D histograms in previews
+MAX_POINTS = 500 # Maximal number of points of graphs in previews
+
+
+# Class definition
+class index (object):
+    """
+    HTML index page of preview thumbnails.
+
+    Each thumbnail links to the full-quality output of the plot, which need
+    not exist yet: for canvases created with `record=True`, the plot
+    specification is saved next to the thumbnail, and the full-quality output
+    can be produced when needed using `rootplotting.preview.render`.
+
+    Usage:
+        idx = index('plots/index.html')
+        c = canvas(record=True)
+        ...
+        c.save('plots/myplot.pdf', preview=idx)
+        idx.write()
+    """
+
+    def __init__ (self, path, title='Plots'):
+        """ Constructor. """
+        super(index, self).__init__()
+
+        # Member variables
+        self._path    = path
+        self._title   = title
+        self._entries = list() # (thumbnail path, target path or None, whether target is deferred)
+        return
+
+
+    def add (self, thumbnail, target, deferred=True):
+        """ Add `thumbnail` linking to the full-quality output `target`, or without link if `target` is None. """
+        self._entries.append((thumbnail, target, deferred))
+        return
+
+
+    def write (self):
+        """ Write the index page. """
+        base = os.path.dirname(os.path.abspath(self._path))
+        lines = ['<!DOCTYPE html>',
+                 '<html><head><meta charset="utf-8"><title>{0}</title></head><body>'.format(cgi.escape(self._title)),
+                 '<h1>{0}</h1>'.format(cgi.escape(self._title))]
+        for thumbnail, target, deferred in self._entries:
+            thumbnail = os.path.relpath(os.path.abspath(thumbnail), base)
+            if target is None:
+                lines.append('<img src="{0}" alt="{0}" style="margin:4px">'.format(cgi.escape(thumbnail, True)))
+                continue
+            target    = os.path.relpath(os.path.abspath(target),    base)
+            note = ' title="Render using rootplotting.preview.render(\'{0}\')"'.format(cgi.escape(target)) if deferred else ''
+            lines.append('<a href="{0}"{2}><img src="{1}" alt="{0}" style="margin:4px"></a>'.format(cgi.escape(target, True), cgi.escape(thumbnail, True), note))
+            pass
+        lines.append('</body></html>')
+
+        with open(self._path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+            pass
+        return
+
+    pass
+
+
+
+# Public function(s)
+# --------------------------------------------------------------------
+
+def paths (path):
+    """ Return the thumbnail- and plot specification paths for output `path`. """
+    stem = os.path.splitext(path)[0]
+    return stem + '.thumb.png', stem + '.spec.json.gz'
+
+
+def render (path, backend='root'):
+    """ Produce the deferred full-quality output `path`, from the plot specification saved with its preview. """
+    _, spec_path = paths(path)
+    assert os.path.isfile(spec_path), "No plot specification found for '{}'.".format(path)
+    return spec.replay(spec_path, path=path, backend=backend)
+
+
+@contextlib.contextmanager
+def reduced_detail (c, max_bins=MAX_BINS, max_points=MAX_POINTS):
+    """ Temporarily replace dense primitives on all pads of canvas `c` by coarser versions.
+
+    2D histograms are rebinned to at most `max_bins` bins along each axis, and
+    graphs are thinned to at most `max_points` points. The original primitives
+    are restored on exit.
+    """
+    swapped = list()
+    try:
+        for p in c._created_pads():
+            link = p._bare().GetListOfPrimitives().FirstLink()
+            while link:
+                coarse = _coarse(link.GetObject(), max_bins, max_points)
+                if coarse is not None:
+                    swapped.append((link, link.GetObject(), coarse))
+                    link.SetObject(coarse)
+                    pass
+                link = link.Next()
+                pass
+            pass
+        yield
+    finally:
+        for link, original, _ in swapped:
+            link.SetObject(original)
+            pass
+        pass
+
+
+@contextlib.contextmanager
+def scaled_text (c, scale):
+    """ Temporarily scale all text sizes given in pixels on canvas `c` by `scale`.
+
+    Text sizes of fonts with precision 3 are absolute, and would otherwise
+    overflow a down-scaled canvas. This includes text, legends, and the labels
+    and titles of axes. The original sizes are restored on exit.
+    """
+    scaled, seen = list(), set()
+    try:
+        for p in c._created_pads():
+            for primitive in p._bare().GetListOfPrimitives():
+                # Primitives drawn more than once, e.g. to redraw axes, are scaled once
+                address = ROOT.AddressOf(primitive)[0]
+                if address in seen: continue
+                seen.add(address)
+                for font, size, setter in _text_attributes(primitive):
+                    if font % 10 == 3:
+                        scaled.append((setter, size))
+                        setter(size * scale)
+                        pass
+                    pass
+                pass
+            pass
+        yield
+    finally:
+        for setter, size in reversed(scaled):
+            setter(size)
+            pass
+        pass
+
+
+
+# Private helper function(s)
+# --------------------------------------------------------------------
+
+def _coarse (obj, max_bins, max_points):
+    """ Return a coarser copy of `obj`, or None if `obj` is not dense. """
+
+    if obj.InheritsFrom('TH2'):
+        nx, ny = _group_size(obj.GetNbinsX(), max_bins), _group_size(obj.GetNbinsY(), max_bins)
+        if nx == 1 and ny == 1: return None
+        name = unique_name(obj.GetName() + '_preview')
+        if obj.GetNbinsX() % nx == 0 and obj.GetNbinsY() % ny == 0:
+            coarse = obj.Rebin2D(nx, ny, name)
+        else:
+            coarse = _merged(obj, nx, ny, name)
+            pass
+        coarse.SetDirectory(0)
+        return coarse
+
+    elif obj.InheritsFrom('TGraph') and obj.GetN() > max_points:
+        N = obj.GetN()
+        idx = np.arange(0, N, int(np.ceil(N / float(max_points))))
+        x = np.frombuffer(obj.GetX(), dtype=np.float64, count=N)[idx].copy()
+        y = np.frombuffer(obj.GetY(), dtype=np.float64, count=N)[idx].copy()
+        coarse = ROOT.TGraph(len(idx), x, y)
+        for att in [ROOT.TAttLine, ROOT.TAttFill, ROOT.TAttMarker]:
+            att.Copy(obj, coarse)
+            pass
+        coarse.SetName(unique_name(obj.GetName() + '_preview'))
+
+        # Keep axis titles, styles, and ranges, in case the graph defines the axes
+        frame, coarse_frame = obj.GetHistogram(), coarse.GetHistogram()
+        for axis, coarse_axis in [(frame.GetXaxis(), coarse_frame.GetXaxis()), (frame.GetYaxis(), coarse_frame.GetYaxis())]:
+            ROOT.TAttAxis.Copy(axis, coarse_axis)
+            coarse_axis.SetTitle(axis.GetTitle())
+            coarse_axis.SetLimits(axis.GetXmin(), axis.GetXmax())
+            coarse_axis.SetRangeUser(axis.GetBinLowEdge(axis.GetFirst()), axis.GetBinUpEdge(axis.GetLast()))
+            pass
+        coarse.SetMinimum(frame.GetMinimum())
+        coarse.SetMaximum(frame.GetMaximum())
+        return coarse
+
+    return None
+
+
+def _text_attributes (obj):
+    """ Return (font, size, size setter) for each text attribute of `obj` and of its axes and legend entries. """
+    attributes = list()
+    if obj.InheritsFrom('TGaxis'):
+        attributes.append((obj.GetLabelFont(), obj.GetLabelSize(), obj.SetLabelSize))
+        attributes.append((obj.GetTextFont(),  obj.GetTitleSize(), obj.SetTitleSize))
+        return attributes
+
+    if obj.InheritsFrom('TAttText'):
+        attributes.append((obj.GetTextFont(), obj.GetTextSize(), obj.SetTextSize))
+        pass
+
+    if obj.InheritsFrom('TLegend'):
+        for entry in obj.GetListOfPrimitives():
+            # Entries with size zero use the size of the legend
+            if entry.GetTextSize() > 0:
+                attributes.append((entry.GetTextFont() or obj.GetTextFont(), entry.GetTextSize(), entry.SetTextSize))
+                pass
+            pass
+        pass
+
+    # Axes of histograms, and of the frames of stacks and graphs
+    frame = None
+    if obj.InheritsFrom('TH1'):
+        frame = obj
+    elif obj.InheritsFrom('THStack') or obj.InheritsFrom('TGraph'):
+        frame = obj.GetHistogram()
+        pass
+    if frame:
+        for axis in [frame.GetXaxis(), frame.GetYaxis(), frame.GetZaxis()]:
+            attributes.append((axis.GetLabelFont(), axis.GetLabelSize(), axis.SetLabelSize))
+            attributes.append((axis.GetTitleFont(), axis.GetTitleSize(), axis.SetTitleSize))
+            pass
+        pass
+    return attributes
+
+
+def _group_size (nbins, max_bins):
+    """ Return the number of consecutive bins to merge such that at most `max_bins` bins remain.
+
+    A divisor of `nbins` is preferred, provided that it keeps at least about
+    half of `max_bins` bins; otherwise, e.g. for prime `nbins`, the smallest
+    group size is used, and the remainder is merged into the last bin.
+    """
+    size = int(np.ceil(nbins / float(max_bins)))
+    for n in range(size, 2 * size + 1):
+        if nbins % n == 0:
+            return n
+        pass
+    return size
+
+
+def _merged (hist, nx, ny, name):
+    """ Return a copy of the 2D histogram `hist` with groups of `nx` by `ny` bins merged, the remainders merged into the last bins. """
+    sumw, sumw2 = hist_arrays(hist)
+    args = [name, hist.GetTitle()]
+    for axis, (n, ax) in enumerate([(nx, hist.GetXaxis()), (ny, hist.GetYaxis())]):
+        edges = axis_edges(ax)
+        starts = np.arange((len(edges) - 1) // n) * n
+        # Under- and overflow are kept as separate bins
+        cells = np.concatenate(([0], starts + 1, [len(edges)]))
+        sumw  = np.add.reduceat(sumw,  cells, axis=axis)
+        sumw2 = np.add.reduceat(sumw2, cells, axis=axis)
+        args += [len(starts), np.append(edges[starts], edges[-1])]
+        pass
+
+    coarse = getattr(ROOT, hist.ClassName())(*args)
+    array2hist(sumw, coarse, errors=np.sqrt(sumw2))
+    coarse.SetEntries(hist.GetEntries())
+    for att in [ROOT.TAttLine, ROOT.TAttFill, ROOT.TAttMarker]:
+        att.Copy(hist, coarse)
+        pass
+    for axis, coarse_axis in zip([hist.GetXaxis(), hist.GetYaxis(), hist.GetZaxis()], [coarse.GetXaxis(), coarse.GetYaxis(), coarse.GetZaxis()]):
+        ROOT.TAttAxis.Copy(axis, coarse_axis)
+        coarse_axis.SetTitle(axis.GetTitle())
+        if axis.TestBit(ROOT.TAxis.kAxisRange):
+            coarse_axis.SetRangeUser(axis.GetBinLowEdge(axis.GetFirst()), axis.GetBinUpEdge(axis.GetLast()))
+            pass
+        pass
+    coarse.SetMinimum(hist.GetMinimumStored())
+    coarse.SetMaximum(hist.GetMaximumStored())
+    return coarse
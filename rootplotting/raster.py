@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+
+""" Rasterisation of selected, dense layers in otherwise vector output."""
+
+# Basic import(s)
+import os
+import time
+import contextlib
+
+# Scientific import(s)
+import ROOT
+
+# Project import(s)
+from rootplotting.tools import *
+
+
+# Global definitions
+DPI = 150 # Default resolution of rasterised layers
+
+# Output formats for which layers are rasterised
+VECTOR_FORMATS = ['.pdf', '.eps', '.ps', '.svg']
+
+
+@contextlib.contextmanager
+def rasterized (c, path, enabled=True):
+    """ Temporarily replace the layers marked for rasterisation on all pads of canvas `c` by images.
+
+    Each such layer is painted on its own off-screen canvas, at the requested
+    resolution, cropped to the frame of its pad, and drawn as an image on a
+    transparent sub-pad covering the frame, in place of the original layer.
+    Axes, and the palette of 2D histograms, are drawn on top as vectors. Does
+    nothing unless `path` is a vector format.
+    """
+
+    # Check(s)
+    if not enabled or os.path.splitext(path)[1].lower() not in VECTOR_FORMATS:
+        yield
+        return
+
+    restore = list()
+    try:
+        for p in c._created_pads():
+            for layer, dpi in getattr(p, '_rasterized', []):
+                restore.append(_rasterize(p, layer, dpi))
+                pass
+            pass
+        yield
+    finally:
+        for func in reversed(restore):
+            func()
+            pass
+        pass
+
+
+def report (c, path):
+    """ Save canvas `c` to `path` with and without rasterisation, and report file sizes and write times.
+
+    The output without rasterisation is written next to `path`, with '.vector'
+    added to the file name. Returns a dictionary of (size in bytes, time in
+    seconds) for 'vector' and 'rasterised' output.
+    """
+    stem, ext = os.path.splitext(path)
+    results = dict()
+    for key, output, enabled in [('vector', stem + '.vector' + ext, False), ('rasterised', path, True)]:
+        start = time.time()
+        with render_lock:
+            c._update()
+            with rasterized(c, output, enabled):
+                c._bare().SaveAs(output)
+                pass
+            pass
+        results[key] = (os.path.getsize(output), time.time() - start)
+        pass
+
+    for key in ['vector', 'rasterised']:
+        print "{:<11s} {:>10.1f} kB  {:>7.2f} s".format(key + ':', results[key][0] / 1024., results[key][1])
+        pass
+    return results
+
+
+
+# Private helper function(s)
+# --------------------------------------------------------------------
+
+def _rasterize (p, layer, dpi):
+    """ Replace `layer` on pad `p` by an image, returning a function which restores the pad. """
+
+    tpad = p._bare()
+    primitives = tpad.GetListOfPrimitives()
+    link = primitives.FindLink(layer)
+    if not link:
+        warning("rasterized: Layer {} is not drawn. Skipping.".format(layer.GetName()))
+        return lambda: None
+    option = link.GetOption()
+
+    # Paint layer alone, with the pad's coordinate system, on an off-screen canvas
+    scale = dpi / 72.
+    W = int(tpad.GetWw() * tpad.GetAbsWNDC() * scale)
+    H = int(tpad.GetWh() * tpad.GetAbsHNDC() * scale)
+    l, r, b, t = tpad.GetLeftMargin(), tpad.GetRightMargin(), tpad.GetBottomMargin(), tpad.GetTopMargin()
+    with render_lock:
+        offscreen = ROOT.TCanvas(unique_name('c_raster'), "", W, H)
+        offscreen.SetMargin(l, r, b, t)
+        offscreen.SetLogx(tpad.GetLogx())
+        offscreen.SetLogy(tpad.GetLogy())
+        offscreen.SetLogz(tpad.GetLogz())
+        offscreen.Range(tpad.GetX1(), tpad.GetY1(), tpad.GetX2(), tpad.GetY2())
+        offscreen.SetFrameLineColor(0)
+        draw_on(offscreen, layer, _layer_option(option))
+        offscreen.Modified()
+        offscreen.Update()
+
+        image = ROOT.TImage.Create()
+        image.FromPad(offscreen)
+        image.Crop(int(l * W), int(t * H), int((1 - l - r) * W), int((1 - b - t) * H))
+        image.SetConstRatio(False)
+        offscreen.Close()
+        pass
+
+    # Transparent sub-pad covering the frame; the pad's mother is taken from gPad
+    with render_lock:
+        previous = ROOT.TVirtualPad.Pad()
+        tpad.cd()
+        sub = ROOT.TPad(unique_name('pad_raster'), "", l, b, 1 - r, 1 - t)
+        if previous:
+            previous.cd()
+            pass
+        pass
+    sub.SetMargin(0, 0, 0, 0)
+    sub.SetFillStyle(4000)
+    sub.SetBorderMode(0)
+    draw_on(sub, image)
+
+    # Hide original layer; the first primitive still defines the axes. For
+    # graphs, the frame histogram is drawn instead, as painting a graph with
+    # option 'A' alone still draws its markers as vectors. Once the pad has
+    # been painted, a TFrame precedes all other primitives.
+    first = p._get_first_primitive() == layer
+    palette = layer.GetListOfFunctions().FindObject('palette') if layer.InheritsFrom('TH1') else None
+    placeholder = ROOT.TNamed(layer.GetName() + '_hidden', "")
+    frame = layer if layer.InheritsFrom('TH1') else layer.GetHistogram()
+    if first:
+        link.SetObject(frame)
+        link.SetOption('AXIS')
+    else:
+        link.SetObject(placeholder)
+        pass
+
+    # Insert image, and vector axes and palette, directly after the layer
+    tail = list()
+    while primitives.LastLink() != link:
+        last = primitives.LastLink()
+        tail.append((last.GetObject(), last.GetOption()))
+        primitives.Remove(last)
+        pass
+    added = [sub]
+    primitives.Add(sub)
+    if first:
+        primitives.Add(frame, 'AXIS SAME')
+        added.append(primitives.LastLink())
+        pass
+    if palette:
+        primitives.Add(palette)
+        added.append(palette)
+        pass
+    for obj, opt in reversed(tail):
+        primitives.Add(obj, opt)
+        pass
+    tpad.Modified()
+
+    def restore ():
+        """ Remove image, axes, and palette, and show the original layer again. """
+        for obj in added:
+            primitives.Remove(obj)
+            pass
+        link.SetObject(layer)
+        link.SetOption(option)
+        tpad.Modified()
+        return
+
+    # Keep references until the pad is restored
+    restore.objects = (image, sub, placeholder)
+    return restore
+
+
+def _layer_option (option):
+    """ Return the draw option for painting a layer on its own, without axes. """
+    option = option.upper().replace('SAME', '').replace('Z', '').strip()
+    if 'A' in option and 'AXIS' not in option:
+        # Graphs: 'A' would draw a new frame
+        option = option.replace('A', '')
+        pass
+    return option + ' SAME'
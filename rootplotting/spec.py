@@ -0,0 +1,414 @@
+# -*- coding: utf-8 -*-
+
+""" Recording of canvas and pad calls into serialisable plot specifications, and replay thereof."""
+
+# Basic import(s)
+import gzip
+import json
+import base64
+
+# Scientific import(s)
+import ROOT
+try:
+    import numpy as np
+    from root_numpy import array2hist
+except:
+    print "ERROR: Scientific python packages were not set up properly."
+    print " $ source snippets/pythonenv.sh"
+    print "or see e.g. [http://rootpy.github.io/root_numpy/start.html]."
+    raise
+
+# Project import(s)
+from rootplotting.tools import *
+from rootplotting.histogram import histogram, variations
+
+# Global definitions
+FORMAT_VERSION = 1
+
+# Plotting methods for which raw numpy inputs are recorded as filled histograms
+_FILLED_METHODS = ['plot', 'hist', 'stack', 'ratio_plot', 'diff_plot', 'significance']
+
+# Style attributes of ROOT histograms and graphs restored on replay, through Get<attribute>/Set<attribute>
+_STYLE_ATTRIBUTES = ['LineColor', 'LineStyle', 'LineWidth', 'FillColor', 'FillStyle', 'MarkerColor', 'MarkerStyle', 'MarkerSize']
+
+
+# Class definition
+class recorder (object):
+    """
+    Records the calls made on a canvas and its pads into a plot specification.
+
+    The specification is a plain dictionary holding the canvas constructor
+    arguments and the ordered list of calls, each with its target (the
+    canvas, a pad index, or the creation of an overlay), method name, and
+    arguments. ROOT histograms and graphs, as well as numpy inputs that are
+    histogrammed, are stored as arrays rather than as raw inputs; for ROOT
+    objects, together with their class, style, and axis titles, such that the
+    same objects are drawn on replay. Plots derived from per-entry inputs,
+    i.e. `band`, `roc`, `cumulative`, `efficiency`, `profile`, and
+    `significance`, are not recorded themselves; instead, the curve or points
+    they draw are recorded as a `graph` call, such that neither the size of
+    the specification nor its fingerprint scales with the number of entries.
+    On the matplotlib backend, where the secondary axis of `significance` is
+    not a pad, `significance` itself is recorded, with the signal and
+    background inputs replaced by their filled histograms.
+    """
+
+    def __init__ (self, **canvas_kwargs):
+        """ Constructor. """
+        super(recorder, self).__init__()
+
+        # Member variables
+        self.calls = list()
+        self.depth = 0 # Nesting level of recorded calls; only top-level calls are recorded
+        self._canvas_kwargs = canvas_kwargs
+        return
+
+
+    def spec (self):
+        """ Return the plot specification as a dictionary. """
+        import rootplotting
+        return {'format':  FORMAT_VERSION,
+                'version': getattr(rootplotting, '__version__', None),
+                'canvas':  dict(self._canvas_kwargs),
+                'calls':   list(self.calls)}
+
+
+    def add (self, obj, method, args, kwargs):
+        """ Record call to `method` on `obj`, a canvas or pad.
+
+        Returns the arguments to use for the actual call, in which raw numpy
+        inputs have been replaced by the histogram recorded in their stead.
+        """
+
+        # Accessors are not recorded
+        if method in ['xlim', 'ylim'] and len(args) == 0:
+            return args, kwargs
+
+        # Raw inputs are kept for bootstrapping
+        if method in _FILLED_METHODS and len(args) > 0 and 'bins' in kwargs and not kwargs.get('bootstrap', None):
+            args, kwargs = _fill_inputs(method, args, kwargs)
+            pass
+
+        self.calls.append({'target': _target(obj),
+                           'method': method,
+                           'args':   map(_canonical, args),
+                           'kwargs': {key: _canonical(value) for key, value in kwargs.items()}})
+        return args, kwargs
+
+
+    def add_overlay (self, base, **kwargs):
+        """ Record the creation of an overlay on pad `base`. """
+        self.calls.append({'target': 'overlay',
+                           'method': 'overlay',
+                           'args':   [_target(base)],
+                           'kwargs': {key: _canonical(value) for key, value in kwargs.items()}})
+        return
+
+    pass
+
+
+
+# Decorators
+# --------------------------------------------------------------------
+
+def recorded (func):
+    """ Record calls to the decorated canvas/pad method, if the owning canvas is recording. """
+    def wrapper (self, *args, **kwargs):
+        rec = get_recorder(self)
+        if rec is None or rec.depth > 0:
+            return func(self, *args, **kwargs)
+
+        args, kwargs = rec.add(self, func.__name__, args, kwargs)
+        rec.depth += 1
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            rec.depth -= 1
+            pass
+    wrapper.__name__ = func.__name__
+    wrapper.__doc__  = func.__doc__
+    return wrapper
+
+
+def get_recorder (obj):
+    """ Return the recorder of the canvas owning `obj`, if any. """
+    while not is_canvas(obj):
+        obj = obj._base
+        pass
+    return getattr(obj, '_recorder', None)
+
+
+
+# Serialisation
+# --------------------------------------------------------------------
+
+def dump (spec, path):
+    """ Write plot specification to a JSON file, gzipped if `path` ends in '.gz'. """
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'wb') as f:
+        json.dump(encode(spec), f, separators=(',', ':'))
+        pass
+    return
+
+
+def load (path):
+    """ Read plot specification written by `dump`. """
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        return decode(json.load(f))
+
+
+def encode (value, array=None):
+    """ Convert a plot specification, or any part of it, to a JSON-compatible structure.
+
+    Arrays are stored as base64-encoded bytes or, if given, converted using
+    the function `array`, e.g. to a digest of their contents.
+    """
+    if isinstance(value, histogram):
+        return {'__histogram__': {'edges': [encode(e, array) for e in value.edges],
+                                  'sumw':  encode(value.sumw, array),
+                                  'sumw2': encode(value.sumw2, array)}}
+    elif isinstance(value, variations):
+        return {'__variations__': {'edges': [encode(e, array) for e in value.edges],
+                                   'sumw':  encode(value.sumw, array),
+                                   'sumw2': encode(value.sumw2, array),
+                                   'names': value.names}}
+    elif isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        if array is not None:
+            return array(value)
+        return {'__array__': {'dtype': value.dtype.str,
+                              'shape': list(value.shape),
+                              'data':  base64.b64encode(value.tobytes())}}
+    elif isinstance(value, np.generic):
+        return value.item()
+    elif isinstance(value, tuple):
+        return {'__tuple__': [encode(val, array) for val in value]}
+    elif isinstance(value, list):
+        return [encode(val, array) for val in value]
+    elif isinstance(value, dict):
+        return {key: encode(val, array) for key, val in value.items()}
+    return value
+
+
+def decode (value):
+    """ Inverse of `encode`. """
+    if isinstance(value, dict):
+        if '__array__' in value:
+            a = value['__array__']
+            return np.frombuffer(base64.b64decode(a['data']), dtype=np.dtype(str(a['dtype']))).reshape(a['shape']).copy()
+        elif '__histogram__' in value:
+            h = value['__histogram__']
+            edges = tuple(map(decode, h['edges']))
+            return histogram(edges if len(edges) > 1 else edges[0], decode(h['sumw']), decode(h['sumw2']))
+        elif '__variations__' in value:
+            v = value['__variations__']
+            edges = tuple(map(decode, v['edges']))
+            sumw = decode(v['sumw'])
+            result = variations(edges if len(edges) > 1 else edges[0], sumw.shape[0], names=decode(v['names']))
+            result.sumw, result.sumw2 = sumw, decode(v['sumw2'])
+            return result
+        elif '__tuple__' in value:
+            return tuple(map(decode, value['__tuple__']))
+        return {str(key): decode(val) for key, val in value.items()}
+    elif isinstance(value, list):
+        return map(decode, value)
+    elif isinstance(value, unicode):
+        return str(value)
+    return value
+
+
+
+# Replay
+# --------------------------------------------------------------------
+
+def replay (spec, path=None, batch=True, backend='root'):
+    """ Rebuild the canvas described by `spec` (a dictionary or a file path), and optionally save it to `path`.
+
+    The same specification can be rendered through any of the canvas backends.
+    """
+    from rootplotting import canvas, overlay
+
+    # Check(s)
+    if isinstance(spec, basestring):
+        spec = load(spec)
+        pass
+    if spec.get('format', FORMAT_VERSION) != FORMAT_VERSION:
+        warning("replay: Specification format {} differs from {}.".format(spec.get('format'), FORMAT_VERSION))
+        pass
+
+    c = canvas(batch=batch, backend=backend, **spec['canvas'])
+    for call in spec['calls']:
+        args   = map(_restore, call['args'])
+        kwargs = {key: _restore(value) for key, value in call['kwargs'].items()}
+        if call['target'] == 'overlay':
+            overlay(c.pad(args[0]), **kwargs)
+            continue
+        obj = c if call['target'] == 'canvas' else c.pad(call['target'])
+        getattr(obj, call['method'])(*args, **kwargs)
+        pass
+
+    if path is not None:
+        c.save(path)
+        pass
+    return c
+
+
+
+# Private helper function(s)
+# --------------------------------------------------------------------
+
+def _target (obj):
+    """ Return the recorded target of a call on `obj`: 'canvas' or the pad index. """
+    if is_canvas(obj):
+        return 'canvas'
+    c = obj._base
+    while not is_canvas(c):
+        c = c._base
+        pass
+    return c._pads.index(obj)
+
+
+def _fill_inputs (method, args, kwargs):
+    """ Replace raw numpy inputs to be histogrammed by the filled histograms. """
+
+    data, bins = args[0], kwargs['bins']
+    weights = kwargs.get('weights', None)
+    if method in ['ratio_plot', 'diff_plot']:
+        # Ratio/difference of two arrays
+        if not all(map(_is_raw, data)): return args, kwargs
+        weights = weights or (None, None)
+        data = tuple(histogram(bins).fill(d, weights=w) for d, w in zip(data, weights))
+    elif method == 'significance':
+        # Signal and background arrays, as separate arguments
+        if len(args) < 2 or not all(_is_raw(d) and len(d) != len(bins) - 1 for d in args[:2]): return args, kwargs
+        weights = weights or (None, None)
+        kwargs = {key: value for key, value in kwargs.items() if key not in ['bins', 'weights']}
+        return tuple(histogram(bins).fill(d, weights=w) for d, w in zip(args[:2], weights)) + tuple(args[2:]), kwargs
+    elif _is_raw(data) and len(data) not in [len(bins), len(bins) - 1]:
+        data = histogram(bins).fill(data, weights=weights)
+    else:
+        return args, kwargs
+
+    kwargs = {key: value for key, value in kwargs.items() if key not in ['bins', 'weights']}
+    return (data,) + tuple(args[1:]), kwargs
+
+
+def _is_raw (data):
+    """ Whether `data` is a numpy array or list of values. """
+    return type(data).__module__.startswith(np.__name__) or type(data) == list
+
+
+def _canonical (value):
+    """ Convert ROOT inputs to arrays, leaving other values as they are. """
+    if isinstance(value, (list, tuple)):
+        return type(value)(map(_canonical, value))
+    if not hasattr(value, 'InheritsFrom'):
+        return value
+    if value.InheritsFrom('TGraph'):
+        N = value.GetN()
+        graph = {'type': type(value).__name__,
+                 'x':    np.frombuffer(value.GetX(), dtype=np.float64, count=N).copy(),
+                 'y':    np.frombuffer(value.GetY(), dtype=np.float64, count=N).copy()}
+        if value.InheritsFrom('TGraphAsymmErrors'):
+            for key, getter in [('exl', value.GetEXlow), ('exh', value.GetEXhigh), ('eyl', value.GetEYlow), ('eyh', value.GetEYhigh)]:
+                graph[key] = np.frombuffer(getter(), dtype=np.float64, count=N).copy()
+                pass
+        elif value.InheritsFrom('TGraphErrors'):
+            for key, getter in [('ex', value.GetEX), ('ey', value.GetEY)]:
+                graph[key] = np.frombuffer(getter(), dtype=np.float64, count=N).copy()
+                pass
+            pass
+        graph['style'] = _style(value)
+        return {'__graph__': graph}
+    if value.InheritsFrom('TH1'):
+        hist = {'type':    value.ClassName(),
+                'title':   value.GetTitle(),
+                'axes':    [axis.GetTitle() for axis in [value.GetXaxis(), value.GetYaxis(), value.GetZaxis()]],
+                'entries': value.GetEntries(),
+                'style':   _style(value)}
+        if value.InheritsFrom('TProfile'):
+            # Internal sums, from which the profile's means and errors are computed
+            N = value.GetNbinsX() + 2
+            hist['edges']   = axis_edges(value.GetXaxis())
+            hist['profile'] = {'sumwy':  np.frombuffer(value.GetArray(),          dtype=np.float64, count=N).copy(),
+                               'sumwy2': np.frombuffer(value.GetSumw2().GetArray(), dtype=np.float64, count=N).copy(),
+                               'sumw':   np.array(map(value.GetBinEntries, range(N)), dtype=np.float64),
+                               'sumw2':  np.frombuffer(value.GetBinSumw2().GetArray(), dtype=np.float64, count=N).copy() if value.GetBinSumw2().GetSize() > 0 else None,
+                               'error_option': value.GetErrorOption()}
+        else:
+            hist['histogram'] = histogram.from_root(value)
+            pass
+        return {'__hist__': hist}
+    warning("recorder: Cannot record object of type {}; storing None.".format(type(value).__name__))
+    return None
+
+
+def _restore (value):
+    """ Inverse of `_canonical`, creating ROOT histograms and graphs from recorded arrays. """
+    if isinstance(value, (list, tuple)):
+        return type(value)(map(_restore, value))
+    if isinstance(value, dict) and '__graph__' in value:
+        g = value['__graph__']
+        N = len(g['x'])
+        if g['type'] == 'TGraphAsymmErrors':
+            graph = ROOT.TGraphAsymmErrors(N, g['x'], g['y'], g['exl'], g['exh'], g['eyl'], g['eyh'])
+        elif g['type'] == 'TGraphErrors':
+            graph = ROOT.TGraphErrors(N, g['x'], g['y'], g['ex'], g['ey'])
+        else:
+            graph = ROOT.TGraph(N, g['x'], g['y'])
+            pass
+        _set_style(graph, g.get('style', {}))
+        return graph
+    if isinstance(value, dict) and '__hist__' in value:
+        return _restore_hist(value['__hist__'])
+    return value
+
+
+def _restore_hist (h):
+    """ Create the ROOT histogram or profile recorded by `_canonical`. """
+    name = unique_name('h')
+    if 'profile' in h:
+        p, edges = h['profile'], h['edges']
+        hist = getattr(ROOT, h['type'])(name, h['title'], len(edges) - 1, edges)
+        if p['sumw2'] is not None:
+            hist.Sumw2()
+            pass
+        for i in range(len(edges) + 1):
+            hist.SetBinContent(i, p['sumwy'][i])
+            hist.SetBinEntries(i, p['sumw'][i])
+            hist.GetSumw2().SetAt(p['sumwy2'][i], i)
+            if p['sumw2'] is not None:
+                hist.GetBinSumw2().SetAt(p['sumw2'][i], i)
+                pass
+            pass
+        hist.SetErrorOption(p['error_option'])
+    else:
+        arrays = h['histogram']
+        args = [name, h['title']]
+        for edges in arrays.edges:
+            args += [len(edges) - 1, edges]
+            pass
+        hist = getattr(ROOT, h['type'])(*args)
+        array2hist(arrays.sumw, hist, errors=np.sqrt(arrays.sumw2))
+        pass
+    hist.SetDirectory(0)
+    hist.SetEntries(h['entries'])
+    for axis, title in zip([hist.GetXaxis(), hist.GetYaxis(), hist.GetZaxis()], h['axes']):
+        axis.SetTitle(title)
+        pass
+    _set_style(hist, h['style'])
+    return hist
+
+
+def _style (obj):
+    """ Return the style attributes of ROOT object `obj`. """
+    return {attr: getattr(obj, 'Get' + attr)() for attr in _STYLE_ATTRIBUTES}
+
+
+def _set_style (obj, style):
+    """ Apply style attributes, as returned by `_style`, to ROOT object `obj`. """
+    for attr, value in style.items():
+        getattr(obj, 'Set' + attr)(value)
+        pass
+    return
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+
+""" Stack of histograms drawn from precomputed cumulative sums."""
+
+# Scientific import(s)
+import ROOT
+try:
+    import numpy as np
+    from root_numpy import array2hist
+except:
+    print "ERROR: Scientific python packages were not set up properly."
+    print " $ source snippets/pythonenv.sh"
+    print "or see e.g. [http://rootpy.github.io/root_numpy/start.html]."
+    raise
+
+# Project import(s)
+from rootplotting.tools import *
+
+
+# Class definition
+class cumulative_stack (object):
+    """
+    Drop-in replacement for the parts of ROOT.THStack used by 'pad'.
+
+    Instead of letting THStack recompute cumulative sums each time it is
+    painted, the bin contents of all components are kept as arrays and the
+    cumulative histograms are computed once, with a single prefix sum over the
+    components. These are drawn back-to-front as ordinary histograms, i.e. one
+    layer per component, with the total drawn first.
+    """
+
+    def __init__ (self, name, title=""):
+        """ Constructor. """
+        super(cumulative_stack, self).__init__()
+
+        # Member variables
+        self._name   = name
+        self._title  = title
+        self._hists  = list() # Components, in the order they were added
+        self._sumw   = list() # Component bin contents, incl. under- and overflow
+        self._sumw2  = list() # Component sums of squared weights, ...
+        self._layers = list() # Drawn cumulative histograms, back-to-front
+        self._pad    = None
+        self._option = ''
+        self._cumsum = None   # Cached (cumulative sumw, cumulative sumw2)
+        self._dirty  = False  # Whether the drawn layers are out of date
+        return
+
+
+
+    # Public THStack-like methods
+    # ----------------------------------------------------------------
+
+    def Add (self, hist, option=''):
+        """ Add component histogram to the stack. """
+
+        sumw, sumw2 = hist_arrays(hist)
+        self._hists.append(hist)
+        self._sumw .append(sumw)
+        self._sumw2.append(sumw2)
+        self._cumsum = None
+        self._dirty  = True
+
+        # Add a layer for the new component, if the stack is already drawn
+        if self._pad is not None:
+            self._add_layer()
+            pass
+        return
+
+
+    def Draw (self, option='', pad=None):
+        """ Draw the stack on `pad`, by default the current pad. """
+
+        # Check(s)
+        if self._pad is not None:
+            warning("cumulative_stack: Stack has already been drawn.")
+            return
+
+        self._pad    = pad or ROOT.gPad
+        self._option = option
+        for _ in self._hists:
+            self._add_layer()
+            pass
+        self._update()
+        return
+
+
+    def SetComponent (self, hist, sumw, sumw2):
+        """ Set the contents of component `hist`, updating the cumulative sums in place. """
+        idx = map(id, self._hists).index(id(hist))
+        if self._cumsum is not None:
+            self._cumsum[0][idx:] += sumw  - self._sumw [idx]
+            self._cumsum[1][idx:] += sumw2 - self._sumw2[idx]
+            pass
+        self._sumw [idx] = np.array(sumw,  dtype=np.float64)
+        self._sumw2[idx] = np.array(sumw2, dtype=np.float64)
+        self._dirty = True
+        return
+
+
+    def GetName (self):
+        """ ... """
+        return self._name
+
+
+    def GetHists (self):
+        """ ... """
+        return list(self._hists)
+
+
+    def GetNhists (self):
+        """ ... """
+        return len(self._hists)
+
+
+    def GetStack (self):
+        """ Return the list of cumulative histograms, from the bottom up, as THStack does. """
+        self._update()
+        return list(reversed(self._layers))
+
+
+    def GetSum (self, name='sumHisto'):
+        """ Return a new histogram with the sum of all components. """
+        sumw, sumw2 = self._cumulative()
+        h = self._hists[0].Clone(name)
+        h.SetDirectory(0)
+        array2hist(sumw[-1], h, errors=np.sqrt(sumw2[-1]))
+        return h
+
+
+    def SetMinimum (self, minimum):
+        """ ... """
+        if self._layers:
+            self._layers[0].SetMinimum(minimum)
+            pass
+        return
+
+
+    def SetMaximum (self, maximum):
+        """ ... """
+        if self._layers:
+            self._layers[0].SetMaximum(maximum)
+            pass
+        return
+
+
+
+    # Public range-finding methods
+    # ----------------------------------------------------------------
+
+    def maximum (self):
+        """ Return the maximum bin content of the summed stack. """
+        return self._cumulative()[0][-1][1:-1].max()
+
+
+    def minimum (self):
+        """ Return the minimum bin content of the summed stack. """
+        return self._cumulative()[0][-1][1:-1].min()
+
+
+    def minimum_positive (self):
+        """ Return the minimum positive bin content of the bottom component, as for THStack. """
+        contents = self._sumw[0][1:-1]
+        contents = contents[contents > 0]
+        return contents.min() if contents.size else None
+
+
+
+    # Private methods
+    # ----------------------------------------------------------------
+
+    def _cumulative (self):
+        """ Return cumulative sums of bin contents and squared weights, one row per component. """
+        if self._cumsum is None:
+            self._cumsum = (np.cumsum(np.vstack(self._sumw),  axis=0),
+                            np.cumsum(np.vstack(self._sumw2), axis=0))
+            pass
+        return self._cumsum
+
+
+    def _add_layer (self):
+        """ Create and draw a new layer at the front of the stack. """
+
+        layer = self._hists[0].Clone('{}_layer{}'.format(self._name, len(self._layers)))
+        layer.SetDirectory(0)
+
+        if len(self._layers) == 0:
+            # Bottom-most draw call defines the axes, if first on the pad
+            draw_on(self._pad, layer, self._option)
+        else:
+            # Insert directly after the previous layer, such that primitives
+            # drawn after the stack remain on top. The draw option is taken
+            # from the histogram itself, since TList::AddAfter does not
+            # store any.
+            option = self._option if 'SAME' in self._option.upper() else self._option + ' SAME'
+            layer.SetOption(option)
+            self._pad.GetListOfPrimitives().AddAfter(self._layers[-1], layer)
+            self._pad.Modified()
+            pass
+
+        self._layers.append(layer)
+        self._dirty = True
+        return
+
+
+    def _update (self):
+        """ Fill the drawn layers with the cumulative sums, back-to-front. """
+
+        # Check(s)
+        if not self._dirty or len(self._layers) == 0: return
+
+        sumw, sumw2 = self._cumulative()
+        N = len(self._layers)
+        for idx, layer in enumerate(self._layers):
+            icomp = N - 1 - idx
+            array2hist(sumw[icomp], layer, errors=np.sqrt(sumw2[icomp]))
+
+            # Each layer is styled as the component it tops
+            hist = self._hists[icomp]
+            ROOT.TAttFill  .Copy(hist, layer)
+            ROOT.TAttLine  .Copy(hist, layer)
+            ROOT.TAttMarker.Copy(hist, layer)
+            pass
+
+        self._dirty = False
+        return
+
+    pass
@@ -77,11 +77,46 @@ AStyle.SetLegendBorderSize(0)
 # -- Error bars
 #AStyle.SetErrorX(0)
 
+# Colour registry.
+# --------------------------------------------------------------------
+
+# Colours allocated by this module, interned such that each (colour, alpha)
+# pair and each palette definition is only added to ROOT's global colour table
+# once per process.
+_colour_cache  = dict() # (colour, alpha) -> transparent colour index
+_palette_cache = dict() # (stops, red, green, blue, ncontours) -> first colour index
+
+def get_colour (colour, alpha=None):
+    """Return the index of `colour` with transparency `alpha`.
+    The transparent TColor is only allocated the first time a given (colour,
+    alpha) pair is requested; subsequent calls return the same index."""
+
+    # Check(s)
+    if alpha is None or alpha >= 1.:
+        return colour
+
+    key = (int(colour), round(float(alpha), 4))
+    if key not in _colour_cache:
+        _colour_cache[key] = ROOT.TColor.GetColorTransparent(key[0], key[1])
+        pass
+    return _colour_cache[key]
+
+
+def colour_table_size ():
+    """Return the size of ROOT's global colour table, along with the number of
+    transparent colours and palettes interned by this module."""
+    return {'table':    ROOT.gROOT.GetListOfColors().GetEntries(),
+            'interned': len(_colour_cache),
+            'palettes': len(_palette_cache)}
+
+
 # Colour palette.
 def set_palette(name='palette', ncontours=999):
     """Set a color palette from a given RGB list
     stops, red, green and blue should all be lists of the same length
-    see set_decent_colors for an example"""
+    see set_decent_colors for an example
+    The gradient colour table is created once per definition and re-used on
+    subsequent calls."""
 
     stops = [0.00, 1.00]
     #red   = [0.98,  0./255.]
@@ -91,13 +126,20 @@ def set_palette(name='palette', ncontours=999):
     green = [0.98, 153./255.]
     blue  = [0.98, 255./255.]
 
-    s = array('d', stops)
-    r = array('d', red)
-    g = array('d', green)
-    b = array('d', blue)
-
-    npoints = len(s)
-    ROOT.TColor.CreateGradientColorTable(npoints, s, r, g, b, ncontours)
+    key = (tuple(stops), tuple(red), tuple(green), tuple(blue), ncontours)
+    if key in _palette_cache:
+        # Re-use existing gradient colour table
+        first = _palette_cache[key]
+        ROOT.gStyle.SetPalette(ncontours, array('i', range(first, first + ncontours)))
+    else:
+        s = array('d', stops)
+        r = array('d', red)
+        g = array('d', green)
+        b = array('d', blue)
+
+        npoints = len(s)
+        _palette_cache[key] = ROOT.TColor.CreateGradientColorTable(npoints, s, r, g, b, ncontours)
+        pass
     ROOT.gStyle.SetNumberContours(ncontours)
     return
 
@@ -4,11 +4,13 @@
 
 # Basic import(s)
 import os
+import itertools
+import threading
 
 # Scientific import(s)
 import ROOT
 try:
-    from root_numpy import tree2array
+    from root_numpy import tree2array, hist2array
 
     import numpy as np
     from numpy.lib.recfunctions import append_fields
@@ -18,23 +20,103 @@ except:
     print "or see e.g. [http://rootpy.github.io/root_numpy/start.html]."
     raise
 
+# Optional import(s)
+try:
+    import scipy.stats as _scipy_stats
+except ImportError:
+    _scipy_stats = None
+    pass
+
 # Global definitions
 inf = np.finfo(float).max
 eps = np.finfo(float).eps
 
+# Concurrency. ROOT painting and file output rely on global state (e.g. the
+# virtual PostScript/image backends), and are therefore serialised through
+# `render_lock`, whereas object creation and filling may run concurrently.
+render_lock   = threading.RLock()
+_name_counter = itertools.count()
+_name_lock    = threading.Lock()
+_concurrent   = False
+
+
+def enable_concurrency ():
+    """ Enable support for creating and saving canvases from several threads.
+
+    Turns on ROOT's thread safety, in which case gPad and gDirectory are
+    thread-local, and stops histograms from being attached to gDirectory.
+    Should be called once, from the main thread, before any worker threads
+    create canvases.
+
+    Note that both settings are process-wide, and persist: in particular,
+    `TH1.AddDirectory(False)` also applies to histograms created outside of
+    this package, e.g. ones that user code expects to find in, or write
+    through, an open TFile. Such code should attach its histograms
+    explicitly, using `SetDirectory`.
+    """
+    global _concurrent
+    if not _concurrent:
+        ROOT.ROOT.EnableThreadSafety()
+        ROOT.TH1.AddDirectory(False)
+        _concurrent = True
+        pass
+    return
+
+
+def unique_name (prefix='h'):
+    """ Return a ROOT object name which is unique within the process, also across threads. """
+    with _name_lock:
+        count = next(_name_counter)
+        pass
+    return '{}_{}_{}'.format(prefix, os.getpid(), count)
+
+
+def draw_on (tpad, obj, option='', owned=False):
+    """ Draw `obj` on `tpad`, without going through the global gPad.
+
+    Equivalent to `obj.Draw(option)` with `tpad` being the current pad, except
+    that the pad is never cleared. If `owned` is True, ownership is handed to
+    the pad, which deletes the object when it is itself cleared or deleted.
+
+    Pads are drawn using `TPad::Draw`, which also sets their mother pad and
+    canvas, and sizes them; this uses the global gPad, and therefore holds
+    `render_lock` and restores the previously active pad.
+    """
+    if obj.InheritsFrom('TPad'):
+        with render_lock:
+            previous = ROOT.TVirtualPad.Pad()
+            tpad.cd()
+            obj.Draw(option)
+            if previous:
+                previous.cd()
+                pass
+            pass
+        return obj
+
+    if owned:
+        ROOT.SetOwnership(obj, False)
+        obj.SetBit(ROOT.TObject.kCanDelete)
+        pass
+    obj.SetBit(ROOT.TObject.kMustCleanup)
+    tpad.GetListOfPrimitives().Add(obj, option)
+    tpad.Modified()
+    return obj
+
 
 def get_maximum (hist):
     """ Return the maximum bin content for a histogram. Assumes ... . Throws error if ... .  """
 
     # Check(s)
-    if type(hist) == ROOT.THStack:
+    if is_cumulative_stack(hist) or is_histogram(hist):
+        return hist.maximum()
+    elif type(hist) == ROOT.THStack:
         return get_maximum(get_stack_sum(hist))
     elif type(hist) in [ROOT.TGraph, ROOT.TGraphErrors, ROOT.TGraphAsymmErrors]:
         N = hist.GetN()
         output, x, y = -inf, ROOT.Double(0), ROOT.Double(-inf)
         for i in range(N):
             hist.GetPoint(i, x, y)
-            output = max(float(output),float(y))
+            output = max(float(output),float(y) + _error_y(hist, i, high=True))
             pass
         return output
 
@@ -53,14 +135,16 @@ def get_minimum (hist):
     """ Return the minimum bin content for a histogram. Assumes ... . Throws error if ... .  """
 
     # Check(s)
-    if type(hist) == ROOT.THStack:
+    if is_cumulative_stack(hist) or is_histogram(hist):
+        return hist.minimum()
+    elif type(hist) == ROOT.THStack:
         return get_minimum(get_stack_sum(hist))
     elif type(hist) in [ROOT.TGraph, ROOT.TGraphErrors, ROOT.TGraphAsymmErrors]:
         N = hist.GetN()
         output, x, y = inf, ROOT.Double(0), ROOT.Double(inf)
         for i in range(N):
             hist.GetPoint(i, x, y)
-            output = min(float(output),float(y))
+            output = min(float(output),float(y) - _error_y(hist, i, high=False))
             pass
         return output
 
@@ -79,7 +163,11 @@ def get_minimum_positive (hist):
     """ Return the minimum positive bin content for a histogram. Assumes ... . Throws error if ... .  """
 
     # Check(s)
-    if type(hist) == ROOT.THStack:
+    if is_histogram(hist):
+        return hist.minimum_positive()
+    elif is_cumulative_stack(hist):
+        return inf if hist.GetNhists() == 0 else hist.minimum_positive()
+    elif type(hist) == ROOT.THStack:
         return inf if hist.GetNhists() == 0 else get_minimum_positive(hist.GetStack()[0])#get_minimum_positive(get_stack_sum(hist))
     elif type(hist) in [ROOT.TGraph, ROOT.TGraphErrors, ROOT.TGraphAsymmErrors]:
         N = hist.GetN()
@@ -87,7 +175,8 @@ def get_minimum_positive (hist):
         for i in range(N):
             hist.GetPoint(i, x, y)
             if x <= 0: continue
-            output = min(float(output),float(y))
+            low = float(y) - _error_y(hist, i, high=False)
+            output = min(float(output),low if low > 0 else float(y))
             pass
         return output
 
@@ -102,9 +191,20 @@ def get_minimum_positive (hist):
     return None
 
 
+def _error_y (graph, i, high=True):
+    """ Return the upper (`high=True`) or lower y-error of point `i` of a TGraphAsymmErrors, and zero for other graphs. """
+    if type(graph) != ROOT.TGraphAsymmErrors:
+        return 0.
+    return graph.GetErrorYhigh(i) if high else graph.GetErrorYlow(i)
+
+
 def get_stack_sum (stack, only_first=True):
     """ ... """
 
+    # Cumulative sums are already available
+    if is_cumulative_stack(stack) and not only_first:
+        return stack.GetSum('sumHisto')
+
     # Kinda hacky...
     if only_first:
         sumHisto = stack.GetHists()[0].Clone('sumHisto')
@@ -122,11 +222,149 @@ def get_stack_sum (stack, only_first=True):
     return sumHisto
 
 
+def hist_arrays (hist):
+    """ Return the bin contents and the sums of squared weights of a 1D or 2D
+    histogram as arrays, including under- and overflow bins. """
+
+    # Profiles store sums of y-values internally; use the per-bin means
+    if hist.InheritsFrom('TProfile'):
+        cells = range(hist.GetNbinsX() + 2)
+        sumw  = np.array(map(hist.GetBinContent, cells), dtype=np.float64)
+        sumw2 = np.square(np.array(map(hist.GetBinError, cells), dtype=np.float64))
+        return sumw, sumw2
+
+    sumw = hist2array(hist, include_overflow=True, copy=True).astype(np.float64)
+    if hist.GetSumw2N() > 0:
+        sumw2 = np.frombuffer(hist.GetSumw2().GetArray(), dtype=np.float64, count=hist.GetSumw2N()).copy()
+        # ROOT's global bin index runs fastest along x
+        sumw2 = sumw2.reshape(sumw.shape[::-1]).T
+    else:
+        # Poisson errors, as assumed by ROOT when no weights are stored
+        sumw2 = np.abs(sumw)
+        pass
+    return sumw, sumw2
+
+
+def poisson_interval (counts, cl=0.682689492):
+    """ Return the lower and upper limits of the Garwood (frequentist) central
+    confidence intervals, at confidence level `cl`, for Poisson `counts`.
+
+    Computed for all counts at once using scipy, if available, and otherwise
+    using ROOT::Math, one count at a time.
+    """
+    n = np.asarray(counts, dtype=np.float64)
+    alpha = 1. - cl
+    if _scipy_stats is not None:
+        lower = np.where(n > 0, 0.5 * _scipy_stats.chi2.ppf(0.5 * alpha, 2. * np.maximum(n, eps)), 0.)
+        upper = 0.5 * _scipy_stats.chi2.ppf(1. - 0.5 * alpha, 2. * (n + 1.))
+    else:
+        lower = np.array([ROOT.Math.gamma_quantile  (0.5 * alpha, k,      1.) if k > 0 else 0. for k in n.flat]).reshape(n.shape)
+        upper = np.array([ROOT.Math.gamma_quantile_c(0.5 * alpha, k + 1., 1.)                 for k in n.flat]).reshape(n.shape)
+        pass
+    return lower, upper
+
+
+def efficiency_interval (passed, total, cl=0.682689492, method='clopper-pearson'):
+    """ Return the lower and upper limits of the central confidence intervals,
+    at confidence level `cl`, for efficiencies `passed`/`total`.
+
+    The intervals are Clopper-Pearson (`method='clopper-pearson'`), Wilson
+    score (`method='wilson'`), or normal approximation (`method='normal'`)
+    intervals; the counts need not be integer, e.g. effective numbers of
+    entries. Computed for all bins at once using scipy, if available, and
+    otherwise using ROOT::Math, one bin at a time. Bins with no entries
+    get the interval [0, 1].
+    """
+
+    # Check(s)
+    assert method in ['clopper-pearson', 'wilson', 'normal'], "Efficiency interval method '{}' not recognised.".format(method)
+
+    k = np.asarray(passed, dtype=np.float64)
+    n = np.asarray(total,  dtype=np.float64)
+    alpha = 1. - cl
+    empty = n <= 0
+    n = np.where(empty, 1., n)
+    k = np.clip(np.where(empty, 0., k), 0., n)
+    eff = k / n
+
+    if method == 'clopper-pearson':
+        a, b = np.maximum(k, eps), np.maximum(n - k, eps)
+        if _scipy_stats is not None:
+            lower = _scipy_stats.beta.ppf(0.5 * alpha, a, n - k + 1.)
+            upper = _scipy_stats.beta.ppf(1. - 0.5 * alpha, k + 1., b)
+        else:
+            lower = np.array([ROOT.Math.beta_quantile  (0.5 * alpha, x, y) for x, y in zip(a.flat, (n - k + 1.).flat)]).reshape(n.shape)
+            upper = np.array([ROOT.Math.beta_quantile_c(0.5 * alpha, x, y) for x, y in zip((k + 1.).flat, b.flat)]).reshape(n.shape)
+            pass
+        lower = np.where(k > 0, lower, 0.)
+        upper = np.where(k < n, upper, 1.)
+    else:
+        if _scipy_stats is not None:
+            z = _scipy_stats.norm.ppf(1. - 0.5 * alpha)
+        else:
+            z = ROOT.Math.normal_quantile_c(0.5 * alpha, 1.)
+            pass
+        if method == 'wilson':
+            denom  = 1. + z * z / n
+            centre = (eff + 0.5 * z * z / n) / denom
+            width  = z / denom * np.sqrt(eff * (1. - eff) / n + 0.25 * z * z / (n * n))
+        else:
+            centre = eff
+            width  = z * np.sqrt(eff * (1. - eff) / n)
+            pass
+        lower = np.clip(centre - width, 0., 1.)
+        upper = np.clip(centre + width, 0., 1.)
+        pass
+
+    lower = np.where(empty, 0., lower)
+    upper = np.where(empty, 1., upper)
+    return lower, upper
+
+
+def axis_edges (axis):
+    """ Return the bin edges of a ROOT TAxis as an array. """
+    N = axis.GetNbins()
+    if axis.GetXbins().GetSize() > 0:
+        # Variable bin widths
+        return np.frombuffer(axis.GetXbins().GetArray(), dtype=np.float64, count=N + 1).copy()
+    return np.linspace(axis.GetXmin(), axis.GetXmax(), N + 1)
+
+
+def bin_indices (values, bins):
+    """ Return ROOT-style bin indices for `values` given bin edges `bins`.
+
+    Index 0 is the underflow bin and index len(bins) the overflow bin, such
+    that the result can be used directly with numpy.bincount to reproduce a
+    ROOT fill, including the convention that the upper edge is exclusive.
+    """
+    return np.searchsorted(np.asarray(bins, dtype=np.float64), values, side='right')
+
+
 def is_overlay (pad):
     """ Determine whether input pad is of type 'overlay' """
     return type(pad).__name__.endswith('overlay')
 
 
+def is_cumulative_stack (hist):
+    """ Determine whether input is of type 'cumulative_stack' """
+    return type(hist).__name__.endswith('cumulative_stack')
+
+
+def is_histogram (hist):
+    """ Determine whether input is of numpy-backed type 'histogram' """
+    return type(hist).__name__ == 'histogram'
+
+
+def is_stack (hist):
+    """ Determine whether input is a stack, either THStack or 'cumulative_stack' """
+    return type(hist) == ROOT.THStack or is_cumulative_stack(hist)
+
+
+def is_lazy_pad (pad):
+    """ Determine whether input pad is a placeholder for a lazily created pad """
+    return isinstance(pad, tuple)
+
+
 def is_canvas (pad):
     """ Determine whether input pad is of type 'canvas' """
     return type(pad).__name__.endswith('canvas')
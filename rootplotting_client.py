@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+
+""" Thin client for the rootplotting daemon, cf. `rootplotting.daemon`.
+
+Only uses the standard library, such that callers do not pay for importing
+ROOT. It is deliberately kept outside of the `rootplotting` package, which
+imports ROOT on import.
+
+Usage, from python:
+    from rootplotting_client import client
+    result = client().render('plots/myplot.spec.json.gz', 'plots/myplot.pdf')
+
+or from the command line:
+    $ python -m rootplotting_client plots/myplot.spec.json.gz plots/myplot.pdf
+"""
+
+# Basic import(s)
+import os
+import sys
+import json
+import socket
+import argparse
+
+
+# Global definitions
+ADDRESS = '/tmp/rootplotting-{}.sock'.format(os.getuid()) # Default daemon address
+
+
+# Class definition
+class client (object):
+    """
+    Sends plot requests to a running rootplotting daemon.
+
+    Each request is a plot specification, either the path to a file written by
+    `rootplotting.spec.dump` or an encoded specification as returned by
+    `rootplotting.spec.encode`, together with the output path. The daemon
+    replays the specification, saves the plot, and returns the output path and
+    timing.
+    """
+
+    def __init__ (self, address=ADDRESS, timeout=None):
+        """ Constructor. `address` is a Unix socket path, or a (host, port) tuple. """
+        super(client, self).__init__()
+
+        # Member variables
+        self._address = address
+        self._timeout = timeout
+        return
+
+
+    def render (self, spec, path, backend=None):
+        """ Render plot specification `spec` to `path`, returning the daemon's response.
+
+        The response is a dictionary with the absolute output 'path', the
+        rendering 'time' in seconds, and the process ID of the 'worker'.
+        Raises RuntimeError if the plot could not be rendered.
+        """
+        request = {'path': os.path.abspath(path)}
+        if isinstance(spec, basestring):
+            request['spec_path'] = os.path.abspath(spec)
+        else:
+            request['spec'] = spec
+            pass
+        if backend is not None:
+            request['backend'] = backend
+            pass
+
+        sock = connect(self._address, self._timeout)
+        try:
+            send(sock, request)
+            response = receive(sock)
+        finally:
+            sock.close()
+            pass
+
+        if response is None:
+            raise RuntimeError("No response from rootplotting daemon at {}.".format(self._address))
+        if 'error' in response:
+            raise RuntimeError("rootplotting daemon: {}".format(response['error']))
+        return response
+
+    pass
+
+
+
+# Protocol
+# --------------------------------------------------------------------
+# One request per connection; request and response are single lines of JSON.
+
+def family (address):
+    """ Return the socket family for `address`. """
+    return socket.AF_INET if isinstance(address, tuple) else socket.AF_UNIX
+
+
+def connect (address, timeout=None):
+    """ Return a socket connected to the daemon at `address`. """
+    sock = socket.socket(family(address), socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    sock.connect(address)
+    return sock
+
+
+def send (sock, message):
+    """ Send `message` as a single line of JSON. """
+    sock.sendall(json.dumps(message, separators=(',', ':')) + '\n')
+    return
+
+
+def receive (sock):
+    """ Receive a single line of JSON, or None if the connection was closed. """
+    f = sock.makefile('rb')
+    try:
+        line = f.readline()
+    finally:
+        f.close()
+        pass
+    return json.loads(line) if line else None
+
+
+
+# Main function
+# --------------------------------------------------------------------
+
+def main (args=None):
+    """ Render plot specifications through the daemon, printing output paths and timings. """
+    parser = argparse.ArgumentParser(description="Render plot specifications through a running rootplotting daemon.")
+    parser.add_argument('spec',   help="Plot specification file, cf. rootplotting.spec.dump.")
+    parser.add_argument('output', help="Output path.")
+    parser.add_argument('--address', default=ADDRESS, help="Unix socket path, or host:port, of the daemon.")
+    parser.add_argument('--backend', default=None, help="Rendering backend.")
+    args = parser.parse_args(args)
+
+    address = args.address
+    if ':' in address and not address.startswith('/'):
+        host, port = address.rsplit(':', 1)
+        address = (host, int(port))
+        pass
+
+    try:
+        response = client(address).render(args.spec, args.output, backend=args.backend)
+    except (RuntimeError, socket.error) as e:
+        print >> sys.stderr, "ERROR: {}".format(e)
+        return 1
+    print "{}  ({:.3f} s)".format(response['path'], response['time'])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
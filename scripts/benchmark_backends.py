@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Compare startup and per-plot times of the ROOT and matplotlib rendering backends.
+
+Each backend is timed in a fresh process: the time to import the package,
+the time to draw and save a first plot (startup, excl. the import), and the
+mean time to draw and save each further plot, as well as the peak memory use
+of the process. The package itself imports ROOT, irrespective of the backend
+used, so the import time is reported separately and is common to all
+backends; whether ROOT was loaded once the plots have been saved is reported
+for reference.
+
+Usage:
+    $ python scripts/benchmark_backends.py [--plots 20] [--backends root matplotlib]
+"""
+
+# Basic import(s)
+import sys
+import json
+import time
+import resource
+import argparse
+import subprocess
+
+# Global definitions
+START = time.time()
+
+
+def plot (ap, np, backend, path, seed):
+    """ Draw a typical data/simulation comparison with ratio pad, and save it to `path`. """
+    rng  = np.random.RandomState(seed)
+    bins = np.linspace(-3, 3, 31)
+    a, b, data = rng.normal(size=2000), rng.normal(0.5, 1., size=1000), rng.normal(0.2, 1., size=3000)
+
+    c = ap.canvas(num_pads=2, batch=True, backend=backend)
+    c.stack(a, bins=bins, label='A')
+    c.stack(b, bins=bins, label='B')
+    c.plot(data, bins=bins, label='Data')
+    c.ratio_plot((data, np.concatenate((a, b))), bins=bins)
+    c.text(["Benchmark"], qualifier='Internal')
+    c.legend()
+    c.log()
+    c.xlabel("x")
+    c.ylabel("Events")
+    c.save(path)
+    return
+
+
+def worker (backend, plots):
+    """ Time startup and per-plot rendering for `backend` in this process, and print the results as JSON. """
+    import numpy as np
+    import rootplotting as ap
+    imported = time.time()
+
+    plot(ap, np, backend, '/tmp/rootplotting_benchmark_{}_0.png'.format(backend), 0)
+    startup = time.time() - imported
+
+    start = time.time()
+    for idx in range(1, plots + 1):
+        plot(ap, np, backend, '/tmp/rootplotting_benchmark_{}_{}.png'.format(backend, idx), idx)
+        pass
+    per_plot = (time.time() - start) / float(max(plots, 1))
+
+    memory = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024. # MB, on Linux
+    print json.dumps({'backend': backend, 'import': imported - START, 'startup': startup, 'per_plot': per_plot, 'memory': memory, 'ROOT': 'ROOT' in sys.modules})
+    return 0
+
+
+def main (args=None):
+    """ Run one worker process per backend, and print a comparison. """
+    parser = argparse.ArgumentParser(description="Compare startup and per-plot times of the rendering backends.")
+    parser.add_argument('--plots',    default=20, type=int, help="Number of plots timed after the first.")
+    parser.add_argument('--backends', default=['root', 'matplotlib'], nargs='+', help="Backends to compare.")
+    parser.add_argument('--worker',   default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args(args)
+
+    if args.worker:
+        return worker(args.worker, args.plots)
+
+    print "{:>12s}  {:>11s}  {:>12s}  {:>14s}  {:>12s}  {:>5s}".format("backend", "import [s]", "startup [s]", "per plot [ms]", "memory [MB]", "ROOT")
+    for backend in args.backends:
+        output = subprocess.check_output([sys.executable, __file__, '--worker', backend, '--plots', str(args.plots)])
+        result = json.loads(output.strip().splitlines()[-1])
+        print "{:>12s}  {:11.3f}  {:12.3f}  {:14.1f}  {:12.1f}  {:>5s}".format(backend, result['import'], result['startup'], 1000. * result['per_plot'], result['memory'], str(result['ROOT']))
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Benchmark construction of canvases with regular grids of 1 to 256 pads.
+
+Usage:
+    $ python scripts/benchmark_pads.py [--repeat 3] [--save]
+"""
+
+# Basic import(s)
+import sys
+import time
+import argparse
+
+# Scientific import(s)
+import numpy as np
+
+# Project import(s)
+import rootplotting as ap
+
+
+def timed (func, repeat):
+    """ Return the smallest wall time, in seconds, of `repeat` calls to `func`. """
+    times = list()
+    for _ in range(repeat):
+        start = time.time()
+        func()
+        times.append(time.time() - start)
+        pass
+    return min(times)
+
+
+def main (args=None):
+    """ Time eager and lazy grid construction, and filling and saving all pads. """
+    parser = argparse.ArgumentParser(description="Benchmark construction of canvases with 1-256 pads.")
+    parser.add_argument('--repeat', default=3, type=int, help="Number of repetitions; the fastest is reported.")
+    parser.add_argument('--save', action='store_true', help="Also time filling every pad and saving to PNG.")
+    args = parser.parse_args(args)
+
+    bins = np.linspace(-3, 3, 31)
+    data = np.random.RandomState(42).normal(size=1000)
+
+    print "{:>6s}  {:>10s}  {:>10s}  {:>12s}".format("pads", "eager [s]", "lazy [s]", "fill+save [s]")
+    for num_pads in [1, 2, 4, 8, 16, 32, 64, 128, 256]:
+        eager = timed(lambda: ap.canvas(num_pads=num_pads, batch=True), args.repeat)
+        lazy  = timed(lambda: ap.canvas(num_pads=num_pads, batch=True, lazy=True), args.repeat)
+        save  = float('nan')
+        if args.save:
+            def fill_and_save ():
+                c = ap.canvas(num_pads=num_pads, batch=True)
+                for p in c.pads():
+                    p.hist(data, bins=bins)
+                    pass
+                c.save('/tmp/rootplotting_benchmark_pads.png')
+                return
+            save = timed(fill_and_save, args.repeat)
+            pass
+        print "{:6d}  {:10.4f}  {:10.4f}  {:12.4f}".format(num_pads, eager, lazy, save)
+        sys.stdout.flush()
+        pass
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
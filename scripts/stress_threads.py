@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+""" Stress test rendering hundreds of canvases concurrently from a thread pool.
+
+Usage:
+    $ python scripts/stress_threads.py [--canvases 400] [--threads 8] [--outdir /tmp/rootplotting_stress]
+"""
+
+# Basic import(s)
+import os
+import sys
+import time
+import argparse
+import traceback
+from multiprocessing.pool import ThreadPool
+
+# Scientific import(s)
+import numpy as np
+
+# Project import(s)
+import rootplotting as ap
+from rootplotting.tools import enable_concurrency
+
+
+def render (args):
+    """ Create, fill, and save one canvas; return the output path, or the traceback on failure. """
+    idx, outdir = args
+    try:
+        rng  = np.random.RandomState(idx)
+        bins = np.linspace(-3, 3, 31)
+        x, y = rng.normal(size=1000), rng.normal(0.1, 1.1, size=1000)
+
+        c = ap.canvas(num_pads=2, batch=True)
+        c.hist(x, bins=bins, label='Reference')
+        c.plot(y, bins=bins, label='Data')
+        c.ratio_plot((y, x), bins=bins)
+        c.text(["Canvas {}".format(idx)], qualifier='Stress test')
+        c.legend()
+        c.xlabel("x")
+        c.ylabel("Entries")
+
+        path = os.path.join(outdir, 'canvas_{:04d}.png'.format(idx))
+        c.save(path)
+        return path, None
+    except Exception:
+        return None, traceback.format_exc()
+
+
+def main (args=None):
+    """ Render canvases from a thread pool, and check that every output file was written. """
+    parser = argparse.ArgumentParser(description="Render many canvases concurrently from a thread pool.")
+    parser.add_argument('--canvases', default=400, type=int, help="Number of canvases to render.")
+    parser.add_argument('--threads',  default=8,   type=int, help="Number of worker threads.")
+    parser.add_argument('--outdir',   default='/tmp/rootplotting_stress', help="Output directory.")
+    args = parser.parse_args(args)
+
+    if not os.path.isdir(args.outdir):
+        os.makedirs(args.outdir)
+        pass
+
+    enable_concurrency()
+
+    start = time.time()
+    pool = ThreadPool(args.threads)
+    try:
+        results = pool.map(render, [(idx, args.outdir) for idx in range(args.canvases)])
+    finally:
+        pool.close()
+        pool.join()
+        pass
+    duration = time.time() - start
+
+    # Check(s)
+    errors  = [error for _, error in results if error is not None]
+    missing = [path  for path, _ in results if path is not None and not (os.path.isfile(path) and os.path.getsize(path) > 0)]
+    for error in errors[:5]:
+        print error
+        pass
+
+    print "Rendered {} canvases with {} threads in {:.2f} s ({:.1f} ms per canvas).".format(args.canvases, args.threads, duration, 1000. * duration / max(args.canvases, 1))
+    print "Failures: {}, missing or empty outputs: {}.".format(len(errors), len(missing))
+    return 1 if (errors or missing) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -9,4 +9,5 @@ setup(
     keywords = "ROOT, plotting",
     url="https://github.com/asogaard/rootplotting",
     packages=['rootplotting'],
+    py_modules=['rootplotting_client'],
     )
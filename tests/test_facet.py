@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+
+""" Tests of faceted plotting, drawing one category per pad."""
+
+# Scientific import(s)
+import pytest
+ROOT = pytest.importorskip('ROOT')
+import numpy as np
+
+# Project import(s)
+import rootplotting as rp
+from rootplotting.tools import is_lazy_pad
+
+
+def test_facet_creates_only_used_lazy_pads ():
+    """ On a lazy grid, only the pads holding a facet are created; the others stay placeholders. """
+    rng        = np.random.RandomState(42)
+    bins       = np.linspace(-3, 3, 31)
+    values     = rng.normal(size=1000)
+    categories = rng.randint(2, size=1000)
+
+    c = rp.canvas(num_pads=(3, 3), batch=True, lazy=True)
+    assert all(map(is_lazy_pad, c._pads))
+
+    hists = c.facet(values, categories, bins)
+    assert len(hists) == 2
+    assert not any(map(is_lazy_pad, c._pads[:2]))
+    assert all(map(is_lazy_pad, c._pads[2:]))
+    return
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+
+""" Tests of the null canvas backend, which runs all plotting logic without rendering."""
+
+# Scientific import(s)
+import pytest
+ROOT = pytest.importorskip('ROOT')
+import numpy as np
+
+# Project import(s)
+import rootplotting as rp
+from rootplotting.nullcanvas import null_canvas, null_proxy
+
+
+def test_null_canvas_hist_ratio_log_save ():
+    """ A full plot, incl. ratio pad and log-scale, is laid out and logged, but not written. """
+    rng  = np.random.RandomState(42)
+    bins = np.linspace(-3, 3, 31)
+    x, y = rng.normal(size=1000), rng.normal(size=1000)
+
+    c = rp.canvas(num_pads=2, backend='null')
+    assert isinstance(c, null_canvas)
+
+    c.hist(x, bins=bins, label='A')
+    c.hist(y, bins=bins, label='B')
+    c.ratio_plot((x, y), bins=bins)
+    c.log()
+    c.save('/tmp/rootplotting_null_canvas_test.pdf')
+
+    summary = c.summary()
+    assert summary['SaveAs'] == 1
+    assert summary['Draw'] > 0
+    assert summary['SetRangeUser'] > 0
+    assert c.pads()[0]._get_first_primitive() is not None
+    return
+
+
+def test_null_canvas_overlay ():
+    """ Drawing on, and updating, an overlay is logged on the overlay's own pad. """
+    rng  = np.random.RandomState(42)
+    bins = np.linspace(-3, 3, 31)
+
+    c = rp.canvas(backend='null')
+    c.hist(rng.normal(size=1000), bins=bins)
+    o = rp.overlay(c.pads()[0], color=ROOT.kRed)
+    o.hist(rng.normal(size=1000), bins=bins)
+    c.save('/tmp/rootplotting_null_canvas_overlay_test.pdf')
+
+    assert isinstance(o._bare(), null_proxy)
+    name = o._bare().GetName()
+    operations = [operation for target, operation, _ in c.operations if target == name]
+    assert 'Draw'   in operations
+    assert 'Update' in operations
+    return
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+
+""" Tests of Poisson errors, drawn as a graph in place of the histogram's errors."""
+
+# Scientific import(s)
+import pytest
+ROOT = pytest.importorskip('ROOT')
+import numpy as np
+
+# Project import(s)
+import rootplotting as rp
+from rootplotting.tools import poisson_interval
+
+
+def _arrays (graph):
+    """ Return the y-values and the upper y-errors of `graph`. """
+    N = graph.GetN()
+    y   = np.frombuffer(graph.GetY(),      dtype=np.float64, count=N).copy()
+    eyh = np.frombuffer(graph.GetEYhigh(), dtype=np.float64, count=N).copy()
+    return y, eyh
+
+
+def test_poisson_errors_range_and_refresh ():
+    """ The y-range includes the upper Poisson errors, and the graph follows fills on refresh. """
+    rng  = np.random.RandomState(42)
+    bins = np.linspace(-3, 3, 7)
+
+    c = rp.canvas(batch=True)
+    p = c.pads()[0]
+    h = c.plot(rng.normal(size=20), bins=bins, errors='poisson')
+    c._update()
+
+    graph = p._poisson[id(h)]
+    y, eyh = _arrays(graph)
+    assert np.isclose(p._get_first_primitive().GetMaximum(), (y + eyh).max() / (1. - p._padding))
+
+    c.fill(h, rng.normal(size=200))
+    c.refresh(force=True)
+
+    counts = np.array([h.GetBinContent(i) for i in range(1, len(bins))])
+    y, eyh = _arrays(graph)
+    assert np.allclose(y, counts)
+    assert np.allclose(eyh, poisson_interval(counts)[1] - counts)
+    assert np.isclose(p._get_first_primitive().GetMaximum(), (y + eyh).max() / (1. - p._padding))
+    return
@@ -0,0 +1,43 @@
+# -*- coding: utf-8 -*-
+
+""" Tests of the rasterisation of dense layers in vector output."""
+
+# Scientific import(s)
+import pytest
+ROOT = pytest.importorskip('ROOT')
+import numpy as np
+
+# Project import(s)
+import rootplotting as rp
+from rootplotting.raster import rasterized
+
+
+def test_rasterized_first_hist2d_keeps_axes ():
+    """ A first-drawn, rasterised 2D histogram is replaced by its axes and an image, with the axes redrawn on top. """
+    rng = np.random.RandomState(42)
+    h = ROOT.TH2F('h_raster_test', "", 20, -3, 3, 20, -3, 3)
+    for x, y in rng.normal(size=(1000, 2)):
+        h.Fill(x, y)
+        pass
+
+    c = rp.canvas(batch=True)
+    c.hist2d(h, option='COLZ', rasterize=True)
+    tpad = c.pads()[0]._bare()
+
+    # Paint the pad, such that a TFrame is first among its primitives
+    c._update()
+    with rasterized(c, '/tmp/rootplotting_raster_test.pdf'):
+        links = list()
+        link = tpad.GetListOfPrimitives().FirstLink()
+        while link:
+            links.append((link.GetObject(), link.GetOption()))
+            link = link.Next()
+            pass
+        pass
+
+    options = [option.upper() for _, option in links]
+    assert 'AXIS' in options
+    assert 'AXIS SAME' in options
+    assert any(obj.InheritsFrom('TPad') for obj, _ in links)
+    assert not any(obj.ClassName() == 'TNamed' for obj, _ in links)
+    return